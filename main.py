@@ -1,8 +1,20 @@
 """Main core file. You can redefine dafault parametrs in app_config, endpoints."""
 
-from ytm_browser import start_endpoints
+import argparse
+
+from ytm_browser.core import warmup
 from ytm_browser.textual_ui.app import YtMusicApp
 
 if __name__ == "__main__":
-    app = YtMusicApp(start_endpoints.endpoints)
+    parser = argparse.ArgumentParser(description="Youtube Music browser")
+    parser.add_argument(
+        "--warmup-depth",
+        type=int,
+        nargs="?",
+        default=0,
+        const=warmup.DEFAULT_DEPTH,
+        help="prefetch children of start endpoints in background to this"
+        f" depth (off by default, {warmup.DEFAULT_DEPTH} without value)",
+    )
+    app = YtMusicApp(warmup_depth=parser.parse_args().warmup_depth)
     app.run()
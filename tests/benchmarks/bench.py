@@ -0,0 +1,167 @@
+"""Measure time and peak allocations per item, compare them to baselines.
+
+Time is compared as ratio to calibration loop which is run in the same
+process, so baselines don't depend on speed of machine.
+
+Run benchmarks with `YTM_BENCHMARK=1 python -m pytest tests/benchmarks -s`,
+save current results as new baselines with `YTM_BENCHMARK=update`.
+"""
+
+import gc
+import json
+import os
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+BASELINES_FILE = Path(__file__).with_name("baselines.json")
+BENCHMARK_ENV = "YTM_BENCHMARK"
+THRESHOLD_ENV = "YTM_BENCHMARK_THRESHOLD"
+# allowed slowdown (and growth of allocations) against baseline
+DEFAULT_THRESHOLD = 1.5
+DEFAULT_REPEAT = 5
+CALIBRATION_ITEMS = 10_000
+
+
+@dataclass
+class BenchResult:
+    sec_per_item: float
+    peak_bytes_per_item: float
+    # time of calibration item measured next to benchmarked code
+    calibration_sec: float
+
+    @property
+    def relative_time(self) -> float:
+        """Time per item in units of calibration item time."""
+        return self.sec_per_item / self.calibration_sec
+
+    def __str__(self) -> str:
+        return (
+            f"{self.sec_per_item * 1e6:.2f} us/item "
+            f"({self.relative_time:.3g} of calibration), "
+            f"{self.peak_bytes_per_item:.0f} B/item peak"
+        )
+
+
+@dataclass
+class Baseline:
+    # checked-in numbers are ratios (and allocations), not seconds
+    relative_time: float
+    peak_bytes_per_item: float
+
+
+def is_enabled() -> bool:
+    return bool(os.environ.get(BENCHMARK_ENV))
+
+
+def is_update() -> bool:
+    return os.environ.get(BENCHMARK_ENV) == "update"
+
+
+def threshold() -> float:
+    return float(os.environ.get(THRESHOLD_ENV, DEFAULT_THRESHOLD))
+
+
+def _calibration_loop() -> None:
+    # pure Python dict, list and str work like parsing of responses
+    runs = [{"text": str(index)} for index in range(CALIBRATION_ITEMS)]
+    "".join(run["text"] for run in runs if "text" in run)
+
+
+def _timed(func: Callable[[], object]) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def measure(
+    func: Callable[[], object],
+    items_number: int,
+    repeat: int = DEFAULT_REPEAT,
+) -> BenchResult:
+    """Measure best time of `repeat` runs and peak allocations of one run.
+
+    Best time of calibration loop is measured by runs interleaved with
+    `func` runs.
+
+    Args:
+    ----
+        func (Callable[[], object]): benchmarked code
+        items_number (int): number of items processed by one `func` call
+        repeat (int, optional): number of timed runs. Defaults to\
+            DEFAULT_REPEAT.
+
+    Returns:
+    -------
+        BenchResult: time and peak allocations per item
+
+    """
+    # calibration runs are interleaved with `func` runs, so speed drift of
+    # machine changes both timings
+    timings = [
+        (_timed(_calibration_loop), _timed(func)) for _ in range(repeat)
+    ]
+    calibration_sec = min(calibration for calibration, _ in timings)
+    func_sec = min(func_timing for _, func_timing in timings)
+    # tracemalloc slows code down, so memory is measured by separate run
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return BenchResult(
+        sec_per_item=func_sec / items_number,
+        peak_bytes_per_item=peak / items_number,
+        calibration_sec=calibration_sec / CALIBRATION_ITEMS,
+    )
+
+
+def load_baselines() -> dict[str, Baseline]:
+    if not BASELINES_FILE.exists():
+        return {}
+    with BASELINES_FILE.open() as fs:
+        return {
+            name: Baseline(**baseline)
+            for name, baseline in json.load(fs).items()
+        }
+
+
+def save_baseline(name: str, result: BenchResult) -> None:
+    baselines = {
+        baseline_name: asdict(baseline)
+        for baseline_name, baseline in load_baselines().items()
+    }
+    baselines[name] = asdict(
+        Baseline(
+            relative_time=result.relative_time,
+            peak_bytes_per_item=result.peak_bytes_per_item,
+        ),
+    )
+    with BASELINES_FILE.open("w") as fs:
+        json.dump(baselines, fs, indent=2, sort_keys=True)
+        fs.write("\n")
+
+
+def regressions(
+    result: BenchResult,
+    baseline: Baseline,
+    max_ratio: float,
+) -> list[str]:
+    """Return descriptions of metrics which exceed baseline * `max_ratio`."""
+    return [
+        f"{metric}: {value:.3g} > {max_ratio} * {baseline_value:.3g}"
+        for metric, value, baseline_value in (
+            ("relative_time", result.relative_time, baseline.relative_time),
+            (
+                "peak_bytes_per_item",
+                result.peak_bytes_per_item,
+                baseline.peak_bytes_per_item,
+            ),
+        )
+        if value > baseline_value * max_ratio
+    ]
@@ -0,0 +1,56 @@
+"""Run app headless until its first frame and print timings as json.
+
+It's run by `startup.first_frame()` in fresh interpreter.
+
+Run: `python -m tests.benchmarks.first_frame`
+"""
+
+import json
+import sys
+import time
+
+from tests.benchmarks import startup
+
+# relative css path of app is resolved from module of subclass
+APP_CSS_PATH = startup.PROJECT_DIR.joinpath(
+    "ytm_browser",
+    "textual_ui",
+    "styles.tcss",
+)
+
+
+def main() -> None:
+    started_at = time.perf_counter()
+    # app is imported here, its import time is a part of measurement
+    from ytm_browser.textual_ui.app import YtMusicApp
+
+    imported_at = time.perf_counter()
+
+    class FirstFrameApp(YtMusicApp):
+        CSS_PATH = str(APP_CSS_PATH)
+
+        # it's called on Ready event (first frame), before yt_dlp is imported
+        def _warm_up_downloader(self) -> None:
+            self.first_frame_at = time.perf_counter()
+            self.loaded_modules = [
+                module
+                for module in startup.DEFERRED_MODULES
+                if module in sys.modules
+            ]
+            self.exit()
+
+    app = FirstFrameApp()
+    app.run(headless=True)
+    print(  # noqa: T201
+        json.dumps(
+            {
+                "import_sec": imported_at - started_at,
+                "first_frame_sec": app.first_frame_at - started_at,
+                "loaded_deferred_modules": app.loaded_modules,
+            },
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
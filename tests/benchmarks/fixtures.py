@@ -0,0 +1,149 @@
+"""Raw response fixtures of benchmarks (recorded and scaled-up ones)."""
+
+import copy
+from pathlib import Path
+
+from utils import json_utils
+
+RESPONSES_DIR = "tests/raw_responses"
+QUEUE_SIZE = 10_000
+
+ARTIST_RUN = {
+    "text": "Artist",
+    "navigationEndpoint": {
+        "browseEndpoint": {
+            "browseId": "UCartist",
+            "browseEndpointContextSupportedConfigs": {
+                "browseEndpointContextMusicConfig": {
+                    "pageType": "MUSIC_PAGE_TYPE_ARTIST",
+                },
+            },
+        },
+    },
+}
+TRACK = {
+    "title": {"runs": [{"text": "Title"}]},
+    "longBylineText": {
+        "runs": [ARTIST_RUN, {"text": " • "}, {"text": "Album"}],
+    },
+    "lengthText": {"runs": [{"text": "3:15"}]},
+    "thumbnail": {
+        "thumbnails": [
+            {"url": "https://i.ytimg.com/vi/id/sddefault.jpg", "width": 60},
+            {"url": "https://i.ytimg.com/vi/id/hqdefault.jpg", "width": 120},
+        ],
+    },
+    "navigationEndpoint": {
+        "watchEndpoint": {"videoId": "dQw4w9WgXcQ", "params": "wAEB"},
+    },
+    "videoId": "dQw4w9WgXcQ",
+    "trackingParams": "CAAQ",
+}
+PLAYLIST = {
+    "aspectRatio": "MUSIC_TWO_ROW_ITEM_THUMBNAIL_ASPECT_RATIO_SQUARE",
+    "title": {"runs": [{"text": "Album"}]},
+    "subtitle": {"runs": [{"text": "Album"}, {"text": " • "}, ARTIST_RUN]},
+    "menu": {
+        "menuRenderer": {
+            "items": [
+                {
+                    "menuNavigationItemRenderer": {
+                        "navigationEndpoint": {
+                            "watchPlaylistEndpoint": {
+                                "playlistId": "OLAK5uy_album",
+                                "params": "wAEB",
+                            },
+                        },
+                    },
+                },
+                {"menuServiceItemRenderer": {}},
+            ],
+        },
+    },
+    "trackingParams": "CAAQ",
+}
+
+
+def recorded_responses(kind: str) -> list[dict]:
+    """Return recorded raw responses of `kind` (playlists or tracks)."""
+    return [
+        json_utils.read_json(response_file)
+        for response_file in sorted(Path(RESPONSES_DIR, kind).glob("*.json"))
+    ]
+
+
+def scaled_items(template: dict, size: int = QUEUE_SIZE) -> list[dict]:
+    """Copy raw item `size` times, each copy has unique ids."""
+    items = []
+    for index in range(size):
+        item = copy.deepcopy(template)
+        if "videoId" in item:
+            item["videoId"] = f"video{index:06d}"
+        items.append(item)
+    return items
+
+
+def tracks(size: int = QUEUE_SIZE) -> list[dict]:
+    """Return recorded tracks scaled up to `size` items (or synthetic)."""
+    templates = recorded_responses("tracks") or [TRACK]
+    return [
+        item
+        for template in templates
+        for item in scaled_items(template, size // len(templates))
+    ]
+
+
+def playlists(size: int = QUEUE_SIZE) -> list[dict]:
+    """Return recorded playlists scaled up to `size` items (or synthetic)."""
+    templates = recorded_responses("playlists") or [PLAYLIST]
+    return [
+        item
+        for template in templates
+        for item in scaled_items(template, size // len(templates))
+    ]
+
+
+def queue_response(size: int = QUEUE_SIZE) -> dict:
+    """Raw get_queue response with `size` tracks."""
+    return {
+        "queueDatas": [
+            {"content": {"playlistPanelVideoRenderer": track}}
+            for track in tracks(size)
+        ],
+        "responseContext": {"visitorData": "CgtW"},
+    }
+
+
+def browse_response(size: int = QUEUE_SIZE) -> dict:
+    """Raw browse response with `size` playlists in one grid."""
+    return {
+        "contents": {
+            "singleColumnBrowseResultsRenderer": {
+                "tabs": [
+                    {
+                        "tabRenderer": {
+                            "content": {
+                                "sectionListRenderer": {
+                                    "contents": [
+                                        {
+                                            "gridRenderer": {
+                                                "items": [
+                                                    {
+                                                        "musicTwoRowItemRenderer": playlist,
+                                                    }
+                                                    for playlist in playlists(
+                                                        size,
+                                                    )
+                                                ],
+                                            },
+                                        },
+                                    ],
+                                },
+                            },
+                        },
+                    },
+                ],
+            },
+        },
+        "responseContext": {"visitorData": "CgtW"},
+    }
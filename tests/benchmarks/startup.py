@@ -0,0 +1,122 @@
+"""Measure cold start: import time per module and time to first frame.
+
+Every measurement runs in fresh interpreter, so modules aren't cached.
+
+Run: `python -m tests.benchmarks.startup`
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+# modules of app startup, heavy dependencies and entry points
+MODULES = (
+    "textual.app",
+    "curl_cffi.requests",
+    "yt_dlp",
+    "pyperclip",
+    "ytm_browser.core.api_client",
+    "ytm_browser.core.downloader",
+    "ytm_browser.start_endpoints",
+    "ytm_browser.textual_ui.app",
+    "ytm_browser.cli",
+)
+# modules which shouldn't be loaded before first frame
+DEFERRED_MODULES = ("yt_dlp", "pyperclip")
+# root of project, first frame probe is run as its module
+PROJECT_DIR = Path(__file__).resolve().parents[2]
+
+
+@dataclass
+class StartupReport:
+    # {module: cumulative import time}
+    import_sec: dict[str, float]
+    # imports of app modules and run until first frame is rendered
+    first_frame_sec: float
+    app_import_sec: float
+    loaded_deferred_modules: list[str]
+
+    def __str__(self) -> str:
+        lines = [
+            f"{module:<32}{sec * 1000:8.1f} ms"
+            for module, sec in self.import_sec.items()
+        ]
+        lines.extend(
+            (
+                f"{'app imports':<32}{self.app_import_sec * 1000:8.1f} ms",
+                f"{'time to first frame':<32}"
+                f"{self.first_frame_sec * 1000:8.1f} ms",
+                f"loaded before first frame: "
+                f"{', '.join(self.loaded_deferred_modules) or 'none'}",
+            ),
+        )
+        return "\n".join(lines)
+
+
+def import_time(module: str) -> float:
+    """Return cumulative import time of `module` in fresh interpreter.
+
+    Args:
+    ----
+        module (str): dotted name of module
+
+    Returns:
+    -------
+        float: seconds (`-X importtime` of the module line)
+
+    """
+    imported = subprocess.run(
+        [  # noqa: S603
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import {module}",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    # line format: "import time: self [us] | cumulative | imported package"
+    for line in reversed(imported.stderr.splitlines()):
+        _, cumulative_us, name = line.rsplit("|", 2)
+        if name.strip() == module:
+            return int(cumulative_us) / 1e6
+    msg = f"import time of {module} not found"
+    raise ValueError(msg)
+
+
+def first_frame() -> dict:
+    """Run app headless in fresh interpreter until its first frame."""
+    measured = subprocess.run(
+        [  # noqa: S603
+            sys.executable,
+            "-m",
+            "tests.benchmarks.first_frame",
+        ],
+        capture_output=True,
+        cwd=PROJECT_DIR,
+        check=True,
+        text=True,
+    )
+    return json.loads(measured.stdout.strip().splitlines()[-1])
+
+
+def measure_startup(modules: tuple[str, ...] = MODULES) -> StartupReport:
+    first_frame_result = first_frame()
+    return StartupReport(
+        import_sec={module: import_time(module) for module in modules},
+        first_frame_sec=first_frame_result["first_frame_sec"],
+        app_import_sec=first_frame_result["import_sec"],
+        loaded_deferred_modules=first_frame_result["loaded_deferred_modules"],
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    arguments = parser.parse_args()
+    print(measure_startup(tuple(arguments.modules)))  # noqa: T201
@@ -0,0 +1,100 @@
+import json
+from collections.abc import Callable
+
+import pytest
+
+from tests.benchmarks import bench, fixtures
+from utils import json_stream, parse_util
+from ytm_browser.core import responses
+
+pytestmark = pytest.mark.skipif(
+    not bench.is_enabled(),
+    reason=f"set {bench.BENCHMARK_ENV}=1 to run benchmarks",
+)
+
+TITLE_CHAIN = ("title", "runs")
+
+
+def _children_chunks(raw_response: dict) -> list[bytes]:
+    raw_body = json.dumps(raw_response).encode()
+    chunk_size = 64 * 1024
+    return [
+        raw_body[start : start + chunk_size]
+        for start in range(0, len(raw_body), chunk_size)
+    ]
+
+
+def _cases() -> dict[str, tuple[Callable[[], object], int]]:
+    # {benchmark name: (benchmarked code, number of processed items)}
+    tracks = fixtures.tracks()
+    playlists = fixtures.playlists()
+    queue = fixtures.queue_response()
+    browse = fixtures.browse_response()
+    queue_chunks = _children_chunks(queue)
+    playlist = responses.parse_response(fixtures.PLAYLIST)
+    endpoint = responses.EndpointResponse(
+        {"title": "Library", "payload": {"browse_id": "FEmusic_library"}},
+    )
+    extract_title = parse_util.compile_chain(TITLE_CHAIN)
+    return {
+        "extract_chain": (
+            lambda: [
+                parse_util.extract_chain(track, TITLE_CHAIN)
+                for track in tracks
+            ],
+            len(tracks),
+        ),
+        "compiled_chain": (
+            lambda: [extract_title(track) for track in tracks],
+            len(tracks),
+        ),
+        "parse_response_track": (
+            lambda: [responses.parse_response(track) for track in tracks],
+            len(tracks),
+        ),
+        "parse_response_playlist": (
+            lambda: [
+                responses.parse_response(playlist) for playlist in playlists
+            ],
+            len(playlists),
+        ),
+        "track_response_display": (
+            lambda: [
+                str(track) for track in responses.parse_responses(tracks)
+            ],
+            len(tracks),
+        ),
+        "queue_children": (
+            lambda: playlist._parse_children(queue),  # noqa: SLF001
+            len(queue["queueDatas"]),
+        ),
+        "browse_children": (
+            lambda: endpoint._parse_children(browse),  # noqa: SLF001
+            len(playlists),
+        ),
+        "streamed_queue_children": (
+            lambda: list(
+                json_stream.iter_chain_items(
+                    queue_chunks,
+                    [rules.chain for rules in playlist.set_chain_children()],
+                ),
+            ),
+            len(queue["queueDatas"]),
+        ),
+    }
+
+
+CASES = _cases() if bench.is_enabled() else {}
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_benchmark(name: str) -> None:
+    func, items_number = CASES[name]
+    result = bench.measure(func, items_number)
+    baseline = bench.load_baselines().get(name)
+    print(f"{name}: {result} (baseline: {baseline})")  # noqa: T201
+    if bench.is_update() or baseline is None:
+        bench.save_baseline(name, result)
+        return
+    regressions = bench.regressions(result, baseline, bench.threshold())
+    assert not regressions, f"{name} regressed: {regressions}"
@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+import pytest
+
+from tests.benchmarks import bench, startup
+
+pytestmark = pytest.mark.skipif(
+    not bench.is_enabled(),
+    reason=f"set {bench.BENCHMARK_ENV}=1 to run benchmarks",
+)
+
+
+def test_startup() -> None:
+    report = startup.measure_startup()
+    print(f"\n{report}")  # noqa: T201
+    assert not report.loaded_deferred_modules
+
+
+def test_downloader_import_is_lazy() -> None:
+    imported_modules = subprocess.run(
+        [  # noqa: S603
+            sys.executable,
+            "-c",
+            "import sys, ytm_browser.core.downloader; print(*sys.modules)",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.split()
+    for module in startup.DEFERRED_MODULES:
+        assert module not in imported_modules
@@ -0,0 +1,35 @@
+from collections.abc import Iterator
+
+import pytest
+
+from tests.stand_in import load_generator, server
+from utils import retry
+from ytm_browser.core import api_client
+
+
+@pytest.fixture()
+def stand_in() -> Iterator[server.StandInServer]:
+    with server.StandInServer() as stand_in_server:
+        yield stand_in_server
+
+
+@pytest.fixture()
+def client(stand_in: server.StandInServer) -> Iterator[api_client.SyncClient]:
+    sync_client = api_client.SyncClient()
+    sync_client.set_credentials(load_generator.STAND_IN_CREDENTIALS)
+    sync_client.set_cache(None)
+    sync_client.set_base_url(stand_in.base_url)
+    sync_client.set_retry_policy(
+        retry.RetryPolicy(
+            attempts_number=2,
+            base_sleep_sec=0,
+            retry_on=api_client.DEFAULT_RETRY_POLICY.retry_on,
+        ),
+    )
+    sync_client.set_rate_limiter(None)
+    yield sync_client
+    sync_client.set_cache(None)
+    sync_client.set_base_url(api_client.DEFAULT_BASE_URL)
+    sync_client.set_retry_policy(api_client.DEFAULT_RETRY_POLICY)
+    sync_client.set_rate_limiter(api_client.SyncClient.rate_limiter)
+    sync_client.set_max_in_flight(api_client.DEFAULT_MAX_IN_FLIGHT)
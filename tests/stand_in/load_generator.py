@@ -0,0 +1,157 @@
+"""Load generator of api_client against the stand-in server.
+
+Run: `python -m tests.stand_in.load_generator --sessions 16 --requests 2000`
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from curl_cffi import requests
+
+from tests.stand_in import server
+from utils import rate_limit
+from ytm_browser.core import api_client, credentials, custom_exceptions
+
+DEFAULT_SESSIONS = 8
+DEFAULT_REQUESTS = 1000
+PAYLOADS = (
+    {"browse_id": "FEmusic_library_landing"},
+    {"browse_id": "FEmusic_liked_playlists"},
+    {"playlistId": "OLAK5uy_album", "params": "wAEB"},
+)
+STAND_IN_CREDENTIALS = credentials.Credentials(
+    headers={"cookie": "SAPISID=stand-in", "x-goog-authuser": "0"},
+    params={"prettyPrint": "false"},
+    json_data={"context": {"client": {"clientName": "WEB_REMIX"}}},
+)
+
+
+@dataclass
+class LoadReport:
+    elapsed_sec: float = 0.0
+    latencies_sec: list[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+
+    @property
+    def throughput(self) -> float:
+        """Succeeded requests per second."""
+        return len(self.latencies_sec) / self.elapsed_sec
+
+    def percentile(self, percent: int) -> float:
+        if len(self.latencies_sec) < 2:  # noqa: PLR2004
+            return self.latencies_sec[0] if self.latencies_sec else 0.0
+        return statistics.quantiles(self.latencies_sec, n=100)[percent - 1]
+
+    def __str__(self) -> str:
+        errors = ", ".join(
+            f"{error} {count}" for error, count in self.errors.most_common()
+        )
+        return (
+            f"requests: {len(self.latencies_sec)} ok"
+            f"{f' ({errors})' if errors else ''}, "
+            f"p50: {self.percentile(50) * 1000:.1f} ms, "
+            f"p99: {self.percentile(99) * 1000:.1f} ms, "
+            f"throughput: {self.throughput:.0f} req/s"
+        )
+
+
+async def run_load(
+    base_url: str,
+    sessions: int = DEFAULT_SESSIONS,
+    requests_number: int = DEFAULT_REQUESTS,
+    rate_per_sec: float | None = None,
+) -> LoadReport:
+    """Send `requests_number` requests by `sessions` concurrent workers.
+
+    Args:
+    ----
+        base_url (str): url of stand-in server
+        sessions (int, optional): concurrent requests (workers).\
+            Defaults to DEFAULT_SESSIONS.
+        requests_number (int, optional): total number of requests.\
+            Defaults to DEFAULT_REQUESTS.
+        rate_per_sec (float | None, optional): rate limit of client\
+            (token bucket). Defaults to None (unlimited).
+
+    Returns:
+    -------
+        LoadReport: latencies, errors and throughput
+
+    """
+    client = api_client.AsyncClient(max_in_flight=sessions)
+    client.set_credentials(STAND_IN_CREDENTIALS)
+    client.set_base_url(base_url)
+    client.set_cache(None)
+    # every request of load should reach the server
+    client.set_in_flight_requests(None)
+    client.set_rate_limiter(
+        rate_limit.TokenBucket(rate_per_sec) if rate_per_sec else None,
+    )
+    report = LoadReport()
+    pending = iter(range(requests_number))
+
+    async def worker() -> None:
+        for request_index in pending:
+            payload = PAYLOADS[request_index % len(PAYLOADS)]
+            start = time.perf_counter()
+            try:
+                await client.send_request(payload)
+            except (
+                custom_exceptions.CredentialsDataError,
+                custom_exceptions.TooManyRetryError,
+                requests.RequestsError,
+                ValueError,
+            ) as exc:
+                report.errors[type(exc).__name__] += 1
+            else:
+                report.latencies_sec.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*[worker() for _ in range(sessions)])
+    finally:
+        await client.close()
+        client.set_base_url(api_client.DEFAULT_BASE_URL)
+        client.set_rate_limiter(api_client.AsyncClient.rate_limiter)
+        client.set_in_flight_requests(
+            api_client.AsyncClient.in_flight_requests,
+        )
+    report.elapsed_sec = time.perf_counter() - start
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS)
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--rate", type=float, default=None)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--unauthorized-rate", type=float, default=0.0)
+    parser.add_argument("--throttled-rate", type=float, default=0.0)
+    parser.add_argument("--truncated-rate", type=float, default=0.0)
+    parser.add_argument("--responses-dir", default=server.RESPONSES_DIR)
+    args = parser.parse_args()
+    faults = server.Faults(
+        latency_sec=args.latency,
+        unauthorized_rate=args.unauthorized_rate,
+        throttled_rate=args.throttled_rate,
+        truncated_rate=args.truncated_rate,
+    )
+    with server.StandInServer(args.responses_dir, faults) as stand_in:
+        report = asyncio.run(
+            run_load(
+                stand_in.base_url,
+                args.sessions,
+                args.requests,
+                args.rate,
+            ),
+        )
+    print(report)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""Local stand-in of YoutubeMusic API which serves recorded responses.
+
+Responses are read from `responses_dir`: `browse/<browseId>.json` and
+`get_queue/<playlistId or videoId>.json` (`default.json` of route is
+served for unknown ids). Synthetic benchmark fixtures are served when
+there is no recorded file at all.
+"""
+
+import json
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Self
+
+from tests.benchmarks import fixtures
+from ytm_browser.core import api_client
+
+RESPONSES_DIR = "tests/raw_responses/stand_in"
+DEFAULT_ITEMS_NUMBER = 100
+
+
+@dataclass
+class Faults:
+    """Injected faults, rates are probabilities of fault for one request."""
+
+    latency_sec: float = 0.0
+    unauthorized_rate: float = 0.0
+    throttled_rate: float = 0.0
+    truncated_rate: float = 0.0
+    retry_after_sec: int = 1
+    seed: int | None = None
+    _random: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._random = random.Random(self.seed)
+
+    def pick(self) -> HTTPStatus | None:
+        """Return status of injected fault for the next request."""
+        roll = self._random.random()
+        for status, rate in (
+            (HTTPStatus.UNAUTHORIZED, self.unauthorized_rate),
+            (HTTPStatus.TOO_MANY_REQUESTS, self.throttled_rate),
+            (HTTPStatus.PARTIAL_CONTENT, self.truncated_rate),
+        ):
+            if roll < rate:
+                return status
+            roll -= rate
+        return None
+
+
+class StandInServer:
+    """Threaded HTTP server of browse and get_queue routes.
+
+    Usage:
+        with StandInServer(faults=Faults(latency_sec=0.05)) as server:
+            api_client.SyncClient().set_base_url(server.base_url)
+    """
+
+    def __init__(
+        self,
+        responses_dir: str | Path = RESPONSES_DIR,
+        faults: Faults | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.responses_dir = Path(responses_dir)
+        self.faults = faults or Faults()
+        self.requests_number = 0
+        self._lock = threading.Lock()
+        self._bodies: dict[tuple[str, str], bytes] = {}
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> Self:
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.stop()
+
+    def body(self, route: str, request_json: dict) -> bytes | None:
+        """Return encoded response of route (None for unknown payload)."""
+        item_id = ITEM_ID_PARSERS[route](request_json)
+        if item_id is None:
+            return None
+        with self._lock:
+            self.requests_number += 1
+            if (route, item_id) not in self._bodies:
+                self._bodies[route, item_id] = json.dumps(
+                    self._read_response(route, item_id),
+                ).encode()
+            return self._bodies[route, item_id]
+
+    def _read_response(self, route: str, item_id: str) -> dict:
+        for response_file in (
+            self.responses_dir / route / f"{item_id}.json",
+            self.responses_dir / route / "default.json",
+        ):
+            if response_file.exists():
+                with response_file.open(encoding="utf-8") as fs:
+                    return json.load(fs)
+        if route == "browse":
+            return fixtures.browse_response(DEFAULT_ITEMS_NUMBER)
+        return fixtures.queue_response(DEFAULT_ITEMS_NUMBER)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # server of routes (it's set by `_make_handler`)
+    stand_in: StandInServer
+
+    def do_POST(self) -> None:  # noqa: N802
+        route = ROUTES.get(self.path.split("?", 1)[0])
+        request_json = self._read_json()
+        body = (
+            self.stand_in.body(route, request_json)
+            if route is not None
+            else None
+        )
+        if body is None:
+            self.send_status(HTTPStatus.NOT_FOUND)
+            return
+        faults = self.stand_in.faults
+        if faults.latency_sec:
+            time.sleep(faults.latency_sec)
+        FAULT_SENDERS[faults.pick()](self, body, faults)
+
+    def send_status(
+        self,
+        status: HTTPStatus,
+        headers: dict | None = None,
+    ) -> None:
+        body = json.dumps(
+            {"error": {"code": status.value, "status": status.phrase}},
+        ).encode()
+        self.send_response(status)
+        for header, value in (headers or {}).items():
+            self.send_header(header, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_body(self, body: bytes, sent_length: int) -> None:
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body[:sent_length])
+
+    def log_message(self, *_args: object) -> None:
+        # keep output of tests and load runs clean
+        return
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            return {}
+
+
+def _make_handler(server: StandInServer) -> type[BaseHTTPRequestHandler]:
+    return type("Handler", (_Handler,), {"stand_in": server})
+
+
+def _browse_item_id(request_json: dict) -> str | None:
+    match request_json:
+        case (
+            {"browseId": item_id}
+            | {"browse_id": item_id}
+            | {"continuation": item_id}
+        ):
+            return item_id
+    return None
+
+
+def _queue_item_id(request_json: dict) -> str | None:
+    match request_json:
+        case {"playlistId": item_id} | {"videoId": item_id}:
+            return item_id
+    return None
+
+
+def _send_ok(handler: _Handler, body: bytes, _faults: Faults) -> None:
+    handler.send_body(body, len(body))
+
+
+def _send_unauthorized(
+    handler: _Handler,
+    _body: bytes,
+    _faults: Faults,
+) -> None:
+    handler.send_status(HTTPStatus.UNAUTHORIZED)
+
+
+def _send_throttled(handler: _Handler, _body: bytes, faults: Faults) -> None:
+    handler.send_status(
+        HTTPStatus.TOO_MANY_REQUESTS,
+        {"Retry-After": str(faults.retry_after_sec)},
+    )
+
+
+def _send_truncated(handler: _Handler, body: bytes, _faults: Faults) -> None:
+    # declare full body, but close connection in the middle
+    handler.send_body(body, len(body) // 2)
+    handler.close_connection = True
+
+
+# {path: route name}
+ROUTES = {
+    api_client.BROWSE_PATH: "browse",
+    api_client.GET_QUEUE_PATH: "get_queue",
+}
+# {route name: parser of requested id (None for unknown payload)}
+ITEM_ID_PARSERS: dict[str, Callable[[dict], str | None]] = {
+    "browse": _browse_item_id,
+    "get_queue": _queue_item_id,
+}
+# {picked fault (None is no fault): sender of response}
+FAULT_SENDERS: dict[
+    HTTPStatus | None,
+    Callable[[_Handler, bytes, Faults], None],
+] = {
+    None: _send_ok,
+    HTTPStatus.UNAUTHORIZED: _send_unauthorized,
+    HTTPStatus.TOO_MANY_REQUESTS: _send_throttled,
+    HTTPStatus.PARTIAL_CONTENT: _send_truncated,
+}
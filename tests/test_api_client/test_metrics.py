@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+
+from tests.stand_in import server
+from ytm_browser.core import api_client, cache, custom_exceptions, metrics
+
+LIBRARY = {"browse_id": "FEmusic_library_landing"}
+
+
+@pytest.fixture()
+def client(
+    client: api_client.SyncClient,
+    tmp_path: Path,
+) -> api_client.SyncClient:
+    client.set_cache(cache.ResponseCache(tmp_path / "cache.sqlite"))
+    client.request_metrics.reset()
+    return client
+
+
+def test_histogram_buckets() -> None:
+    histogram = metrics.Histogram(buckets=(1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.snapshot()["sum"] == 56.5  # noqa: PLR2004
+
+
+def test_request_metrics(client: api_client.SyncClient) -> None:
+    client.send_request(LIBRARY)
+    client.send_request(LIBRARY)
+    snapshot = client.request_metrics.snapshot()["browse"]
+    assert snapshot["requests"] == 1
+    assert snapshot["cache_hits"] == 1
+    assert snapshot["status_codes"] == {200: 1}
+    assert snapshot["response_bytes"]["sum"] > 0
+    assert snapshot["decode_sec"]["count"] == 1
+
+
+def test_failed_request_metrics(client: api_client.SyncClient) -> None:
+    client.set_cache(None)
+    with server.StandInServer(
+        faults=server.Faults(unauthorized_rate=1),
+    ) as stand_in:
+        client.set_base_url(stand_in.base_url)
+        with pytest.raises(custom_exceptions.CredentialsDataError):
+            client.send_request(LIBRARY)
+    snapshot = client.request_metrics.snapshot()["browse"]
+    assert snapshot["status_codes"] == {401: 1}
+    assert snapshot["errors"] == {"CredentialsDataError": 1}
+
+
+def test_prometheus_dump(
+    client: api_client.SyncClient,
+    tmp_path: Path,
+) -> None:
+    client.send_request(LIBRARY)
+    metrics_file = tmp_path / "metrics.prom"
+    client.request_metrics.dump_prometheus(metrics_file)
+    text = metrics_file.read_text()
+    assert 'ytm_client_requests_total{endpoint="browse"} 1' in text
+    assert 'ytm_client_latency_sec_bucket{endpoint="browse",le="+Inf"} 1' in (
+        text
+    )
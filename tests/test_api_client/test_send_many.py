@@ -0,0 +1,85 @@
+import time
+
+from tests.stand_in import server
+from ytm_browser.core import (
+    api_client,
+    custom_exceptions,
+    pagination,
+    responses,
+)
+
+LATENCY_SEC = 0.2
+BATCH_SIZE = 8
+LIBRARY = {"browse_id": "FEmusic_library_landing"}
+QUEUE = {"playlistId": "OLAK5uy_album", "params": "wAEB"}
+WRONG_PAYLOAD = {"unknown": "payload"}
+
+
+
+def test_results_are_in_payloads_order(
+    client: api_client.SyncClient,
+) -> None:
+    results = client.send_many([LIBRARY, WRONG_PAYLOAD, QUEUE])
+    assert "contents" in results[0]
+    assert isinstance(results[1], custom_exceptions.PayloadError)
+    playlist = responses.parse_response(server.fixtures.PLAYLIST)
+    assert (
+        len(playlist._parse_children(results[2]))  # noqa: SLF001
+        == server.DEFAULT_ITEMS_NUMBER
+    )
+
+
+def test_failed_request_does_not_abort_batch(
+    stand_in: server.StandInServer,
+    client: api_client.SyncClient,
+) -> None:
+    stand_in.faults = server.Faults(unauthorized_rate=1)
+    results = client.send_many([LIBRARY, QUEUE])
+    assert all(
+        isinstance(result, custom_exceptions.CredentialsDataError)
+        for result in results
+    )
+
+
+def test_batch_takes_time_of_slowest_request(
+    stand_in: server.StandInServer,
+    client: api_client.SyncClient,
+) -> None:
+    stand_in.faults = server.Faults(latency_sec=LATENCY_SEC)
+    client.set_max_in_flight(BATCH_SIZE)
+    started_at = time.perf_counter()
+    results = client.send_many(
+        [{"playlistId": f"PL{index}"} for index in range(BATCH_SIZE)],
+    )
+    elapsed_sec = time.perf_counter() - started_at
+    assert all(isinstance(result, dict) for result in results)
+    assert elapsed_sec < LATENCY_SEC * BATCH_SIZE / 2
+
+
+def test_load_children_many(client: api_client.SyncClient) -> None:  # noqa: ARG001
+    playlists = [
+        responses.parse_response(server.fixtures.PLAYLIST)
+        for _ in range(BATCH_SIZE)
+    ]
+    broken = responses.EndpointResponse(
+        {"title": "Broken", "payload": WRONG_PAYLOAD},
+    )
+    children = responses.load_children_many([*playlists, broken])
+    assert isinstance(children[-1], custom_exceptions.PayloadError)
+    for playlist, playlist_children in zip(playlists, children, strict=False):
+        assert isinstance(playlist_children, pagination.PagedChildren)
+        assert playlist.children is playlist_children
+        assert len(playlist_children) == server.DEFAULT_ITEMS_NUMBER
+
+
+def test_identical_requests_are_coalesced(
+    stand_in: server.StandInServer,
+    client: api_client.SyncClient,
+) -> None:
+    stand_in.faults = server.Faults(latency_sec=LATENCY_SEC)
+    client.request_metrics.reset()
+    results = client.send_many([QUEUE] * BATCH_SIZE)
+    assert all(result is results[0] for result in results)
+    snapshot = client.request_metrics.snapshot()["get_queue"]
+    assert snapshot["requests"] == 1
+    assert snapshot["coalesced"] == BATCH_SIZE - 1
@@ -0,0 +1,145 @@
+from collections.abc import Iterator
+
+import pytest
+from curl_cffi import requests
+
+from tests.stand_in import load_generator, server
+from utils import retry
+from ytm_browser.core import (
+    api_client,
+    credentials,
+    custom_exceptions,
+    session_pool,
+)
+
+PUBLIC = {"browse_id": "FEmusic_new_releases_albums"}
+PERSONAL = {"browse_id": "FEmusic_library_landing"}
+
+
+def account(name: str) -> credentials.Credentials:
+    return credentials.Credentials(
+        headers={"cookie": f"SAPISID={name}", "x-goog-authuser": "0"},
+        params=load_generator.STAND_IN_CREDENTIALS.params,
+        json_data=load_generator.STAND_IN_CREDENTIALS.json_data,
+    )
+
+
+@pytest.fixture()
+def pool() -> session_pool.SessionPool:
+    return session_pool.SessionPool(
+        {"first": account("first"), "second": account("second")},
+    )
+
+
+@pytest.fixture()
+def client(
+    client: api_client.SyncClient,
+    pool: session_pool.SessionPool,
+) -> Iterator[api_client.SyncClient]:
+    client.set_accounts_pool(pool)
+    client.set_retry_policy(
+        retry.RetryPolicy(
+            attempts_number=4,
+            base_sleep_sec=0,
+            retry_on=api_client.DEFAULT_RETRY_POLICY.retry_on,
+        ),
+    )
+    yield client
+    client.set_accounts_pool(None)
+
+
+@pytest.mark.parametrize(
+    ("payload", "personal"),
+    [
+        (PUBLIC, False),
+        (PERSONAL, True),
+        ({"browse_id": "FEmusic_listen_again"}, True),
+        ({"playlistId": "LM"}, True),
+        ({"browseId": "VLLM"}, True),
+        ({"playlistId": "RDTMAK5uy_supermix"}, True),
+        ({"playlistId": "RDCLAK5uy_curated"}, False),
+        ({"playlistId": "OLAK5uy_album"}, False),
+    ],
+)
+def test_is_personal(payload: dict, *, personal: bool) -> None:
+    assert session_pool.is_personal(payload) is personal
+
+
+def test_public_requests_are_spread(
+    client: api_client.SyncClient,
+    pool: session_pool.SessionPool,
+) -> None:
+    for _ in range(4):
+        client.send_request(PUBLIC)
+    assert [account.requests_number for account in pool.accounts] == [2, 2]
+
+
+def test_personal_requests_are_pinned(
+    client: api_client.SyncClient,
+    pool: session_pool.SessionPool,
+) -> None:
+    client.send_request(PERSONAL)
+    assert [account.requests_number for account in pool.accounts] == [0, 0]
+
+
+def test_rejected_accounts_are_out_of_rotation(
+    stand_in: server.StandInServer,
+    client: api_client.SyncClient,
+    pool: session_pool.SessionPool,
+) -> None:
+    stand_in.faults = server.Faults(unauthorized_rate=1)
+    # accounts of pool are rejected, then owner's credentials are used
+    with pytest.raises(custom_exceptions.CredentialsDataError):
+        client.send_request(PUBLIC)
+    assert pool.acquire() is None
+
+
+def test_library_ids_are_pinned(pool: session_pool.SessionPool) -> None:
+    private_playlist = {"browseId": "VLPLprivate"}
+    assert not pool.is_pinned(private_playlist)
+    # ids of public response aren't pinned
+    pool.pin_response(PUBLIC, {"items": [{"browseId": "VLPLprivate"}]})
+    assert not pool.is_pinned(private_playlist)
+    pool.pin_response(
+        PERSONAL,
+        {"items": [{"navigationEndpoint": {"browseId": "VLPLprivate"}}]},
+    )
+    assert pool.is_pinned(private_playlist)
+    assert pool.is_pinned({"playlistId": "PLprivate"})
+
+
+def test_unavailable_content_falls_back_to_owner(
+    stand_in: server.StandInServer,
+    client: api_client.SyncClient,
+    pool: session_pool.SessionPool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    for pooled_account in pool.accounts:
+        # unknown path of stand-in is 404 response
+        monkeypatch.setattr(
+            pooled_account,
+            "request_kwargs",
+            lambda request_kwargs, _payload: request_kwargs
+            | {"url": f"{stand_in.base_url}/not_found"},
+        )
+    assert client.send_request(PUBLIC)
+    assert stand_in.requests_number == 1
+    assert pool.is_pinned(PUBLIC)
+
+
+def test_failed_spread_request_is_retried_by_pool(
+    stand_in: server.StandInServer,
+    client: api_client.SyncClient,
+    pool: session_pool.SessionPool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def broken_post(**_kwargs: object) -> None:
+        msg = "connection reset"
+        raise requests.RequestsError(msg)
+
+    for pooled_account in pool.accounts:
+        monkeypatch.setattr(pooled_account.session, "post", broken_post)
+    # network errors aren't sent again by owner's session at once
+    with pytest.raises(custom_exceptions.TooManyRetryError):
+        client.send_request(PUBLIC)
+    assert stand_in.requests_number == 0
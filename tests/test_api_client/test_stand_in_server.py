@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from tests.stand_in import load_generator, server
+from utils import retry
+from ytm_browser.core import api_client, custom_exceptions, responses
+
+LIBRARY = {"browse_id": "FEmusic_library_landing"}
+QUEUE = {"playlistId": "OLAK5uy_album", "params": "wAEB"}
+
+
+
+def test_browse_and_queue_routes(client: api_client.SyncClient) -> None:
+    library = client.send_request(LIBRARY)
+    queue = client.send_request(QUEUE)
+    playlist = responses.parse_response(server.fixtures.PLAYLIST)
+    assert len(playlist._parse_children(queue)) == server.DEFAULT_ITEMS_NUMBER  # noqa: SLF001
+    assert "contents" in library
+
+
+@pytest.mark.parametrize(
+    ("faults", "error"),
+    [
+        (
+            server.Faults(unauthorized_rate=1),
+            custom_exceptions.CredentialsDataError,
+        ),
+        (
+            server.Faults(throttled_rate=1, retry_after_sec=0),
+            custom_exceptions.TooManyRetryError,
+        ),
+        (
+            server.Faults(truncated_rate=1),
+            custom_exceptions.TooManyRetryError,
+        ),
+    ],
+)
+def test_injected_faults(
+    stand_in: server.StandInServer,
+    client: api_client.SyncClient,
+    faults: server.Faults,
+    error: type[Exception],
+) -> None:
+    stand_in.faults = faults
+    with pytest.raises(error):
+        client.send_request(LIBRARY)
+
+
+def test_retry_after_throttling(
+    stand_in: server.StandInServer,
+    client: api_client.SyncClient,
+) -> None:
+    # every second request is throttled
+    stand_in.faults = server.Faults(
+        throttled_rate=0.5,
+        retry_after_sec=0,
+        seed=3,
+    )
+    client.set_retry_policy(
+        retry.RetryPolicy(attempts_number=10, base_sleep_sec=0),
+    )
+    client.request_metrics.reset()
+    for _ in range(10):
+        client.send_request(LIBRARY)
+    snapshot = client.request_metrics.snapshot()["browse"]
+    assert snapshot["retries"] == snapshot["status_codes"][429]
+    assert snapshot["status_codes"][200] == 10  # noqa: PLR2004
+
+
+def test_load_generator(stand_in: server.StandInServer) -> None:
+    report = asyncio.run(
+        load_generator.run_load(
+            stand_in.base_url,
+            sessions=4,
+            requests_number=20,
+        ),
+    )
+    assert len(report.latencies_sec) == 20  # noqa: PLR2004
+    assert stand_in.requests_number == len(report.latencies_sec)
+    assert not report.errors
+    assert report.percentile(50) <= report.percentile(99)
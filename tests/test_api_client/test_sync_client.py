@@ -0,0 +1,7 @@
+from ytm_browser.core import api_client
+
+
+def test_session_is_kept_between_instances() -> None:
+    session = api_client.SyncClient()._session  # noqa: SLF001
+    assert api_client.SyncClient() is api_client.SyncClient()
+    assert api_client.SyncClient()._session is session  # noqa: SLF001
@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from ytm_browser.core import archive
+
+
+def test_add_and_reload(tmp_path: Path) -> None:
+    archive_file = tmp_path / "archive.sqlite"
+    track_file = tmp_path / "track.mp3"
+    track_file.touch()
+    archive.DownloadArchive(archive_file).add("dQw4w9WgXcQ", track_file, "mp3")
+    download_archive = archive.DownloadArchive(archive_file)
+    assert "dQw4w9WgXcQ" in download_archive
+    assert download_archive.is_downloaded("dQw4w9WgXcQ")
+    track_file.unlink()
+    assert not download_archive.is_downloaded("dQw4w9WgXcQ")
+
+
+def test_concurrent_add(tmp_path: Path) -> None:
+    download_archive = archive.DownloadArchive(tmp_path / "archive.sqlite")
+    video_ids = [f"video{index:06d}" for index in range(200)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for video_id in video_ids:
+            executor.submit(download_archive.add, video_id, video_id, "mp3")
+    assert len(archive.DownloadArchive(tmp_path / "archive.sqlite")) == len(video_ids)
+
+
+def test_rebuild_from_filenames(tmp_path: Path) -> None:
+    music_dir = tmp_path / "music" / "playlist"
+    music_dir.mkdir(parents=True)
+    (music_dir / "Artist - Title [dQw4w9WgXcQ].mp3").touch()
+    (music_dir / "cover.jpg").touch()
+    download_archive = archive.DownloadArchive(tmp_path / "archive.sqlite")
+    download_archive.add("oldVideoId0", "missing.mp3", "mp3")
+    assert download_archive.rebuild(tmp_path / "music") == 1
+    assert download_archive.get("dQw4w9WgXcQ").audio_format == "mp3"
+    assert "oldVideoId0" not in download_archive
+
+
+def test_tracks_are_archived_per_profile(tmp_path: Path) -> None:
+    track_file = tmp_path / "track.opus"
+    track_file.touch()
+    download_archive = archive.DownloadArchive(tmp_path / "archive.sqlite")
+    download_archive.add("dQw4w9WgXcQ", track_file, "opus", profile="opus")
+    assert download_archive.existing_path("dQw4w9WgXcQ", "opus") == track_file
+    assert download_archive.existing_path("dQw4w9WgXcQ", "mp3") is None
+
+
+def test_missing_file_entry_is_dropped(tmp_path: Path) -> None:
+    track_file = tmp_path / "track.mp3"
+    track_file.touch()
+    download_archive = archive.DownloadArchive(tmp_path / "archive.sqlite")
+    download_archive.add("dQw4w9WgXcQ", track_file, "mp3")
+    track_file.unlink()
+    assert download_archive.existing_path("dQw4w9WgXcQ") is None
+    assert "dQw4w9WgXcQ" not in download_archive
+    assert not archive.DownloadArchive(tmp_path / "archive.sqlite")
+
+
+def test_rebuilt_profiles(tmp_path: Path) -> None:
+    music_dir = tmp_path / "music"
+    music_dir.mkdir()
+    for name in ("aaaaaaaaaaa].opus", "bbbbbbbbbbb].mp3", "ccccccccccc].webm"):
+        (music_dir / f"[{name}").touch()
+    download_archive = archive.DownloadArchive(tmp_path / "archive.sqlite")
+    download_archive.rebuild(music_dir)
+    assert download_archive.get("aaaaaaaaaaa", "opus") is not None
+    assert download_archive.get("aaaaaaaaaaa", "mp3") is None
+    # bitrate of mp3 and profile of webm aren't known, any profile matches
+    for video_id in ("bbbbbbbbbbb", "ccccccccccc"):
+        for profile in ("mp3", "mp3-320"):
+            assert download_archive.existing_path(video_id, profile)
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import pytest
+
+from ytm_browser.core import cache
+
+URL = "https://music.youtube.com/youtubei/v1/browse"
+
+
+@pytest.fixture()
+def response_cache(tmp_path: Path) -> cache.ResponseCache:
+    return cache.ResponseCache(tmp_path / "responses.sqlite")
+
+
+def test_make_key_is_canonical() -> None:
+    first_key = cache.make_key(URL, {"a": 1, "b": 2}, "account")
+    second_key = cache.make_key(URL, {"b": 2, "a": 1}, "account")
+    assert first_key == second_key
+    assert first_key != cache.make_key(URL, {"a": 1, "b": 2}, "other")
+
+
+def test_hit_and_miss(response_cache: cache.ResponseCache) -> None:
+    assert response_cache.get("key") is None
+    response_cache.put("key", "browse", {"contents": [1, 2, 3]})
+    assert response_cache.get("key") == {"contents": [1, 2, 3]}
+    assert response_cache.stats.hits == 1
+    assert response_cache.stats.misses == 1
+
+
+def test_expired_response(tmp_path: Path) -> None:
+    response_cache = cache.ResponseCache(
+        tmp_path / "responses.sqlite",
+        ttl_sec={"get_queue": -1},
+    )
+    response_cache.put("key", "get_queue", {"queueDatas": []})
+    assert response_cache.get("key") is None
+
+
+def test_lru_eviction(tmp_path: Path) -> None:
+    response_cache = cache.ResponseCache(
+        tmp_path / "responses.sqlite",
+        max_size_bytes=100,
+    )
+    for index in range(10):
+        response_cache.put(f"key{index}", "browse", {"index": index})
+        response_cache.get("key0")
+    assert response_cache.get("key0") == {"index": 0}
+    assert response_cache.get("key1") is None
+    assert response_cache.stats.evictions > 0
+
+
+def test_persistent_between_instances(tmp_path: Path) -> None:
+    cache_file = tmp_path / "responses.sqlite"
+    cache.ResponseCache(cache_file).put("key", "browse", {"title": "x"})
+    assert cache.ResponseCache(cache_file).get("key") == {"title": "x"}
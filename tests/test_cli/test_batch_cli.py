@@ -0,0 +1,51 @@
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from tests.stand_in import server
+from ytm_browser import cli
+
+
+def test_classify_ids() -> None:
+    endpoint_ids, playlist_ids = cli.classify_ids(
+        ["FEmusic_liked_playlists", "VLPLabc", "OLAK5uy_album", "PLabc"],
+    )
+    assert endpoint_ids == ["FEmusic_liked_playlists"]
+    # "VL" browse id and playlist id of the same playlist are merged
+    assert playlist_ids == ["PLabc", "OLAK5uy_album"]
+
+
+@pytest.mark.usefixtures("client")
+def test_resolve_playlists() -> None:
+    stream = io.StringIO()
+    playlists = cli.resolve_playlists(
+        [cli.LIBRARY_BROWSE_ID],
+        ["OLAK5uy_album"],
+        cli.EventWriter(stream),
+    )
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    # library playlists of stand-in are the same album as the cli id
+    assert list(playlists) == ["OLAK5uy_album"]
+    assert len(events) == 1
+    assert {event["event"] for event in events} == {"resolved"}
+    assert all(
+        event["tracks"] == server.DEFAULT_ITEMS_NUMBER and event["complete"]
+        for event in events
+    )
+
+
+def test_textual_is_not_imported() -> None:
+    imported_modules = subprocess.run(
+        [  # noqa: S603
+            sys.executable,
+            "-c",
+            "import sys, ytm_browser.cli; print(*sys.modules)",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.split()
+    assert "textual" not in imported_modules
@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tests.stand_in import server
+from ytm_browser.core import credentials, credentials_store
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+CURL_REQUEST = """curl 'https://music.youtube.com/youtubei/v1/browse?prettyPrint=false' \\
+  -H 'cookie: SAPISID={account}' \\
+  -H 'x-goog-authuser: 0' \\
+  --data-raw '{{"context":{{"client":{{"clientName":"WEB_REMIX"}}}}}}'
+"""
+
+
+def write_auth_file(path: Path, account: str) -> None:
+    path.write_text(CURL_REQUEST.format(account=account), encoding="utf-8")
+
+
+@pytest.fixture()
+def parse_calls(monkeypatch: pytest.MonkeyPatch) -> list[list[str]]:
+    calls: list[list[str]] = []
+    parse_curl_request: Callable = credentials.parse_curl_request
+
+    def counted_parse(raw_curl_content: list[str]) -> credentials.Credentials:
+        calls.append(raw_curl_content)
+        return parse_curl_request(raw_curl_content)
+
+    monkeypatch.setattr(credentials, "parse_curl_request", counted_parse)
+    return calls
+
+
+def test_rescan_parses_changed_files_only(
+    tmp_path: Path,
+    parse_calls: list[list[str]],
+) -> None:
+    write_auth_file(tmp_path / "first.txt", "first")
+    write_auth_file(tmp_path / "second.txt", "second")
+    (tmp_path / "notes.txt").write_text("not curl request\n")
+    store = credentials_store.CredentialsStore(tmp_path)
+    assert store.names() == ["first.txt", "second.txt"]
+    assert len(parse_calls) == 3  # noqa: PLR2004
+    first_credentials = store.get_credentials("first.txt")
+
+    # touched file with the same content isn't parsed again
+    os.utime(tmp_path / "first.txt", ns=(0, 0))
+    assert store.rescan() == set()
+    write_auth_file(tmp_path / "second.txt", "changed")
+    (tmp_path / "notes.txt").unlink()
+    assert store.rescan() == {"second.txt", "notes.txt"}
+    assert len(parse_calls) == 4  # noqa: PLR2004
+    assert store.get_credentials("first.txt") is first_credentials
+    assert "notes.txt" not in store
+
+
+def test_validate_marks_expired_accounts(tmp_path: Path) -> None:
+    write_auth_file(tmp_path / "expired.txt", "expired")
+    store = credentials_store.CredentialsStore(tmp_path)
+    with server.StandInServer(
+        faults=server.Faults(unauthorized_rate=1.0),
+    ) as stand_in:
+        assert store.validate(base_url=stand_in.base_url) == {
+            "expired.txt": False,
+        }
+        # checked accounts aren't probed again
+        assert store.validate(base_url=stand_in.base_url) == {}
+    assert store.valid_accounts() == {}
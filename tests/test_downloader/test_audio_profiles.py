@@ -0,0 +1,37 @@
+from pathlib import Path
+
+import pytest
+
+from ytm_browser.core import audio_profiles, downloader
+
+
+def test_passthrough_profiles() -> None:
+    assert audio_profiles.get_profile("opus").is_passthrough
+    # Opus stream isn't valid content of .ogg (Vorbis) file
+    assert not audio_profiles.get_profile("ogg").is_passthrough
+    assert audio_profiles.get_profile("m4a").format_id == (
+        audio_profiles.AAC_FORMAT
+    )
+    assert not audio_profiles.get_profile("mp3").is_passthrough
+
+
+def test_mp3_bitrate_profile() -> None:
+    profile = audio_profiles.get_profile("mp3-192")
+    assert profile == audio_profiles.mp3_profile(192)
+    assert "192k" in profile.codec_args
+
+
+def test_unknown_profile() -> None:
+    with pytest.raises(ValueError, match="flac"):
+        audio_profiles.get_profile("flac")
+
+
+def test_m4a_is_not_remuxed(tmp_path: Path) -> None:
+    source = tmp_path / "track.m4a"
+    source.touch()
+    profile = audio_profiles.get_profile("m4a")
+    assert downloader.transcode_audio(
+        str(source),
+        profile.extension,
+        profile.codec_args,
+    ) == str(source)
@@ -0,0 +1,99 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from ytm_browser.core import cover_cache
+
+COVER_SIZE = 100
+
+
+@pytest.fixture(autouse=True)
+def fake_convert(monkeypatch: pytest.MonkeyPatch) -> list[bytes]:
+    converted_images = []
+
+    def convert_image(image: bytes, cover_path: Path) -> None:
+        converted_images.append(image)
+        cover_path.write_bytes(image.ljust(COVER_SIZE, b"\0"))
+
+    monkeypatch.setattr(cover_cache, "_convert_image", convert_image)
+    return converted_images
+
+
+def test_known_url_is_not_fetched(tmp_path: Path) -> None:
+    covers = cover_cache.CoverCache(tmp_path / "covers")
+    fetched_urls = []
+
+    def fetch(url: str) -> bytes:
+        fetched_urls.append(url)
+        return url.encode()
+
+    for index in range(3):
+        target = covers.copy_cover(
+            "https://i/a.jpg",
+            fetch,
+            tmp_path / f"{index}.jpg",
+        )
+        assert target.read_bytes().startswith(b"https://i/a.jpg")
+    covers.close()
+    assert fetched_urls == ["https://i/a.jpg"]
+    assert (covers.stats.conversions, covers.stats.hits) == (1, 2)
+
+    # index is persistent
+    reopened_covers = cover_cache.CoverCache(tmp_path / "covers")
+    reopened_covers.copy_cover("https://i/a.jpg", fetch, tmp_path / "3.jpg")
+    reopened_covers.close()
+    assert len(fetched_urls) == 1
+
+
+def test_same_image_is_converted_once(
+    tmp_path: Path,
+    fake_convert: list[bytes],
+) -> None:
+    covers = cover_cache.CoverCache(tmp_path / "covers")
+    for size in ("w120", "w544"):
+        covers.copy_cover(
+            f"https://i/album={size}",
+            lambda _url: b"album art",
+            tmp_path / f"{size}.jpg",
+        )
+    covers.close()
+    assert fake_convert == [b"album art"]
+    assert covers.stats.content_hits == 1
+
+
+def test_concurrent_tracks_of_album(
+    tmp_path: Path,
+    fake_convert: list[bytes],
+) -> None:
+    covers = cover_cache.CoverCache(tmp_path / "covers")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        targets = list(
+            executor.map(
+                lambda index: covers.copy_cover(
+                    "https://i/album.jpg",
+                    lambda _url: b"album art",
+                    tmp_path / f"{index}.jpg",
+                ),
+                range(16),
+            ),
+        )
+    covers.close()
+    assert all(target.is_file() for target in targets)
+    assert len(fake_convert) == 1
+
+
+def test_least_recently_used_are_evicted(tmp_path: Path) -> None:
+    covers = cover_cache.CoverCache(
+        tmp_path / "covers",
+        max_size_bytes=COVER_SIZE * 2,
+    )
+    for name in ("first", "second", "first", "third"):
+        covers.copy_cover(name, str.encode, tmp_path / f"{name}.jpg")
+    covers.close()
+    assert covers.stats.evictions == 1
+    cached_covers = list((tmp_path / "covers").glob("*.jpg"))
+    assert len(cached_covers) == 2  # noqa: PLR2004
+    assert sorted(
+        cover.read_bytes().rstrip(b"\0") for cover in cached_covers
+    ) == [b"first", b"third"]
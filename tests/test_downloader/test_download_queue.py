@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import pytest
+
+from ytm_browser.core import download_queue, downloader, responses
+
+
+def make_playlist(
+    playlist_id: str,
+    video_ids: list[str],
+) -> responses.PlaylistResponse:
+    return responses.PlaylistResponse.from_payload(
+        f"playlist {playlist_id}",
+        {"browseId": f"VL{playlist_id}"},
+        [
+            responses.TrackResponse.from_fields(
+                video_id,
+                "artist",
+                f"title {video_id}",
+                "3:00",
+            )
+            for video_id in video_ids
+        ],
+    )
+
+
+def test_unfinished_playlists_are_reloaded(tmp_path: Path) -> None:
+    queue_file = tmp_path / "queue.sqlite"
+    queue_store = download_queue.DownloadQueueStore(queue_file)
+    for playlist_id, video_ids in (
+        ("PLdone", ["aaaaaaaaaaa"]),
+        ("PLhalf", ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"]),
+    ):
+        playlist = make_playlist(playlist_id, video_ids)
+        queue_store.add_playlist(playlist_id, playlist)
+        queue_store.set_tracks(playlist_id, list(playlist.children))
+    # not resolved playlist loads its tracks as usual after restart
+    queue_store.add_playlist("PLnew", make_playlist("PLnew", []))
+    queue_store.set_state("PLdone", "aaaaaaaaaaa", download_queue.DONE)
+    queue_store.set_state("PLhalf", "aaaaaaaaaaa", download_queue.DONE)
+    queue_store.set_video_state("bbbbbbbbbbb", download_queue.TRANSCODING)
+    queue_store.close()
+
+    reopened_store = download_queue.DownloadQueueStore(queue_file)
+    playlists = reopened_store.playlists()
+    assert list(playlists) == ["PLhalf", "PLnew"]
+    assert [track.video_id for track in playlists["PLhalf"].children] == [
+        "aaaaaaaaaaa",
+        "bbbbbbbbbbb",
+        "ccccccccccc",
+    ]
+    assert reopened_store.states("PLhalf") == {
+        "aaaaaaaaaaa": download_queue.DONE,
+        "bbbbbbbbbbb": download_queue.TRANSCODING,
+        "ccccccccccc": download_queue.PENDING,
+    }
+    assert reopened_store.remove_finished() == 1
+    assert "PLdone" not in reopened_store
+    reopened_store.close()
+
+
+def test_engine_skips_done_tracks(tmp_path: Path) -> None:
+    queue_store = download_queue.DownloadQueueStore(tmp_path / "queue.sqlite")
+    playlist = make_playlist("PLabc", ["aaaaaaaaaaa", "bbbbbbbbbbb"])
+    queue_store.add_playlist("PLabc", playlist)
+    queue_store.set_tracks("PLabc", list(playlist.children))
+    for video_id in ("aaaaaaaaaaa", "bbbbbbbbbbb"):
+        queue_store.set_state("PLabc", video_id, download_queue.DONE)
+
+    progress = downloader.DownloadEngine(
+        target_dir=tmp_path / "music",
+        queue_store=queue_store,
+        transcode_workers=1,
+    ).download(queue_store.playlists() | {"PLabc": playlist})
+    queue_store.close()
+    assert progress["PLabc"].skipped == 2  # noqa: PLR2004
+    assert progress["PLabc"].finished
+
+
+def test_failed_track_is_journaled(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def extract_track(_job: downloader.TrackJob) -> downloader.TrackJob:
+        # e.g. mutagen error of thumbnail embedding, not yt_dlp one
+        msg = "not a valid file"
+        raise ValueError(msg)
+
+    monkeypatch.setattr(downloader, "extract_track", extract_track)
+    queue_store = download_queue.DownloadQueueStore(tmp_path / "queue.sqlite")
+    progress = downloader.DownloadEngine(
+        target_dir=tmp_path / "music",
+        queue_store=queue_store,
+        transcode_workers=1,
+    ).download(
+        {
+            "PLabc": make_playlist("PLabc", ["aaaaaaaaaaa"]),
+            "PLdup": make_playlist("PLdup", ["aaaaaaaaaaa"]),
+        },
+    )
+    assert queue_store.states("PLabc") == {
+        "aaaaaaaaaaa": download_queue.FAILED,
+    }
+    queue_store.close()
+    assert progress["PLabc"].failed == 1
+    assert progress["PLabc"].finished
+    # the same track of other playlist isn't downloaded again
+    assert progress["PLdup"].failed == 1
@@ -0,0 +1,17 @@
+import pytest
+
+from ytm_browser.core import downloader
+
+
+@pytest.mark.parametrize(
+    ("title", "dirname"),
+    [
+        ("Liked music", "Liked music"),
+        ("AC/DC: Best of?", "AC_DC_ Best of_"),
+        ("Mix ...", "Mix"),
+        ("..", "_"),
+        ("con", "_con"),
+    ],
+)
+def test_playlist_dirname(title: str, dirname: str) -> None:
+    assert downloader.playlist_dirname(title) == dirname
@@ -0,0 +1,134 @@
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, ClassVar
+
+import pytest
+
+from ytm_browser.core import cover_cache, downloader, responses
+
+TRACK_INFO = {
+    "id": "aaaaaaaaaaa",
+    "title": "title",
+    "artist": "artist",
+    "uploader": "artist",
+    "thumbnail": "https://i/cover.jpg",
+}
+
+
+class FakePostProcessor:
+    def __init__(self, ydl: "FakeYoutubeDL", **_kwargs: Any) -> None:
+        self.ydl = ydl
+
+    def run(self, info: dict) -> dict:
+        self.ydl.postprocessed.append((type(self).__name__, info))
+        return info
+
+
+class EmbedThumbnailPP(FakePostProcessor):
+    pass
+
+
+class FFmpegMetadataPP(FakePostProcessor):
+    pass
+
+
+class FakeYoutubeDL:
+    # info passed to postprocessors of all instances
+    postprocessed: ClassVar[list[tuple[str, dict]]] = []
+
+    def __init__(self, options: dict) -> None:
+        self.options = options
+
+    def __enter__(self) -> "FakeYoutubeDL":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        pass
+
+    def process_ie_result(
+        self,
+        info: dict,
+        download: bool,  # noqa: FBT001
+    ) -> dict:
+        assert download
+        filepath = Path(self.options["outtmpl"]).parent / "track.webm"
+        filepath.write_bytes(b"audio")
+        requested_download = {"filepath": str(filepath), "ext": "webm"}
+        return info | {"requested_downloads": [requested_download]}
+
+    def urlopen(self, url: str) -> SimpleNamespace:
+        return SimpleNamespace(read=url.encode)
+
+    def run_pp(self, postprocessor: FakePostProcessor, info: dict) -> dict:
+        return postprocessor.run(info)
+
+
+@pytest.fixture()
+def postprocessed(
+    monkeypatch: pytest.MonkeyPatch,
+) -> list[tuple[str, dict]]:
+    fake_yt_dlp = SimpleNamespace(
+        YoutubeDL=FakeYoutubeDL,
+        postprocessor=SimpleNamespace(
+            EmbedThumbnailPP=EmbedThumbnailPP,
+            FFmpegMetadataPP=FFmpegMetadataPP,
+        ),
+    )
+    monkeypatch.setattr(downloader, "load_yt_dlp", lambda: fake_yt_dlp)
+    monkeypatch.setattr(FakeYoutubeDL, "postprocessed", [])
+    return FakeYoutubeDL.postprocessed
+
+
+def make_job(tmp_path: Path, **kwargs: Any) -> downloader.TrackJob:
+    return downloader.TrackJob(
+        responses.TrackResponse.from_fields(
+            "aaaaaaaaaaa",
+            "artist",
+            "title",
+            "3:00",
+        ),
+        tmp_path,
+        info=dict(TRACK_INFO),
+        **kwargs,
+    )
+
+
+def test_track_info_reaches_tag_stage(
+    tmp_path: Path,
+    postprocessed: list[tuple[str, dict]],
+) -> None:
+    job = downloader.fetch_track(make_job(tmp_path))
+    assert job.path == tmp_path / "track.webm"
+    assert downloader.tag_track(job) == job.path
+    assert [name for name, _ in postprocessed] == [
+        "EmbedThumbnailPP",
+        "FFmpegMetadataPP",
+    ]
+    for _, info in postprocessed:
+        assert info["title"] == TRACK_INFO["title"]
+        assert info["artist"] == TRACK_INFO["artist"]
+        assert info["thumbnail"] == TRACK_INFO["thumbnail"]
+        assert info["filepath"] == str(job.path)
+
+
+def test_cached_cover_is_embedded(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    postprocessed: list[tuple[str, dict]],
+) -> None:
+    monkeypatch.setattr(
+        cover_cache,
+        "_convert_image",
+        lambda image, cover_path: cover_path.write_bytes(image),
+    )
+    covers = cover_cache.CoverCache(tmp_path / "covers")
+    job = downloader.fetch_track(make_job(tmp_path, covers=covers))
+    downloader.tag_track(job)
+    covers.close()
+    cover_path = tmp_path / "track.jpg"
+    assert cover_path.read_bytes() == TRACK_INFO["thumbnail"].encode()
+    embed_name, embed_info = postprocessed[0]
+    assert embed_name == "EmbedThumbnailPP"
+    assert embed_info["thumbnails"] == [
+        {"url": TRACK_INFO["thumbnail"], "filepath": str(cover_path)},
+    ]
@@ -0,0 +1,187 @@
+from ytm_browser.core import pagination, responses
+
+PAGE_SIZE = 10
+PAGES = 5
+MAX_ITEMS = 15
+PLAYLIST = {
+    "aspectRatio": "MUSIC_TWO_ROW_ITEM_THUMBNAIL_ASPECT_RATIO_SQUARE",
+    "title": {"runs": [{"text": "Album"}]},
+    "menu": {
+        "menuRenderer": {
+            "items": [
+                {
+                    "menuNavigationItemRenderer": {
+                        "navigationEndpoint": {
+                            "watchPlaylistEndpoint": {
+                                "playlistId": "OLAK5uy_album",
+                                "params": "wAEB",
+                            },
+                        },
+                    },
+                },
+                {"menuServiceItemRenderer": {}},
+            ],
+        },
+    },
+}
+
+
+class FakePages:
+    def __init__(self) -> None:
+        self.requests: list[dict] = []
+
+    def fetch_page(self, payload: dict) -> dict:
+        self.requests.append(payload)
+        page = payload.get("page", 0)
+        return {
+            "items": list(range(page * PAGE_SIZE, (page + 1) * PAGE_SIZE)),
+            "next": {"page": page + 1} if page + 1 < PAGES else None,
+        }
+
+    def fetch_many(self, payloads: list[dict]) -> list[dict]:
+        return [self.fetch_page(payload) for payload in payloads]
+
+    @staticmethod
+    def parse_page(raw_page: dict) -> pagination.Page:
+        return raw_page["items"], raw_page["next"]
+
+
+def test_pages_are_loaded_on_demand() -> None:
+    pages = FakePages()
+    children = pagination.PagedChildren(
+        first_payload={"page": 0},
+        fetch_page=pages.fetch_page,
+        parse_page=pages.parse_page,
+    )
+    assert children[0] == 0
+    assert children[PAGE_SIZE + 1] == PAGE_SIZE + 1
+    assert pages.requests == [{"page": 0}, {"page": 1}]
+    assert not children.is_complete
+    assert list(children) == list(range(PAGE_SIZE * PAGES))
+    assert len(pages.requests) == PAGES
+    assert children.is_complete
+
+
+def test_max_items_stops_paging() -> None:
+    pages = FakePages()
+    children = pagination.PagedChildren(
+        first_payload={"page": 0},
+        fetch_page=pages.fetch_page,
+        parse_page=pages.parse_page,
+        max_items=MAX_ITEMS,
+    )
+    assert len(children) == MAX_ITEMS
+    assert len(pages.requests) == MAX_ITEMS // PAGE_SIZE + 1
+
+
+def test_known_page_payloads_are_fetched_by_batches() -> None:
+    pages = FakePages()
+    batches: list[int] = []
+
+    def fetch_many(payloads: list[dict]) -> list[dict]:
+        batches.append(len(payloads))
+        return pages.fetch_many(payloads)
+
+    children = pagination.PagedChildren(
+        first_payload={"page": 0},
+        fetch_page=pages.fetch_page,
+        parse_page=pages.parse_page,
+        page_payloads=lambda _: [{"page": page} for page in range(1, PAGES)],
+        fetch_many=fetch_many,
+        concurrent_pages=3,
+    )
+    assert children.load_all() == list(range(PAGE_SIZE * PAGES))
+    assert batches == [3, 1]
+    assert len(pages.requests) == PAGES
+
+
+def test_endpoint_continuation_page() -> None:
+    endpoint = responses.EndpointResponse(
+        {"title": "Library", "payload": {"browse_id": "FEmusic_library"}},
+    )
+    first_page = {
+        "contents": {
+            "content": {
+                "contents": {
+                    "items": [PLAYLIST],
+                    "continuations": [
+                        {"nextContinuationData": {"continuation": "TOKEN1"}},
+                    ],
+                },
+            },
+        },
+    }
+    next_page = {
+        "onResponseReceivedActions": [
+            {
+                "appendContinuationItemsAction": {
+                    "continuationItems": [
+                        PLAYLIST,
+                        {
+                            "continuationItemRenderer": {
+                                "continuationEndpoint": {
+                                    "continuationCommand": {"token": "TOKEN2"},
+                                },
+                            },
+                        },
+                    ],
+                },
+            },
+        ],
+    }
+    children, next_payload = endpoint._parse_page(first_page)  # noqa: SLF001
+    assert len(children) == 1
+    assert next_payload == {"continuation": "TOKEN1"}
+    children, next_payload = endpoint._parse_page(next_page)  # noqa: SLF001
+    assert isinstance(children[0], responses.PlaylistResponse)
+    assert len(children) == 1
+    assert next_payload == {"continuation": "TOKEN2"}
+
+
+def test_first_page_with_known_payloads() -> None:
+    pages = FakePages()
+    children = pagination.PagedChildren.from_first_page(
+        pages.parse_page(pages.fetch_page({"page": 0})),
+        fetch_page=pages.fetch_page,
+        parse_page=pages.parse_page,
+        # the last known page continues to the rest ones
+        page_payloads=[{"page": 1}, {"page": 2}],
+        fetch_many=pages.fetch_many,
+    )
+    assert children.loaded_items == list(range(PAGE_SIZE))
+    assert children.load_all() == list(range(PAGE_SIZE * PAGES))
+    assert pages.requests == [{"page": page} for page in range(PAGES)]
+
+
+def test_endpoint_page_with_two_continuations() -> None:
+    endpoint = responses.EndpointResponse(
+        {"title": "Library", "payload": {"browse_id": "FEmusic_library"}},
+    )
+    first_page = {
+        "contents": {
+            "content": {
+                "contents": {
+                    "items": [
+                        PLAYLIST,
+                        {
+                            "continuationItemRenderer": {
+                                "continuationEndpoint": {
+                                    "continuationCommand": {"token": "ITEMS"},
+                                },
+                            },
+                        },
+                    ],
+                    "continuations": [
+                        {"nextContinuationData": {"continuation": "SECTION"}},
+                    ],
+                },
+            },
+        },
+    }
+    assert endpoint.set_page_payloads(first_page) == [
+        {"continuation": "ITEMS"},
+        {"continuation": "SECTION"},
+    ]
+    # one continuation is followed page by page
+    del first_page["contents"]["content"]["contents"]["continuations"]
+    assert endpoint.set_page_payloads(first_page) == []
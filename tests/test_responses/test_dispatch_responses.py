@@ -0,0 +1,95 @@
+import pytest
+
+from ytm_browser.core import custom_exceptions, responses
+
+ENDPOINT = {"title": "Library", "payload": {"browse_id": "FEmusic_library"}}
+PLAYLIST = {
+    "aspectRatio": "MUSIC_TWO_ROW_ITEM_THUMBNAIL_ASPECT_RATIO_SQUARE",
+    "title": {"runs": [{"text": "Album"}]},
+    "menu": {
+        "menuRenderer": {
+            "items": [
+                {
+                    "menuNavigationItemRenderer": {
+                        "navigationEndpoint": {
+                            "watchPlaylistEndpoint": {
+                                "playlistId": "OLAK5uy_album",
+                                "params": "wAEB",
+                            },
+                        },
+                    },
+                },
+                {"menuServiceItemRenderer": {}},
+            ],
+        },
+    },
+}
+TRACK = {
+    "title": {"runs": [{"text": "Title"}]},
+    "longBylineText": {"runs": [{"text": "Artist"}]},
+    "lengthText": {"runs": [{"text": "3:15"}]},
+    "videoId": "dQw4w9WgXcQ",
+}
+
+
+@pytest.mark.parametrize(
+    ("raw_response", "response_type"),
+    [
+        (ENDPOINT, responses.EndpointResponse),
+        (PLAYLIST, responses.PlaylistResponse),
+        (TRACK, responses.TrackResponse),
+    ],
+)
+def test_dispatch_by_discriminator(
+    raw_response: dict,
+    response_type: type,
+) -> None:
+    assert responses.dispatch_response_type(raw_response) is response_type
+    assert isinstance(responses.parse_response(raw_response), response_type)
+
+
+def test_registration_order_is_deterministic() -> None:
+    assert list(responses.dispatch_index) == [
+        "payload",
+        "aspectRatio",
+        "videoId",
+    ]
+
+
+def test_parse_responses_mixed_list() -> None:
+    parsed = responses.parse_responses([TRACK, TRACK, PLAYLIST])
+    assert [type(response) for response in parsed] == [
+        responses.TrackResponse,
+        responses.TrackResponse,
+        responses.PlaylistResponse,
+    ]
+    assert parsed[1].title == "Title"
+    assert parsed[2].payload == {
+        "playlistId": "OLAK5uy_album",
+        "params": "wAEB",
+    }
+
+
+def test_unknown_response() -> None:
+    with pytest.raises(custom_exceptions.ParserError):
+        responses.parse_response({"unknown": "type"})
+
+
+@pytest.mark.parametrize(
+    "raw_response",
+    [{"unknown": "type"}, {"videoId": ""}, [{"unknown": "type"}], "text"],
+)
+def test_unknown_type_is_not_dispatched(raw_response: object) -> None:
+    assert responses.dispatch_response_type(raw_response) is None
+
+
+def test_ambiguous_response_is_dispatched_by_registration_order() -> None:
+    # track keys in endpoint response, the first registered key wins
+    raw_response = ENDPOINT | {"videoId": TRACK["videoId"]}
+    assert (
+        responses.dispatch_response_type(raw_response)
+        is responses.EndpointResponse
+    )
+    parsed = responses.parse_response(raw_response)
+    assert isinstance(parsed, responses.EndpointResponse)
+    assert parsed.title == "Library"
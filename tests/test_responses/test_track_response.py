@@ -0,0 +1,64 @@
+import copy
+
+from ytm_browser.core import responses
+
+TRACK = {
+    "title": {"runs": [{"text": " \uff34itle "}]},
+    "longBylineText": {
+        "runs": [
+            {
+                "text": "Artist",
+                "navigationEndpoint": {
+                    "browseEndpoint": {
+                        "browseId": "UC_artist",
+                        "browseEndpointContextSupportedConfigs": {
+                            "browseEndpointContextMusicConfig": {
+                                "pageType": "MUSIC_PAGE_TYPE_ARTIST",
+                            },
+                        },
+                    },
+                },
+            },
+            {"text": " • "},
+            {"text": "Album"},
+        ],
+    },
+    "lengthText": {"runs": [{"text": "3:15"}]},
+    "videoId": "dQw4w9WgXcQ",
+}
+
+
+def test_track_is_compact() -> None:
+    track = responses.TrackResponse(TRACK)
+    assert not hasattr(track, "__dict__")
+
+
+def test_display_fields_are_normalized_on_access() -> None:
+    track = responses.TrackResponse(TRACK)
+    assert track.title == "Title"
+    assert track.artist == "Artist"
+    assert track.lenght == "3:15"
+    assert str(track) == "Artist - Title (3:15 [dQw4w9WgXcQ])"
+
+
+def test_tracks_are_equal_by_video_id() -> None:
+    other_raw_track = copy.deepcopy(TRACK)
+    other_raw_track["title"]["runs"][0]["text"] = "Other title"
+    track = responses.TrackResponse(TRACK)
+    other_track = responses.TrackResponse(other_raw_track)
+    assert track == other_track
+    assert len({track, other_track}) == 1
+
+
+def test_artist_is_interned() -> None:
+    tracks = responses.parse_responses(
+        [copy.deepcopy(TRACK) for _ in range(3)],
+    )
+    assert all(track.artist is tracks[0].artist for track in tracks)
+
+
+def test_single_run_wrappers_are_parsed() -> None:
+    raw_track = copy.deepcopy(TRACK)
+    raw_track["title"] = [{"runs": [{"text": "Title"}]}]
+    track = responses.TrackResponse(raw_track)
+    assert (track.title, track.lenght) == ("Title", "3:15")
@@ -0,0 +1,37 @@
+import asyncio
+from types import SimpleNamespace
+
+from ytm_browser.core import warmup
+
+TIMEOUT_SEC = 5
+
+
+class BrokenResponse:
+    _children = None
+
+    async def fetch_children(self, client: object) -> list:  # noqa: ARG002
+        return {}["unexpected payload"]
+
+
+def test_broken_node_does_not_stop_crawl() -> None:
+    fetched = []
+
+    async def fetch_children(client: object) -> list:  # noqa: ARG001
+        fetched.append(True)
+        return []
+
+    crawler = warmup.WarmupCrawler(
+        [
+            BrokenResponse(),
+            BrokenResponse(),
+            SimpleNamespace(_children=None, fetch_children=fetch_children),
+        ],
+        workers=1,
+        client=object(),
+    )
+    # crawl with dead worker waits for unprocessed nodes forever
+    requests_sent = asyncio.run(
+        asyncio.wait_for(crawler.crawl(), timeout=TIMEOUT_SEC),
+    )
+    assert requests_sent == 3  # noqa: PLR2004
+    assert fetched == [True]
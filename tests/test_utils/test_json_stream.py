@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from utils import json_stream, parse_util
+from ytm_browser.core import custom_exceptions
+
+BROWSE_RESPONSE = {
+    "responseContext": {"serviceTrackingParams": [{"service": "GFEEDBACK"}]},
+    "contents": {
+        "singleColumnBrowseResultsRenderer": {
+            "tabs": [
+                {
+                    "tabRenderer": {
+                        "title": "Library",
+                        "content": {
+                            "sectionListRenderer": {
+                                "contents": [
+                                    {
+                                        "gridRenderer": {
+                                            "items": [
+                                                {"item": index, "text": "ü\\"}
+                                                for index in range(50)
+                                            ],
+                                            "trackingParams": "x",
+                                        },
+                                    },
+                                ],
+                                "trackingParams": "y",
+                            },
+                        },
+                    },
+                },
+            ],
+        },
+    },
+    "trackingParams": "z",
+}
+QUEUE_RESPONSE = {
+    "responseContext": {"visitorData": "[queueDatas]"},
+    "queueDatas": [
+        {"content": {"videoId": str(index)}} for index in range(30)
+    ],
+}
+
+
+def stream(document: dict, chunk_size: int) -> list[bytes]:
+    raw_document = json.dumps(document, indent=1).encode()
+    return [
+        raw_document[start : start + chunk_size]
+        for start in range(0, len(raw_document), chunk_size)
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 100_000])
+@pytest.mark.parametrize(
+    ("document", "chain"),
+    [
+        (BROWSE_RESPONSE, ("contents", "content", "contents", "items")),
+        (QUEUE_RESPONSE, ("queueDatas",)),
+    ],
+)
+def test_stream_items_equal_extract_chain(
+    document: dict,
+    chain: tuple,
+    chunk_size: int,
+) -> None:
+    streamed_items = [
+        item
+        for _, item in json_stream.iter_chain_items(
+            stream(document, chunk_size),
+            [("missing",), chain],
+        )
+    ]
+    assert streamed_items == parse_util.extract_chain(document, chain)
+
+
+def test_items_are_yielded_before_document_ends() -> None:
+    decoder = json_stream.ChainItemsDecoder([("queueDatas",)])
+    raw_document = json.dumps(QUEUE_RESPONSE)
+    items = decoder.feed(raw_document[: len(raw_document) // 2])
+    assert items
+    assert not decoder.finished
+
+
+def test_chain_not_found() -> None:
+    with pytest.raises(custom_exceptions.ChainError):
+        list(
+            json_stream.iter_chain_items(stream(QUEUE_RESPONSE, 10), [("x",)])
+        )
+
+
+def test_truncated_document() -> None:
+    truncated = json.dumps(QUEUE_RESPONSE).encode()[:-40]
+    with pytest.raises(custom_exceptions.ParsingError):
+        list(json_stream.iter_chain_items([truncated], [("queueDatas",)]))
@@ -0,0 +1,81 @@
+import pytest
+
+from utils import parse_util
+from ytm_browser.core import custom_exceptions
+
+TRACK = {
+    "playlistPanelVideoRenderer": {
+        "title": {"runs": [{"text": "Song "}, {"text": "Title"}]},
+        "longBylineText": {
+            "runs": [
+                {
+                    "text": "Artist",
+                    "navigationEndpoint": {
+                        "browseEndpoint": {
+                            "browseEndpointContextSupportedConfigs": {
+                                "browseEndpointContextMusicConfig": {
+                                    "pageType": "MUSIC_PAGE_TYPE_ARTIST",
+                                },
+                            },
+                        },
+                    },
+                },
+                {"text": " • "},
+                {"text": "Album"},
+            ],
+        },
+        "lengthText": {"runs": [{"text": "3:15"}]},
+        "videoId": "dQw4w9WgXcQ",
+        "menu": {"menuRenderer": {"items": [{"a": 1}, {"b": 2}]}},
+    },
+}
+
+CHAINS = [
+    ("title", "runs"),
+    ("lengthText", "runs"),
+    ("longBylineText", "runs"),
+    ("longBylineText", "runs", 0, "navigationEndpoint", "pageType"),
+    ("menu", "items", 1),
+    ("videoId",),
+    ("missing",),
+    ("menu", "items", 5),
+]
+
+
+@pytest.mark.parametrize("chain", [*CHAINS, None], ids=str)
+def test_compiled_chain_equals_extract_chain(chain: tuple | None) -> None:
+    expected: object
+    try:
+        expected = parse_util.extract_chain(TRACK, chain)
+    except (KeyError, IndexError, TypeError) as exc:
+        expected = type(exc)
+    compiled: object
+    try:
+        compiled = parse_util.compile_chain(chain)(TRACK)
+    except (KeyError, IndexError, TypeError) as exc:
+        compiled = type(exc)
+    assert compiled == expected
+
+
+def test_compile_chain_is_cached() -> None:
+    assert parse_util.compile_chain(("title", "runs")) is (
+        parse_util.compile_chain(("title", "runs"))
+    )
+
+
+def test_fallback_chain_remembers_last_match() -> None:
+    fallback_chain = parse_util.FallbackChain(
+        [("missing",), ("videoId",)],
+    )
+    assert fallback_chain(TRACK) == (1, "dQw4w9WgXcQ")
+    assert fallback_chain({"missing": 1, "other": 2}) == (0, 1)
+
+
+def test_fallback_chain_accept() -> None:
+    fallback_chain = parse_util.FallbackChain([("videoId",), ("title",)])
+    assert (
+        fallback_chain(TRACK, accept=lambda value: isinstance(value, dict))[0]
+        == 1
+    )
+    with pytest.raises(custom_exceptions.ChainError):
+        fallback_chain(TRACK, accept=lambda _: False)
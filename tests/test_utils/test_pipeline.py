@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pytest
+
+from utils import pipeline
+
+ITEMS = 8
+STAGE_SEC = 0.05
+
+
+def test_results_and_errors() -> None:
+    def check_positive(number: int) -> int:
+        if number < 0:
+            msg = "negative number"
+            raise ValueError(msg)
+        return number
+
+    with pipeline.Pipeline(
+        [
+            pipeline.Stage("check", check_positive, workers=2),
+            pipeline.Stage("double", lambda number: number * 2, workers=2),
+            pipeline.Stage("format", str),
+        ],
+    ) as stages:
+        futures = [stages.submit(number) for number in (1, -1, 3)]
+    assert futures[0].result() == "2"
+    with pytest.raises(ValueError, match="negative number"):
+        futures[1].result()
+    assert futures[2].result() == "6"
+
+
+def test_stages_overlap() -> None:
+    with pipeline.Pipeline(
+        [
+            pipeline.Stage("first", lambda _item: time.sleep(STAGE_SEC)),
+            pipeline.Stage("second", lambda _item: time.sleep(STAGE_SEC)),
+        ],
+    ) as stages:
+        started_at = time.perf_counter()
+        futures = [stages.submit(item) for item in range(ITEMS)]
+    elapsed_sec = time.perf_counter() - started_at
+    assert all(future.done() for future in futures)
+    # sequential run takes 2 * ITEMS * STAGE_SEC
+    assert elapsed_sec < (ITEMS + 2) * STAGE_SEC
+
+
+def test_queue_is_bounded() -> None:
+    release = threading.Event()
+    with pipeline.Pipeline(
+        [pipeline.Stage("blocked", lambda _item: release.wait())],
+        queue_size=1,
+    ) as stages:
+        submitter = threading.Thread(
+            target=lambda: [stages.submit(item) for item in range(ITEMS)],
+        )
+        submitter.start()
+        submitter.join(timeout=STAGE_SEC * 4)
+        # one item is in work, one is in queue, the rest wait
+        assert submitter.is_alive()
+        release.set()
+        submitter.join()
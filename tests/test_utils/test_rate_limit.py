@@ -0,0 +1,33 @@
+import time
+
+from utils import rate_limit
+
+
+def test_burst_then_rate() -> None:
+    bucket = rate_limit.TokenBucket(rate_per_sec=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.09 < bucket.reserve() <= 0.1  # noqa: PLR2004
+
+
+def test_throttle_pauses_and_slows_down() -> None:
+    bucket = rate_limit.TokenBucket(rate_per_sec=10)
+    bucket.throttle(retry_after_sec=2)
+    assert bucket.rate_per_sec == 5  # noqa: PLR2004
+    assert bucket.reserve() >= 2  # noqa: PLR2004
+
+
+def test_rate_recovers_after_success() -> None:
+    bucket = rate_limit.TokenBucket(rate_per_sec=4, recovery_per_sec=1)
+    bucket.throttle()
+    for _ in range(10):
+        bucket.succeed()
+    assert bucket.rate_per_sec == 4  # noqa: PLR2004
+
+
+def test_acquire_waits() -> None:
+    bucket = rate_limit.TokenBucket(rate_per_sec=20, capacity=1)
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09  # noqa: PLR2004
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from utils import retry
+from ytm_browser.core import custom_exceptions
+
+NO_SLEEP = retry.RetryPolicy(attempts_number=3, base_sleep_sec=0)
+
+
+class Flaky:
+    def __init__(self, failures: list[Exception]) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return "ok"
+
+
+def test_retry_until_success() -> None:
+    flaky = Flaky([ValueError(), ValueError()])
+    retries = []
+    result = retry.call_with_retry(
+        flaky,
+        NO_SLEEP,
+        on_retry=lambda _, attempt: retries.append(attempt),
+    )
+    assert result == "ok"
+    assert retries == [1, 2]
+
+
+def test_too_many_retries() -> None:
+    flaky = Flaky([ValueError()] * 3)
+    with pytest.raises(custom_exceptions.TooManyRetryError):
+        retry.call_with_retry(flaky, NO_SLEEP)
+    assert flaky.calls == NO_SLEEP.attempts_number
+
+
+def test_credentials_error_is_not_retried() -> None:
+    flaky = Flaky([custom_exceptions.CredentialsDataError()])
+    with pytest.raises(custom_exceptions.CredentialsDataError):
+        retry.call_with_retry(flaky, NO_SLEEP)
+    assert flaky.calls == 1
+
+
+def test_retry_after_is_honoured() -> None:
+    policy = retry.RetryPolicy(base_sleep_sec=1)
+    error = custom_exceptions.ThrottledError("throttled", retry_after_sec=7)
+    for attempt in range(policy.attempts_number):
+        assert 7 <= policy.sleep_sec(attempt, error) <= 7 + 2**attempt  # noqa: PLR2004
+
+
+def test_backoff_is_capped() -> None:
+    policy = retry.RetryPolicy(base_sleep_sec=1, max_sleep_sec=4)
+    assert all(
+        0 <= policy.sleep_sec(attempt, ValueError()) <= policy.max_sleep_sec
+        for attempt in range(20)
+    )
+
+
+def test_coroutine_decorator() -> None:
+    flaky = Flaky([ValueError()])
+
+    @retry.retry(policy=NO_SLEEP)
+    async def fetch() -> str:
+        await asyncio.sleep(0)
+        return flaky()
+
+    assert asyncio.run(fetch()) == "ok"
+    assert flaky.calls == 2  # noqa: PLR2004
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+
+from utils import single_flight
+
+CALLERS = 5
+CALL_SEC = 0.1
+
+
+class SlowCall:
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.calls = 0
+
+    def __call__(self) -> dict:
+        self.calls += 1
+        time.sleep(CALL_SEC)
+        if self.error is not None:
+            raise self.error
+        return {"calls": self.calls}
+
+    async def call_async(self) -> dict:
+        self.calls += 1
+        await asyncio.sleep(CALL_SEC)
+        return {"calls": self.calls}
+
+
+def run_threads(
+    flight: single_flight.SingleFlight,
+    call: SlowCall,
+) -> list[tuple[object, bool] | Exception]:
+    results: list[tuple[object, bool] | Exception] = []
+
+    def caller() -> None:
+        try:
+            results.append(flight.do("key", call))
+        except ValueError as exc:
+            results.append(exc)
+
+    threads = [threading.Thread(target=caller) for _ in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_threads_share_one_call() -> None:
+    flight = single_flight.SingleFlight()
+    call = SlowCall()
+    results = run_threads(flight, call)
+    assert call.calls == 1
+    assert sum(is_shared for _, is_shared in results) == CALLERS - 1
+    assert all(result is results[0][0] for result, _ in results)
+    assert not flight.in_flight
+
+
+def test_error_is_shared() -> None:
+    call = SlowCall(error=ValueError("failed"))
+    results = run_threads(single_flight.SingleFlight(), call)
+    assert call.calls == 1
+    assert all(result is call.error for result in results)
+
+
+def test_tasks_and_threads_share_one_call() -> None:
+    flight = single_flight.SingleFlight()
+    call = SlowCall()
+
+    async def callers() -> list[tuple[dict, bool]]:
+        leader = asyncio.create_task(flight.do_async("key", call.call_async))
+        await asyncio.sleep(0)
+        from_thread = asyncio.to_thread(flight.do, "key", call)
+        return await asyncio.gather(
+            leader,
+            flight.do_async("key", call.call_async),
+            from_thread,
+        )
+
+    results = asyncio.run(callers())
+    assert call.calls == 1
+    assert [is_shared for _, is_shared in results] == [False, True, True]
+
+
+def test_cancelled_leader_is_replaced() -> None:
+    flight = single_flight.SingleFlight()
+    call = SlowCall()
+
+    async def callers() -> tuple[dict, bool]:
+        leader = asyncio.create_task(flight.do_async("key", call.call_async))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(
+            flight.do_async("key", call.call_async),
+        )
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    result, is_shared = asyncio.run(callers())
+    assert call.calls == 2  # noqa: PLR2004
+    assert result == {"calls": 2}
+    assert not is_shared
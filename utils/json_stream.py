@@ -0,0 +1,215 @@
+"""Incremental decoding of json items from streamed response body."""
+
+import codecs
+import contextlib
+import json
+import re
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+
+from ytm_browser.core import custom_exceptions
+
+# chars which change structure of json document (outside of strings)
+STRUCTURE_PATTERN = re.compile(r'[{}\[\]",]')
+STRING_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r"[\s,]*")
+# drop consumed part of buffer when it becomes longer than this
+BUFFER_COMPACT_SIZE = 64 * 1024
+
+
+@dataclass
+class _Frame:
+    is_dict: bool
+    # possible positions in every chain for children of this container
+    states: tuple[frozenset[int], ...]
+    index: int = 0
+    expect_key: bool = False
+    child_states: tuple[frozenset[int], ...] = field(default_factory=tuple)
+
+
+class ChainItemsDecoder:
+    """Find list by chains while feeding document and decode its items.
+
+    Chains are matched like `parse_util.extract_chain` does it: single
+    nested element is skipped. In stream container size isn't known
+    before it ends, so only first key of dict or first item of list can
+    be skipped as single element. First list matched by any chain is
+    decoded, items are returned as soon as their json text is complete.
+    """
+
+    def __init__(self, chains: Sequence[tuple]) -> None:
+        self.chains = tuple(tuple(chain) for chain in chains)
+        self.matched_chain: int | None = None
+        self.finished = False
+        self._buffer = ""
+        self._position = 0
+        self._stack: list[_Frame] = []
+        self._root_states = tuple(frozenset({0}) for _ in self.chains)
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, text: str) -> list:
+        """Add part of document, return items which are complete now."""
+        if self.finished:
+            return []
+        self._buffer += text
+        if self.matched_chain is None:
+            self._scan_structure()
+        items = self._decode_items() if self.matched_chain is not None else []
+        if self._position > BUFFER_COMPACT_SIZE:
+            self._buffer = self._buffer[self._position :]
+            self._position = 0
+        return items
+
+    def close(self) -> list:
+        """Finish document, raise ChainError if list wasn't found."""
+        if self.matched_chain is None:
+            msg = "Any chain doesn't match streamed document"
+            raise custom_exceptions.ChainError(msg)
+        items = [] if self.finished else self._decode_items(final=True)
+        if not self.finished:
+            msg = "Streamed document is truncated"
+            raise custom_exceptions.ParsingError(msg)
+        return items
+
+    def _scan_structure(self) -> None:
+        buffer = self._buffer
+        while self.matched_chain is None:
+            found = STRUCTURE_PATTERN.search(buffer, self._position)
+            if found is None:
+                self._position = len(buffer)
+                return
+            char = found.group()
+            if char == '"':
+                string = STRING_PATTERN.match(buffer, found.start())
+                if string is None:
+                    # wait for the end of string
+                    self._position = found.start()
+                    return
+                self._position = string.end()
+                frame = self._stack[-1] if self._stack else None
+                if frame is not None and frame.is_dict and frame.expect_key:
+                    frame.expect_key = False
+                    self._enter_child(frame, json.loads(string.group()))
+                continue
+            self._position = found.end()
+            match char:
+                case "{" | "[":
+                    self._open_container(
+                        is_dict=char == "{",
+                        start=found.start(),
+                    )
+                case "}" | "]":
+                    self._stack.pop()
+                case ",":
+                    frame = self._stack[-1]
+                    frame.index += 1
+                    if frame.is_dict:
+                        frame.expect_key = True
+                    else:
+                        self._enter_child(frame, frame.index)
+
+    def _open_container(self, *, is_dict: bool, start: int) -> None:
+        states = (
+            self._stack[-1].child_states if self._stack else self._root_states
+        )
+        if not is_dict:
+            for chain_index, (chain, chain_states) in enumerate(
+                zip(self.chains, states, strict=True),
+            ):
+                if len(chain) in chain_states:
+                    self.matched_chain = chain_index
+                    return
+        if not any(states) and self._skip_value(start):
+            return
+        frame = _Frame(is_dict=is_dict, states=states, expect_key=is_dict)
+        self._stack.append(frame)
+        if not is_dict:
+            self._enter_child(frame, 0)
+
+    def _enter_child(self, frame: _Frame, path_element: str | int) -> None:
+        can_skip = frame.index == 0
+        frame.child_states = tuple(
+            frozenset(
+                {
+                    position + 1
+                    for position in chain_states
+                    if position < len(chain)
+                    and chain[position] == path_element
+                }
+                | ({*chain_states} - {len(chain)} if can_skip else set()),
+            )
+            for chain, chain_states in zip(
+                self.chains,
+                frame.states,
+                strict=True,
+            )
+        )
+
+    def _skip_value(self, start: int) -> bool:
+        # subtree can't contain matched list, skip it with C decoder
+        with contextlib.suppress(json.JSONDecodeError):
+            _, end = self._decoder.raw_decode(self._buffer, start)
+            self._position = end
+            return True
+        return False
+
+    def _decode_items(self, *, final: bool = False) -> list:
+        items = []
+        buffer = self._buffer
+        while True:
+            self._position = WHITESPACE_PATTERN.match(
+                buffer,
+                self._position,
+            ).end()
+            if self._position >= len(buffer):
+                break
+            if buffer[self._position] == "]":
+                self.finished = True
+                break
+            try:
+                item, end = self._decoder.raw_decode(buffer, self._position)
+            except json.JSONDecodeError as exc:
+                if not final:
+                    # item isn't complete yet, wait for next part
+                    break
+                msg = "Streamed document is truncated or broken"
+                raise custom_exceptions.ParsingError(msg) from exc
+            if end == len(buffer) and not final:
+                # number at the end of buffer can be continued
+                break
+            self._position = end
+            items.append(item)
+        return items
+
+
+def iter_chain_items(
+    chunks: Iterable[bytes],
+    chains: Sequence[tuple],
+) -> Iterator[tuple[int, object]]:
+    """Decode items of list found by chains from stream of json bytes.
+
+    Args:
+    ----
+        chunks (Iterable[bytes]): parts of utf-8 json document
+        chains (Sequence[tuple]): chains of keys (ParseRules.chain)
+
+    Raises:
+    ------
+        ChainError: no one chain matched document
+
+    Yields:
+    ------
+        Iterator[tuple[int, object]]: index of matched chain, raw item
+
+    """
+    decoder = ChainItemsDecoder(chains)
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        for item in decoder.feed(text_decoder.decode(chunk)):
+            yield decoder.matched_chain, item
+        if decoder.finished:
+            return
+    for item in decoder.feed(text_decoder.decode(b"", final=True)):
+        yield decoder.matched_chain, item
+    for item in decoder.close():
+        yield decoder.matched_chain, item
@@ -1,8 +1,14 @@
 """Common utils for parsing."""
 
-from typing import Sequence
+import functools
+from typing import Callable, Sequence
 from unicodedata import normalize
 
+from ytm_browser.core import custom_exceptions
+
+JsonValue = list | dict | str | None
+Extractor = Callable[[dict | list], JsonValue]
+
 
 def extract_chain(
     json_obj: dict | list,
@@ -47,6 +53,112 @@ def extract_chain(
     return json_obj
 
 
+def unwrap_single(json_obj: dict | list) -> JsonValue:
+    """Extract single nested element (same as `extract_chain` without chain)."""
+    while len(json_obj) == 1:
+        if isinstance(json_obj, list):
+            json_obj = json_obj[0]
+        elif isinstance(json_obj, dict):
+            json_obj = next(iter(json_obj.values()))
+        else:
+            break
+    return json_obj
+
+
+@functools.cache
+def compile_chain(chain: tuple | None = None) -> Extractor:
+    """Compile chain of keys to extractor function.
+
+    Extractor behaves exactly like `extract_chain(json_obj, chain)`, but
+    chain isn't interpreted on every call.
+
+    Args:
+    ----
+        chain (tuple | None, optional): chain of keys. Defaults to None.
+
+    Returns:
+    -------
+        Extractor: function(json_obj) -> extracted object
+
+    """
+    if not chain:
+        return unwrap_single
+    keys = tuple(chain)
+    join_runs = keys[-1] == "runs"
+
+    def extractor(json_obj: dict | list) -> JsonValue:
+        for key in keys:
+            while len(json_obj) == 1:
+                if isinstance(json_obj, list):
+                    json_obj = json_obj[0]
+                elif not isinstance(json_obj, dict) or key in json_obj:
+                    break
+                else:
+                    json_obj = next(iter(json_obj.values()))
+            json_obj = json_obj[key]
+        if join_runs and isinstance(json_obj, list):
+            return extract_runs(runs_list=json_obj)
+        return json_obj
+
+    return extractor
+
+
+class FallbackChain:
+    """Compiled chains which are tried in order until one of them matches.
+
+    Chain that matched last is tried first on the next call, because
+    responses of one type usually come in a row.
+    """
+
+    def __init__(
+        self,
+        chains: Sequence[tuple],
+        errors: tuple[type[Exception], ...] = (KeyError, TypeError),
+    ) -> None:
+        self._extractors = tuple(
+            compile_chain(tuple(chain)) for chain in chains
+        )
+        self._errors = errors
+        self._last_matched = 0
+
+    def __call__(
+        self,
+        json_obj: dict | list,
+        accept: Callable[[JsonValue], bool] | None = None,
+    ) -> tuple[int, JsonValue]:
+        """Extract object with first matched chain.
+
+        Args:
+        ----
+            json_obj (dict | list): the object from witch the data will be extracted
+            accept (Callable | None, optional): check of extracted object,\
+                chain doesn't match if it returns False. Defaults to None.
+
+        Raises:
+        ------
+            ChainError: no one chain matched
+
+        Returns:
+        -------
+            tuple[int, JsonValue]: index of matched chain, extracted object
+
+        """
+        last_matched = self._last_matched
+        for index in (
+            *range(last_matched, len(self._extractors)),
+            *range(last_matched),
+        ):
+            try:
+                extracted = self._extractors[index](json_obj)
+            except self._errors:
+                continue
+            if accept is None or accept(extracted):
+                self._last_matched = index
+                return index, extracted
+        msg = "Any chain doesn't match object"
+        raise custom_exceptions.ChainError(msg)
+
+
 def _normalize_unicode(unicode_string: str) -> str:
     """Normalize unicode text.
 
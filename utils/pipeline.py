@@ -0,0 +1,155 @@
+"""Pipeline of stages with own worker threads and bounded queues between them."""
+
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Self
+
+DEFAULT_QUEUE_SIZE = 8
+# end of input marker of stage queue
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    # result of function is input of the next stage
+    func: Callable[[Any], Any]
+    workers: int = 1
+
+
+class _StageRunner:
+    def __init__(
+        self,
+        stage: Stage,
+        input_queue: queue.Queue,
+        next_runner: "_StageRunner | None",
+        *,
+        is_first: bool,
+    ) -> None:
+        self.stage = stage
+        self.is_first = is_first
+        self.input_queue = input_queue
+        self.next_runner = next_runner
+        self._running_workers = stage.workers
+        self._lock = threading.Lock()
+        self.threads = [
+            threading.Thread(
+                target=self._work,
+                name=f"{stage.name}_{index}",
+                daemon=True,
+            )
+            for index in range(stage.workers)
+        ]
+
+    def _work(self) -> None:
+        while (job := self.input_queue.get()) is not _STOP:
+            future, item = job
+            # cancelled future is skipped until its item is started
+            if self.is_first and not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = self.stage.func(item)
+            except Exception as exc:  # noqa: BLE001
+                future.set_exception(exc)
+                continue
+            if self.next_runner is None:
+                future.set_result(result)
+            else:
+                # it blocks while next stage is busy (backpressure)
+                self.next_runner.input_queue.put((future, result))
+        self._stop_worker()
+
+    def _stop_worker(self) -> None:
+        with self._lock:
+            self._running_workers -= 1
+            is_last_worker = not self._running_workers
+        # next stage is stopped after all items of this stage are passed
+        if is_last_worker and self.next_runner is not None:
+            self.next_runner.stop()
+
+    def stop(self) -> None:
+        for _ in self.threads:
+            self.input_queue.put(_STOP)
+
+
+class Pipeline:
+    """Items pass stages in order, every stage runs on its own threads.
+
+    Stages work at the same time on different items, e.g. network stage
+    downloads the next item while CPU stage encodes the previous one.
+    Queues between stages are bounded, so fast stage waits slow one and
+    items don't pile up in memory. Failed item leaves pipeline with error
+    in its future.
+
+    Usage:
+        with Pipeline([Stage("fetch", fetch, 4), Stage("encode", encode)]) as pipeline:
+            future = pipeline.submit(url)
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        if not stages:
+            msg = "pipeline needs at least one stage"
+            raise ValueError(msg)
+        self.stages = stages
+        self._runners: list[_StageRunner] = []
+        next_runner = None
+        for index, stage in reversed(list(enumerate(stages))):
+            next_runner = _StageRunner(
+                stage,
+                queue.Queue(maxsize=queue_size),
+                next_runner,
+                is_first=not index,
+            )
+            self._runners.insert(0, next_runner)
+        self._is_closed = False
+        for runner in self._runners:
+            for thread in runner.threads:
+                thread.start()
+
+    def submit(self, item: object) -> Future:
+        """Put item to the first stage (it blocks while the stage is busy).
+
+        Args:
+        ----
+            item (object): input of the first stage function
+
+        Returns:
+        -------
+            Future: result of the last stage function
+
+        """
+        if self._is_closed:
+            msg = "cannot submit item to closed pipeline"
+            raise RuntimeError(msg)
+        future: Future = Future()
+        self._runners[0].input_queue.put((future, item))
+        return future
+
+    def close(self) -> None:
+        """Wait until all submitted items leave pipeline and stop threads."""
+        if self._is_closed:
+            return
+        self._is_closed = True
+        self._runners[0].stop()
+        for runner in self._runners:
+            for thread in runner.threads:
+                thread.join()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
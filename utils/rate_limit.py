@@ -0,0 +1,93 @@
+"""Token bucket rate limiter shared by threads and coroutines."""
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Token bucket which adapts its rate to throttling of server.
+
+    Each request takes one token, tokens are refilled with `rate_per_sec`
+    up to `capacity` (burst size). Throttled response halves the rate and
+    pauses all callers for Retry-After seconds, each succeeded request
+    raises rate back by `recovery_per_sec` up to `max_rate_per_sec`
+    (additive increase, multiplicative decrease).
+    """
+
+    def __init__(
+        self,
+        rate_per_sec: float,
+        capacity: float | None = None,
+        min_rate_per_sec: float = 0.5,
+        recovery_per_sec: float | None = None,
+    ) -> None:
+        if rate_per_sec <= 0:
+            msg = "rate_per_sec should be positive"
+            raise ValueError(msg)
+        self.max_rate_per_sec = rate_per_sec
+        self.rate_per_sec = rate_per_sec
+        self.capacity = capacity or rate_per_sec
+        self.min_rate_per_sec = min_rate_per_sec
+        # by default 20 succeeded requests restore initial rate
+        self.recovery_per_sec = recovery_per_sec or rate_per_sec / 20
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token, return seconds to wait before request is sent."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            # tokens of paused bucket are refilled after pause only
+            return max(0.0, self._paused_until - now) + max(
+                0.0,
+                -self._tokens / self.rate_per_sec,
+            )
+
+    def acquire(self) -> None:
+        """Wait for token (blocking)."""
+        if (wait_sec := self.reserve()) > 0:
+            time.sleep(wait_sec)
+
+    async def acquire_async(self) -> None:
+        """Wait for token without blocking event loop."""
+        if (wait_sec := self.reserve()) > 0:
+            await asyncio.sleep(wait_sec)
+
+    def throttle(self, retry_after_sec: float | None = None) -> None:
+        """Slow down all callers after throttled response."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate_per_sec = max(
+                self.min_rate_per_sec,
+                self.rate_per_sec / 2,
+            )
+            if retry_after_sec:
+                self._paused_until = max(
+                    self._paused_until,
+                    now + retry_after_sec,
+                )
+                # bucket is empty after pause, requests don't burst at once
+                self._tokens = min(self._tokens, 0.0)
+
+    def succeed(self) -> None:
+        """Speed up after succeeded request (up to initial rate)."""
+        with self._lock:
+            self.rate_per_sec = min(
+                self.max_rate_per_sec,
+                self.rate_per_sec + self.recovery_per_sec,
+            )
+
+    def _refill(self, now: float) -> None:
+        refill_from = max(self._updated_at, self._paused_until)
+        if now > refill_from:
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - refill_from) * self.rate_per_sec,
+            )
+        self._updated_at = now
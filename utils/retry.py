@@ -1,43 +1,172 @@
+import asyncio
+import dataclasses
 import functools
+import inspect
+import random
 import time
-from typing import Callable, TypeVar
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
 
 from ytm_browser.core import custom_exceptions
 
 RT = TypeVar("RT")  # return type
 
 
+@dataclasses.dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter, honours server's Retry-After.
+
+    Errors of `give_up_on` are never retried (e.g. invalid credentials),
+    errors which aren't in `retry_on` are raised at once too.
+    """
+
+    attempts_number: int = 5
+    base_sleep_sec: float = 0.5
+    max_sleep_sec: float = 30.0
+    retry_on: tuple[type[Exception], ...] = (Exception,)
+    give_up_on: tuple[type[Exception], ...] = (
+        custom_exceptions.CredentialsDataError,
+    )
+
+    def is_retryable(self, error: Exception) -> bool:
+        return isinstance(error, self.retry_on) and not isinstance(
+            error,
+            self.give_up_on,
+        )
+
+    def next_sleep_sec(self, error: Exception, attempt: int) -> float:
+        """Return sleep before next attempt or raise error of failed one.
+
+        Args:
+        ----
+            error (Exception): error of failed attempt
+            attempt (int): number of failed attempt (starts from 0)
+
+        Raises:
+        ------
+            Exception: `error` if it isn't retryable
+            TooManyRetryError: all attempts failed
+
+        Returns:
+        -------
+            float: seconds to sleep
+
+        """
+        if not self.is_retryable(error):
+            raise error
+        if attempt + 1 >= self.attempts_number:
+            msg = f"Exceed max retry num: {self.attempts_number} failed."
+            raise custom_exceptions.TooManyRetryError(msg) from error
+        return self.sleep_sec(attempt, error)
+
+    def sleep_sec(self, attempt: int, error: Exception) -> float:
+        """Return sleep before next attempt (`attempt` starts from 0)."""
+        backoff_sec = random.uniform(  # noqa: S311
+            0,
+            min(self.max_sleep_sec, self.base_sleep_sec * 2**attempt),
+        )
+        retry_after_sec = getattr(error, "retry_after_sec", None)
+        if retry_after_sec is not None:
+            # server knows better, jitter spreads callers after pause
+            return retry_after_sec + backoff_sec / 2
+        return backoff_sec
+
+
+def call_with_retry(
+    func: Callable[[], RT],
+    policy: RetryPolicy,
+    on_retry: Callable[[Exception, int], None] | None = None,
+) -> RT:
+    """Call function until it succeeds or policy gives up.
+
+    Args:
+    ----
+        func (Callable[[], RT]): function without arguments
+        policy (RetryPolicy): backoff and retried errors
+        on_retry (Callable | None, optional): called with error and number\
+            of next attempt before each retry. Defaults to None.
+
+    Returns:
+    -------
+        RT: result of function
+
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as exc:  # noqa: BLE001
+            sleep_sec = policy.next_sleep_sec(exc, attempt)
+            if on_retry is not None:
+                on_retry(exc, attempt + 1)
+        attempt += 1
+        time.sleep(sleep_sec)
+
+
+async def call_with_retry_async(
+    func: Callable[[], Awaitable[RT]],
+    policy: RetryPolicy,
+    on_retry: Callable[[Exception, int], None] | None = None,
+) -> RT:
+    """Await coroutine function until it succeeds (see call_with_retry)."""
+    attempt = 0
+    while True:
+        try:
+            return await func()
+        except Exception as exc:  # noqa: BLE001
+            sleep_sec = policy.next_sleep_sec(exc, attempt)
+            if on_retry is not None:
+                on_retry(exc, attempt + 1)
+        attempt += 1
+        await asyncio.sleep(sleep_sec)
+
+
 def retry(
-    attempts_number: int,
-    retry_sleep_sec: int,
+    attempts_number: int | None = None,
+    retry_sleep_sec: float | None = None,
+    *,
+    policy: RetryPolicy | None = None,
 ) -> Callable[[Callable[..., RT]], Callable[..., RT]]:
-    """Retry attempts run of function.
+    """Retry attempts run of function (or coroutine function).
 
     Args:
     ----
-        attempts_number (int): number of attempts
-        retry_sleep_sec (int): sleep between attempts
+        attempts_number (int | None, optional): number of attempts\
+            (overrides policy one)
+        retry_sleep_sec (float | None, optional): base sleep between\
+            attempts (overrides policy one)
+        policy (RetryPolicy | None, optional): backoff and retried errors.\
+            Defaults to RetryPolicy().
 
     Returns:
     -------
         none: this is decorator
 
     """
+    policy = policy or RetryPolicy()
+    if attempts_number is not None:
+        policy = dataclasses.replace(policy, attempts_number=attempts_number)
+    if retry_sleep_sec is not None:
+        policy = dataclasses.replace(policy, base_sleep_sec=retry_sleep_sec)
 
     def decarator(func: Callable[..., RT]) -> Callable[..., RT]:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(wrapped=func)
+            async def async_wrapper(*args: object, **kwargs: object) -> RT:
+                return await call_with_retry_async(
+                    functools.partial(func, *args, **kwargs),
+                    policy,
+                )
+
+            return async_wrapper
+
         @functools.wraps(wrapped=func)
-        def wrapper(*args, **kwargs):
-            # TODO: For logging change '_' to attempt
-            for _ in range(attempts_number):
-                try:
-                    return func(*args, **kwargs)
-                except Exception:
-                    time.sleep(retry_sleep_sec)
-                # TODO: Add logging 'Trying attempt {attempt+1} of {attempts_number}'
-
-            # TODO: Add logging 'func {func.__name__} retry failed'
-            msg = f"Exceed max retry num: {attempts_number} failed."
-            raise custom_exceptions.TooManyRetryError(msg)
+        def wrapper(*args: object, **kwargs: object) -> RT:
+            return call_with_retry(
+                functools.partial(func, *args, **kwargs),
+                policy,
+            )
 
         return wrapper
 
@@ -0,0 +1,107 @@
+"""Coalescing of identical calls which are in flight at the same time."""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import CancelledError, Future
+from typing import TypeVar
+
+RT = TypeVar("RT")  # return type
+
+
+class SingleFlight:
+    """Run one call per key, concurrent callers of the key wait its result.
+
+    Calls are shared by threads and asyncio tasks of any event loop: the
+    leader call stores its result (or error) in `concurrent.futures.Future`
+    which followers wait (threads) or await (tasks). If the leader is
+    cancelled (e.g. its task), followers call function again themselves.
+    """
+
+    def __init__(self) -> None:
+        self._futures: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of keys which calls aren't finished yet."""
+        return len(self._futures)
+
+    def do(self, key: Hashable, func: Callable[[], RT]) -> tuple[RT, bool]:
+        """Call function or wait result of the same call in flight.
+
+        Args:
+        ----
+            key (Hashable): key of identical calls
+            func (Callable[[], RT]): function without arguments
+
+        Returns:
+        -------
+            tuple[RT, bool]: result and True if it's shared by other call
+
+        """
+        while True:
+            future, is_leader = self._join(key)
+            if is_leader:
+                break
+            try:
+                return future.result(), True
+            except CancelledError:
+                continue
+        try:
+            result = func()
+        except BaseException as exc:
+            self._finish(key, future, error=exc)
+            raise
+        self._finish(key, future, result=result)
+        return result, False
+
+    async def do_async(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[RT]],
+    ) -> tuple[RT, bool]:
+        """Await coroutine function or result of the same call in flight."""
+        while True:
+            future, is_leader = self._join(key)
+            if is_leader:
+                break
+            try:
+                # shield: cancelled follower doesn't cancel call of the leader
+                return await asyncio.shield(asyncio.wrap_future(future)), True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+        try:
+            result = await func()
+        except BaseException as exc:
+            self._finish(key, future, error=exc)
+            raise
+        self._finish(key, future, result=result)
+        return result, False
+
+    def _join(self, key: Hashable) -> tuple[Future, bool]:
+        with self._lock:
+            if key in self._futures:
+                return self._futures[key], False
+            future: Future = Future()
+            self._futures[key] = future
+            return future, True
+
+    def _finish(
+        self,
+        key: Hashable,
+        future: Future,
+        result: object = None,
+        error: BaseException | None = None,
+    ) -> None:
+        # key is released before waking followers, next call is a new one
+        with self._lock:
+            del self._futures[key]
+        if isinstance(error, Exception):
+            future.set_exception(error)
+        elif error is not None:
+            # cancellation, interrupt etc. aren't errors of the call
+            future.cancel()
+        else:
+            future.set_result(result)
@@ -0,0 +1,309 @@
+"""Headless batch download of playlists (it doesn't import Textual).
+
+Progress is written to stdout as newline-delimited JSON, one event per line.
+
+Run: `python -m ytm_browser.cli --auth files/auth/user.txt --library`
+     `python -m ytm_browser.cli --auth user.txt PLxxxx VLPLyyyy FEmusic_liked_playlists`
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from typing import TextIO
+
+from ytm_browser.core import (
+    api_client,
+    archive,
+    audio_profiles,
+    cover_cache,
+    custom_exceptions,
+    download_queue,
+    downloader,
+    responses,
+)
+
+LIBRARY_BROWSE_ID = "FEmusic_library_landing"
+# browse id of playlist page is "VL" + playlist id
+PLAYLIST_BROWSE_PREFIX = "VL"
+# browse ids of endpoints (pages with playlists), other ids are playlist ids
+ENDPOINT_BROWSE_PREFIXES = ("FE", "UC", "MPLA", "MPAD")
+
+
+class EventWriter:
+    """Thread safe writer of newline-delimited JSON events."""
+
+    def __init__(self, stream: TextIO = sys.stdout) -> None:
+        self.stream = stream
+        self.errors_number = 0
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, **fields: object) -> None:
+        line = json.dumps(
+            {"event": event, "time": round(time.time(), 3)} | fields,
+            ensure_ascii=False,
+            default=str,
+        )
+        with self._lock:
+            if event == "error":
+                self.errors_number += 1
+            self.stream.write(f"{line}\n")
+            self.stream.flush()
+
+
+def classify_ids(
+    ids: list[str],
+) -> tuple[list[str], list[str]]:
+    """Split ids typed by user to endpoint browse ids and playlist ids.
+
+    Args:
+    ----
+        ids (list[str]): browse ids or playlist ids
+
+    Returns:
+    -------
+        tuple[list[str], list[str]]: (endpoint browse ids, playlist ids)
+
+    """
+    # dicts keep order of ids and drop duplicates
+    endpoint_ids: dict[str, None] = {}
+    playlist_ids: dict[str, None] = {}
+    for raw_id in ids:
+        if raw_id.startswith(PLAYLIST_BROWSE_PREFIX):
+            playlist_ids[raw_id.removeprefix(PLAYLIST_BROWSE_PREFIX)] = None
+        elif raw_id.startswith(ENDPOINT_BROWSE_PREFIXES):
+            endpoint_ids[raw_id] = None
+        else:
+            playlist_ids[raw_id] = None
+    return list(endpoint_ids), list(playlist_ids)
+
+
+def resolve_playlists(
+    endpoint_ids: list[str],
+    playlist_ids: list[str],
+    events: EventWriter,
+) -> dict[str, responses.PlaylistResponse]:
+    """Load playlists of endpoints and tracks of all playlists by batches.
+
+    Args:
+    ----
+        endpoint_ids (list[str]): browse ids of pages with playlists
+        playlist_ids (list[str]): ids of playlists
+        events (EventWriter): writer of `resolved`/`error` events
+
+    Returns:
+    -------
+        dict[str, responses.PlaylistResponse]: {playlist_id: playlist}\
+            of successfully resolved playlists
+
+    """
+    playlists = {
+        playlist_id: responses.PlaylistResponse.from_payload(
+            title=playlist_id,
+            payload={"playlistId": playlist_id},
+        )
+        for playlist_id in playlist_ids
+    }
+    endpoints = [
+        responses.EndpointResponse.from_payload(
+            title=browse_id,
+            payload={"browse_id": browse_id},
+        )
+        for browse_id in endpoint_ids
+    ]
+    for endpoint, children in zip(
+        endpoints,
+        responses.load_children_many(endpoints),
+        strict=True,
+    ):
+        if isinstance(children, Exception):
+            events.emit("error", key=endpoint.title, error=repr(children))
+            continue
+        for child in children:
+            # the same playlist of cli ids and of endpoints is loaded once
+            if isinstance(child, responses.PlaylistResponse):
+                playlists.setdefault(child.payload["playlistId"], child)
+    resolved = {}
+    for (playlist_id, playlist), tracks in zip(
+        playlists.items(),
+        responses.load_children_many(list(playlists.values())),
+        strict=True,
+    ):
+        if isinstance(tracks, Exception):
+            events.emit("error", key=playlist_id, error=repr(tracks))
+            continue
+        events.emit(
+            "resolved",
+            key=playlist_id,
+            title=playlist.title,
+            # tracks of loaded pages, `len()` would request all pages
+            # here (the rest pages are loaded by download)
+            tracks=len(tracks.loaded_items),
+            complete=tracks.is_complete,
+        )
+        resolved[playlist_id] = playlist
+    return resolved
+
+
+def run(arguments: argparse.Namespace, events: EventWriter) -> int:
+    """Resolve and download playlists of arguments.
+
+    Returns
+    -------
+        int: exit code (1 if any endpoint, playlist or track failed)
+
+    """
+    client = api_client.SyncClient.create_with_credentials(arguments.auth)
+    if arguments.base_url:
+        client.set_base_url(arguments.base_url)
+    endpoint_ids, playlist_ids = classify_ids(arguments.ids)
+    if arguments.library:
+        endpoint_ids.append(LIBRARY_BROWSE_ID)
+    playlists = resolve_playlists(endpoint_ids, playlist_ids, events)
+    download_archive = (
+        archive.DownloadArchive(arguments.archive)
+        if arguments.archive
+        else None
+    )
+    covers = (
+        cover_cache.CoverCache(arguments.covers_dir)
+        if arguments.covers_dir
+        else None
+    )
+    queue_store = (
+        download_queue.DownloadQueueStore(arguments.queue_file)
+        if arguments.queue_file
+        else None
+    )
+
+    def on_progress(
+        playlist_key: str,
+        progress: downloader.PlaylistProgress,
+    ) -> None:
+        events.emit(
+            "progress",
+            key=playlist_key,
+            total=progress.total,
+            done=progress.done,
+            failed=progress.failed,
+            skipped=progress.skipped,
+            linked=progress.linked,
+            finished=progress.finished,
+        )
+
+    try:
+        progress = downloader.DownloadEngine(
+            target_dir=arguments.target_dir,
+            workers=arguments.workers,
+            profile=arguments.profile,
+            on_progress=on_progress,
+            download_archive=download_archive,
+            covers=covers,
+            queue_store=queue_store,
+        ).download(playlists)
+    finally:
+        if download_archive is not None:
+            download_archive.close()
+        if covers is not None:
+            covers.close()
+        if queue_store is not None:
+            # finished playlists are downloaded from scratch next time
+            queue_store.remove_finished()
+            queue_store.close()
+    failed_tracks = sum(
+        playlist_progress.failed for playlist_progress in progress.values()
+    )
+    events.emit(
+        "finished",
+        playlists=len(progress),
+        tracks=sum(
+            playlist_progress.total for playlist_progress in progress.values()
+        ),
+        failed=failed_tracks,
+    )
+    return int(bool(failed_tracks or events.errors_number))
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "ids",
+        nargs="*",
+        help="playlist ids (PL..., OLAK5uy_..., VLPL...) or browse ids of"
+        " pages with playlists (FEmusic_liked_playlists, ...)",
+    )
+    parser.add_argument(
+        "--auth",
+        required=True,
+        help="file with 'copy as cURL' request of music.youtube.com",
+    )
+    parser.add_argument(
+        "--library",
+        action="store_true",
+        help="download all playlists of Library",
+    )
+    parser.add_argument(
+        "--target-dir",
+        default=downloader.DEFAULT_SAVE_DIR,
+        help="dir of downloaded playlists",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=downloader.DEFAULT_WORKERS,
+        help="number of tracks downloaded at the same time",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=list(audio_profiles.PROFILES),
+        default=audio_profiles.DEFAULT_PROFILE,
+        help="output audio profile: opus/m4a are stream copies (no"
+        " re-encode), ogg (Vorbis) and mp3 profiles re-encode",
+    )
+    parser.add_argument(
+        "--archive",
+        default=archive.DEFAULT_ARCHIVE_FILE,
+        help="download archive file (empty string disables it)",
+    )
+    parser.add_argument(
+        "--covers-dir",
+        default=cover_cache.DEFAULT_COVERS_DIR,
+        help="cache dir of converted covers (empty string disables it)",
+    )
+    parser.add_argument(
+        "--queue-file",
+        default=download_queue.DEFAULT_QUEUE_FILE,
+        help="journal of track states, interrupted run is resumed by the"
+        " same command (empty string disables it)",
+    )
+    parser.add_argument(
+        "--base-url",
+        help="scheme and host of API (e.g. local stand-in server)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = make_parser()
+    arguments = parser.parse_args(argv)
+    if not arguments.ids and not arguments.library:
+        parser.error("pass playlist/browse ids or --library")
+    if arguments.workers < 1:
+        parser.error("--workers should be positive")
+    events = EventWriter()
+    try:
+        return run(arguments, events)
+    except (
+        custom_exceptions.CredentialsDataError,
+        FileNotFoundError,
+    ) as exc:
+        events.emit("error", key=None, error=repr(exc))
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,37 +1,90 @@
 """Client for YoutubeMusic."""
 
+import asyncio
 import atexit
+import email.utils
+import functools
+import json
+import queue
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
 from enum import IntEnum
 from pathlib import Path
 from typing import Self
 
 from curl_cffi import requests
 
-from utils.retry import retry
-from ytm_browser.core import credentials, custom_exceptions
+from utils import rate_limit, retry, single_flight
+from ytm_browser.core import (
+    cache,
+    credentials,
+    custom_exceptions,
+    metrics,
+    session_pool,
+)
+
+DEFAULT_MAX_IN_FLIGHT = 8
+DEFAULT_BASE_URL = "https://music.youtube.com"
+# requests per second of all clients (it's decreased on throttling)
+DEFAULT_RATE_PER_SEC = 10
+# failures of request which are counted in metrics by exception type
+REQUEST_ERRORS = (
+    requests.RequestsError,
+    custom_exceptions.CredentialsDataError,
+    custom_exceptions.ThrottledError,
+    custom_exceptions.ContentUnavailableError,
+    ValueError,
+)
+# invalid credentials (401) aren't retried, they need user's action, and
+# not available content (403/404) isn't retried too
+DEFAULT_RETRY_POLICY = retry.RetryPolicy(
+    attempts_number=5,
+    base_sleep_sec=0.5,
+    max_sleep_sec=30,
+    retry_on=(
+        requests.RequestsError,
+        custom_exceptions.ThrottledError,
+        ValueError,
+    ),
+)
+BROWSE_PATH = "/youtubei/v1/browse"
+GET_QUEUE_PATH = "/youtubei/v1/music/get_queue"
 
 
 class HttpCodes(IntEnum):
     UNAUTHORIZED = 401
+    FORBIDDEN = 403
+    NOT_FOUND = 404
     SUCCEED = 200
+    TOO_MANY_REQUESTS = 429
+    SERVICE_UNAVAILABLE = 503
 
 
-class SyncClient:
-    """Client for YoutubeMusic API (class uses Singleton pattern)."""
+class _BaseClient:
+    """Credentials handling and routing shared by sync and async clients."""
 
     # store class instance for use singleton pattern
     _instance = None
+    # scheme and host of API (change it to use local stand-in server)
+    base_url = DEFAULT_BASE_URL
+    # latency, sizes, status codes etc. of requests (shared by all clients)
+    request_metrics = metrics.registry
+    retry_policy = DEFAULT_RETRY_POLICY
+    # token bucket shared by all clients (None is unlimited)
+    rate_limiter: rate_limit.TokenBucket | None = rate_limit.TokenBucket(
+        DEFAULT_RATE_PER_SEC,
+    )
+    # identical requests in flight of all clients are sent once
+    in_flight_requests = single_flight.SingleFlight()
 
-    def __new__(cls) -> Self:
+    def __new__(cls, *_args: object, **_kwargs: object) -> Self:
         """Overview __new__ method, for use singleton pattern."""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self) -> None:
-        self._session = requests.Session(impersonate="chrome")
-        atexit.register(self._session.close)
-
     @classmethod
     def create_with_credentials(
         cls,
@@ -64,40 +117,558 @@ class SyncClient:
                 msg = "Wrong type of credentials_data"
                 raise custom_exceptions.CredentialsDataError(msg)
 
-    # TODO: add vebrose mod for retry decorator
-    # @retry(attempts_number=5, retry_sleep_sec=1)
-    def send_request(self, payload: dict, timeout: int = 10) -> dict:
-        """Send request to API."""
+    def set_base_url(self, base_url: str) -> None:
+        """Set scheme and host of API, e.g. `http://127.0.0.1:8080`."""
+        self.base_url = base_url.rstrip("/")
+
+    def set_retry_policy(self, retry_policy: retry.RetryPolicy) -> None:
+        self.retry_policy = retry_policy
+
+    def set_rate_limiter(
+        self,
+        rate_limiter: rate_limit.TokenBucket | None,
+    ) -> None:
+        """Set token bucket of requests (None disables rate limit)."""
+        self.rate_limiter = rate_limiter
+
+    def set_cache(self, response_cache: cache.ResponseCache | None) -> None:
+        """Set on-disk cache of responses (None disables caching)."""
+        self.response_cache = response_cache
+
+    def set_in_flight_requests(
+        self,
+        in_flight_requests: single_flight.SingleFlight | None,
+    ) -> None:
+        """Set coalescing of same requests in flight (None disables it)."""
+        self.in_flight_requests = in_flight_requests
+
+    def _request_kwargs(self, payload: dict, timeout: int) -> dict:
         self._check_credentials()
-        credentials_with_payload = self.credentials.json_data | payload
-        response = self._session.post(
-            url=self._set_url(payload=payload),
-            timeout=timeout,
-            headers=self.credentials.headers,
-            params=self.credentials.params,
-            json=credentials_with_payload,
+        return {
+            "url": self._set_url(payload=payload),
+            "timeout": timeout,
+            "headers": self.credentials.headers,
+            "params": self.credentials.params,
+            "json": self.credentials.json_data | payload,
+        }
+
+    def _request_key(self, payload: dict, url: str) -> str:
+        return cache.make_key(
+            url=url,
+            payload=payload,
+            account=credentials.account_id(self.credentials),
         )
+
+    def _cache_key(self, payload: dict, url: str) -> str | None:
+        if getattr(self, "response_cache", None) is None:
+            return None
+        return self._request_key(payload=payload, url=url)
+
+    def _cache_get(self, cache_key: str | None) -> dict | None:
+        if cache_key is None:
+            return None
+        return self.response_cache.get(cache_key)
+
+    def _cache_put(
+        self,
+        cache_key: str | None,
+        payload: dict,
+        response: dict,
+    ) -> None:
+        if cache_key is not None:
+            self.response_cache.put(
+                key=cache_key,
+                endpoint=cache.endpoint_type(payload),
+                response=response,
+            )
+
+    def _count_retry(self, endpoint: str, *_args: object) -> None:
+        self.request_metrics.count_retry(endpoint)
+
+    def _check_status(self, response: requests.models.Response) -> None:
         match response:
             case requests.models.Response() if response.status_code == HttpCodes.SUCCEED.value:  # noqa: E501
-                return response.json()
+                if self.rate_limiter is not None:
+                    self.rate_limiter.succeed()
+                return
+            case requests.models.Response() if response.status_code in {
+                HttpCodes.TOO_MANY_REQUESTS.value,
+                HttpCodes.SERVICE_UNAVAILABLE.value,
+            }:
+                retry_after_sec = _parse_retry_after(
+                    response.headers.get("Retry-After"),
+                )
+                if self.rate_limiter is not None:
+                    self.rate_limiter.throttle(retry_after_sec)
+                msg = f"Requests are throttled ({response.status_code})"
+                raise custom_exceptions.ThrottledError(msg, retry_after_sec)
             case requests.models.Response() if response.status_code == HttpCodes.UNAUTHORIZED.value:  # noqa: E501
                 msg = "Credentials data is not valid. Please update it."
                 raise custom_exceptions.CredentialsDataError(msg)
+            case requests.models.Response() if response.status_code in {
+                HttpCodes.FORBIDDEN.value,
+                HttpCodes.NOT_FOUND.value,
+            }:
+                msg = f"Content is not available ({response.status_code})"
+                raise custom_exceptions.ContentUnavailableError(msg)
             case _:
                 msg = "Unknow response error"
                 raise requests.models.RequestsError(msg)
 
+    def _handle_response(
+        self,
+        response: requests.models.Response,
+        endpoint: str,
+        started_at: float,
+    ) -> dict:
+        latency_sec = time.perf_counter() - started_at
+        decode_sec = None
+        try:
+            self._check_status(response)
+            decode_started_at = time.perf_counter()
+            decoded_response = response.json()
+            decode_sec = time.perf_counter() - decode_started_at
+        except REQUEST_ERRORS as exc:
+            self.request_metrics.count_error(endpoint, exc)
+            raise
+        finally:
+            self.request_metrics.observe_response(
+                endpoint=endpoint,
+                status_code=response.status_code,
+                latency_sec=latency_sec,
+                response_bytes=len(response.content),
+                decode_sec=decode_sec,
+            )
+        return decoded_response
+
     def _set_url(self, payload: dict[str, str]) -> str:
         match payload:
-            case {"browse_id": _} | {"browseId": _}:
-                return "https://music.youtube.com/youtubei/v1/browse"
+            case {"browse_id": _} | {"browseId": _} | {"continuation": _}:
+                return f"{self.base_url}{BROWSE_PATH}"
             case {"playlistId": _} | {"videoId": _}:
-                return "https://music.youtube.com/youtubei/v1/music/get_queue"
+                return f"{self.base_url}{GET_QUEUE_PATH}"
             case _:
                 msg = "Unknow payload type."
                 raise custom_exceptions.PayloadError(msg)
 
     def _check_credentials(self) -> None:
-        if not self.credentials:
+        if not getattr(self, "credentials", None):
             msg = "Credentials is not set. Please call first set_credentials(credentails_data: credentials.Credentials | str | Path | list[str])."  # noqa: E501
             raise custom_exceptions.CredentialsDataError(msg)
+
+
+class SyncClient(_BaseClient):
+    """Client for YoutubeMusic API (class uses Singleton pattern)."""
+
+    # accounts for spreading of public requests (None is off)
+    accounts_pool: session_pool.SessionPool | None = None
+    # max number of requests of `send_many` sent at the same time
+    max_in_flight = DEFAULT_MAX_IN_FLIGHT
+
+    def __init__(self) -> None:
+        # singleton keeps one kept-alive session for all `SyncClient()` calls
+        if not hasattr(self, "_session"):
+            self._session = requests.Session(impersonate="chrome")
+            atexit.register(self._session.close)
+        if not hasattr(self, "_idle_sessions"):
+            # sessions of `send_many` workers, kept alive between batches
+            self._idle_sessions: queue.SimpleQueue[requests.Session] = (
+                queue.SimpleQueue()
+            )
+            atexit.register(self._close_idle_sessions)
+
+    def set_accounts_pool(
+        self,
+        accounts_pool: session_pool.SessionPool | None,
+    ) -> None:
+        """Spread public requests over accounts of pool (None is off)."""
+        self.accounts_pool = accounts_pool
+
+    def set_max_in_flight(self, max_in_flight: int) -> None:
+        """Change the limit of concurrent requests of `send_many`."""
+        if max_in_flight < 1:
+            msg = "max_in_flight should be positive"
+            raise ValueError(msg)
+        self.max_in_flight = max_in_flight
+
+    def send_request(self, payload: dict, timeout: int = 10) -> dict:
+        """Send request to API (failed requests are retried by policy).
+
+        Identical request in flight (of any thread or asyncio client) isn't
+        sent again, its decoded response is shared, don't modify it.
+        """
+        return self._send(payload, timeout, self._session)
+
+    def send_many(
+        self,
+        payloads: list[dict],
+        timeout: int = 10,
+    ) -> list[dict | Exception]:
+        """Send payloads in parallel, results are in payloads order.
+
+        At most `max_in_flight` requests are sent at the same time, each
+        worker reuses its keep-alive session. Failed request doesn't abort
+        the batch, its error is returned in place of response.
+
+        Args:
+        ----
+            payloads (list[dict]): browse/get_queue payloads
+            timeout (int, optional): timeout of each request. Defaults to 10.
+
+        Returns:
+        -------
+            list[dict | Exception]: decoded responses or errors of requests
+
+        """
+        if not payloads:
+            return []
+        workers_number = min(len(payloads), self.max_in_flight)
+        with ThreadPoolExecutor(
+            max_workers=workers_number,
+            thread_name_prefix="send_many",
+        ) as executor:
+            return list(
+                executor.map(
+                    functools.partial(self._send_one_of_many, timeout=timeout),
+                    payloads,
+                ),
+            )
+
+    def _send_one_of_many(
+        self,
+        payload: dict,
+        timeout: int,
+    ) -> dict | Exception:
+        try:
+            session = self._idle_sessions.get_nowait()
+        except queue.Empty:
+            session = requests.Session(impersonate="chrome")
+        try:
+            return self._send(payload, timeout, session)
+        except Exception as exc:  # noqa: BLE001
+            return exc
+        finally:
+            self._idle_sessions.put(session)
+
+    def _close_idle_sessions(self) -> None:
+        while not self._idle_sessions.empty():
+            self._idle_sessions.get_nowait().close()
+
+    def _send(
+        self,
+        payload: dict,
+        timeout: int,
+        session: requests.Session,
+    ) -> dict:
+        request_kwargs = self._request_kwargs(payload=payload, timeout=timeout)
+        endpoint = metrics.endpoint_name(request_kwargs["url"])
+        cache_key = self._cache_key(payload=payload, url=request_kwargs["url"])
+        if (cached_response := self._cache_get(cache_key)) is not None:
+            self.request_metrics.count_cache_hit(endpoint)
+            self._pin_library_ids(payload, cached_response)
+            return cached_response
+        request_call = functools.partial(
+            retry.call_with_retry,
+            functools.partial(
+                self._post, request_kwargs, endpoint, payload, session
+            ),
+            policy=self.retry_policy,
+            on_retry=functools.partial(self._count_retry, endpoint),
+        )
+        if self.in_flight_requests is None:
+            response, is_shared = request_call(), False
+        else:
+            # waiters of the same request in flight get its decoded response
+            response, is_shared = self.in_flight_requests.do(
+                self._request_key(payload=payload, url=request_kwargs["url"]),
+                request_call,
+            )
+        if is_shared:
+            self.request_metrics.count_coalesced(endpoint)
+        else:
+            self._cache_put(cache_key, payload, response)
+        self._pin_library_ids(payload, response)
+        return response
+
+    def _pin_library_ids(self, payload: dict, response: dict) -> None:
+        # private playlists of library stay with owner's credentials
+        if self.accounts_pool is not None:
+            self.accounts_pool.pin_response(payload, response)
+
+    def _post(
+        self,
+        request_kwargs: dict,
+        endpoint: str,
+        payload: dict,
+        session: requests.Session,
+    ) -> dict:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        account = (
+            self.accounts_pool.acquire()
+            if self.accounts_pool is not None
+            and not self.accounts_pool.is_pinned(payload)
+            else None
+        )
+        if account is None:
+            return self._post_by_session(session, request_kwargs, endpoint)
+        try:
+            with account.lock:
+                return self._post_by_session(
+                    account.session,
+                    account.request_kwargs(request_kwargs, payload),
+                    endpoint,
+                )
+        except (
+            custom_exceptions.ThrottledError,
+            custom_exceptions.CredentialsDataError,
+        ) as exc:
+            self.accounts_pool.release(account, exc)
+            # next attempt is sent by other account without delay
+            msg = f"Account {account.name} of session pool rejected request"
+            raise custom_exceptions.AccountUnavailableError(msg, 0) from exc
+        except custom_exceptions.ContentUnavailableError:
+            # e.g. private playlist of owner isn't available for other
+            # account, it's sent with owner's credentials from now on
+            self.accounts_pool.pin(payload)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            return self._post_by_session(session, request_kwargs, endpoint)
+
+    def _post_by_session(
+        self,
+        session: requests.Session,
+        request_kwargs: dict,
+        endpoint: str,
+    ) -> dict:
+        started_at = time.perf_counter()
+        try:
+            raw_response = session.post(**request_kwargs)
+        except requests.RequestsError as exc:
+            self.request_metrics.count_error(endpoint, exc)
+            raise
+        return self._handle_response(raw_response, endpoint, started_at)
+
+    def stream_request(
+        self,
+        payload: dict,
+        timeout: int = 10,
+    ) -> Iterator[bytes]:
+        """Send request to API and yield raw body parts while they arrive.
+
+        Args:
+        ----
+            payload (dict): browse/get_queue payload
+            timeout (int, optional): request timeout. Defaults to 10.
+
+        Yields:
+        ------
+            Iterator[bytes]: parts of json body
+
+        """
+        request_kwargs = self._request_kwargs(payload=payload, timeout=timeout)
+        endpoint = metrics.endpoint_name(request_kwargs["url"])
+        cache_key = self._cache_key(payload=payload, url=request_kwargs["url"])
+        if (cached_response := self._cache_get(cache_key)) is not None:
+            self.request_metrics.count_cache_hit(endpoint)
+            yield json.dumps(cached_response).encode()
+            return
+        # consumed part of body can't be retried, stream is sent once
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        started_at = time.perf_counter()
+        try:
+            response = self._session.post(**request_kwargs, stream=True)
+        except requests.RequestsError as exc:
+            self.request_metrics.count_error(endpoint, exc)
+            raise
+        # streamed body is decoded by consumer, latency is time to headers
+        latency_sec = time.perf_counter() - started_at
+        response_bytes = 0
+        try:
+            self._check_status(response)
+            body_parts = []
+            for chunk in response.iter_content():
+                response_bytes += len(chunk)
+                if cache_key is not None:
+                    body_parts.append(chunk)
+                yield chunk
+        except REQUEST_ERRORS as exc:
+            self.request_metrics.count_error(endpoint, exc)
+            raise
+        finally:
+            response.close()
+            self.request_metrics.observe_response(
+                endpoint=endpoint,
+                status_code=response.status_code,
+                latency_sec=latency_sec,
+                response_bytes=response_bytes,
+            )
+        if cache_key is not None:
+            self._cache_put(
+                cache_key, payload, json.loads(b"".join(body_parts))
+            )
+
+
+class AsyncClient(_BaseClient):
+    """Asyncio client for YoutubeMusic API (class uses Singleton pattern).
+
+    Requests are sent through curl_cffi's AsyncSession, at most
+    `max_in_flight` of them at the same time.
+    """
+
+    def __init__(self, max_in_flight: int | None = None) -> None:
+        if not hasattr(self, "_session"):
+            self._session: requests.AsyncSession | None = None
+            self._loop: asyncio.AbstractEventLoop | None = None
+            self._semaphore: asyncio.Semaphore | None = None
+            self.max_in_flight = DEFAULT_MAX_IN_FLIGHT
+        if max_in_flight is not None:
+            self.set_max_in_flight(max_in_flight)
+
+    def set_max_in_flight(self, max_in_flight: int) -> None:
+        """Change the limit of concurrent requests.
+
+        Args:
+        ----
+            max_in_flight (int): max number of requests sent at the same time
+
+        """
+        if max_in_flight < 1:
+            msg = "max_in_flight should be positive"
+            raise ValueError(msg)
+        self.max_in_flight = max_in_flight
+        # semaphore is recreated with the new limit on the next request
+        self._semaphore = None
+
+    async def send_request(self, payload: dict, timeout: int = 10) -> dict:
+        """Send request to API (failed requests are retried by policy)."""
+        request_kwargs = self._request_kwargs(payload=payload, timeout=timeout)
+        endpoint = metrics.endpoint_name(request_kwargs["url"])
+        cache_key = self._cache_key(payload=payload, url=request_kwargs["url"])
+        if (cached_response := self._cache_get(cache_key)) is not None:
+            self.request_metrics.count_cache_hit(endpoint)
+            return cached_response
+        request_call = functools.partial(
+            retry.call_with_retry_async,
+            functools.partial(self._post, request_kwargs, endpoint),
+            policy=self.retry_policy,
+            on_retry=functools.partial(self._count_retry, endpoint),
+        )
+        if self.in_flight_requests is None:
+            response, is_shared = await request_call(), False
+        else:
+            response, is_shared = await self.in_flight_requests.do_async(
+                self._request_key(payload=payload, url=request_kwargs["url"]),
+                request_call,
+            )
+        if is_shared:
+            self.request_metrics.count_coalesced(endpoint)
+        else:
+            self._cache_put(cache_key, payload, response)
+        return response
+
+    async def _post(self, request_kwargs: dict, endpoint: str) -> dict:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+        session, semaphore = await self._get_session()
+        async with semaphore:
+            started_at = time.perf_counter()
+            try:
+                raw_response = await session.post(**request_kwargs)
+            except requests.RequestsError as exc:
+                self.request_metrics.count_error(endpoint, exc)
+                raise
+        return self._handle_response(raw_response, endpoint, started_at)
+
+    async def send_requests(
+        self,
+        payloads: list[dict],
+        timeout: int = 10,
+    ) -> list[dict]:
+        """Send all payloads concurrently, results are in payloads order.
+
+        Args:
+        ----
+            payloads (list[dict]): browse/get_queue payloads
+            timeout (int, optional): timeout of each request. Defaults to 10.
+
+        Returns:
+        -------
+            list[dict]: decoded responses
+
+        """
+        return list(
+            await asyncio.gather(
+                *[
+                    self.send_request(payload=payload, timeout=timeout)
+                    for payload in payloads
+                ],
+            ),
+        )
+
+    async def send_many(
+        self,
+        payloads: list[dict],
+        timeout: int = 10,
+    ) -> list[dict | Exception]:
+        """Send payloads concurrently, errors are returned in place of responses.
+
+        Unlike `send_requests` failed request doesn't abort the batch.
+
+        Args:
+        ----
+            payloads (list[dict]): browse/get_queue payloads
+            timeout (int, optional): timeout of each request. Defaults to 10.
+
+        Returns:
+        -------
+            list[dict | Exception]: decoded responses or errors of requests\
+                in payloads order
+
+        """
+        return list(
+            await asyncio.gather(
+                *[
+                    self.send_request(payload=payload, timeout=timeout)
+                    for payload in payloads
+                ],
+                return_exceptions=True,
+            ),
+        )
+
+    async def close(self) -> None:
+        """Close session of the running event loop."""
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    async def _get_session(
+        self,
+    ) -> tuple[requests.AsyncSession, asyncio.Semaphore]:
+        # curl_cffi AsyncSession is bound to the event loop it was created in
+        running_loop = asyncio.get_running_loop()
+        if self._loop is not running_loop or self._session is None:
+            self._session = requests.AsyncSession(
+                impersonate="chrome",
+                max_clients=self.max_in_flight,
+            )
+            self._loop = running_loop
+            self._semaphore = None
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._session, self._semaphore
+
+
+def _parse_retry_after(retry_after: str | None) -> float | None:
+    # Retry-After is delay in seconds or HTTP date
+    if not retry_after:
+        return None
+    if retry_after.strip().isdigit():
+        return float(retry_after)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
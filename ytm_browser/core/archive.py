@@ -0,0 +1,288 @@
+"""Index of downloaded tracks (download archive)."""
+
+import argparse
+import json
+import re
+import sqlite3
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from ytm_browser.core import audio_profiles
+
+DEFAULT_ARCHIVE_FILE = "files/download_archive.sqlite"
+AUDIO_EXTENSIONS = frozenset({".mp3", ".m4a", ".opus", ".ogg", ".webm"})
+REBUILD_WORKERS = 8
+# profile of rebuilt file which extension doesn't name one profile (e.g.
+# mp3 of any bitrate or webm), it's matched by video id for any profile
+UNKNOWN_PROFILE = "unknown"
+VIDEO_ID_PATTERN = re.compile(
+    r"(?:[?&]v=|youtu\.be/|\[)(?P<video_id>[\w-]{11})(?:\]|&|$)",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ArchiveEntry:
+    video_id: str
+    path: str
+    audio_format: str
+    completed_at: float
+    # name of audio profile (audio_profiles.PROFILES) of downloaded file
+    profile: str = audio_profiles.DEFAULT_PROFILE
+
+
+class DownloadArchive:
+    """Persistent {video_id: {profile: ArchiveEntry}} index, thread safe.
+
+    Track is archived per audio profile, so track downloaded as opus isn't
+    counted as downloaded mp3 (entry of `UNKNOWN_PROFILE` counts for any
+    profile). All entries are kept in memory for O(1) lookups, every
+    change is written to SQLite file.
+    """
+
+    def __init__(
+        self,
+        archive_file: str | Path = DEFAULT_ARCHIVE_FILE,
+    ) -> None:
+        self._lock = threading.Lock()
+        Path(archive_file).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            archive_file,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tracks (
+                video_id TEXT NOT NULL,
+                path TEXT NOT NULL,
+                audio_format TEXT NOT NULL,
+                completed_at REAL NOT NULL,
+                profile TEXT NOT NULL,
+                PRIMARY KEY (video_id, profile)
+            )
+            """,
+        )
+        self._entries: dict[str, dict[str, ArchiveEntry]] = {}
+        for row in self._connection.execute("SELECT * FROM tracks"):
+            entry = ArchiveEntry(*row)
+            self._entries.setdefault(entry.video_id, {})[entry.profile] = (
+                entry
+            )
+
+    def __contains__(self, video_id: object) -> bool:
+        """Check track is archived in any profile."""
+        return video_id in self._entries
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def get(
+        self,
+        video_id: str,
+        profile: str = audio_profiles.DEFAULT_PROFILE,
+    ) -> ArchiveEntry | None:
+        entries = self._entries.get(video_id, {})
+        return entries.get(profile) or entries.get(UNKNOWN_PROFILE)
+
+    def is_downloaded(
+        self,
+        video_id: str,
+        profile: str = audio_profiles.DEFAULT_PROFILE,
+    ) -> bool:
+        """Check track is in archive and its file still exists."""
+        entry = self.get(video_id, profile)
+        return entry is not None and Path(entry.path).is_file()
+
+    def existing_path(
+        self,
+        video_id: str,
+        profile: str = audio_profiles.DEFAULT_PROFILE,
+    ) -> Path | None:
+        """Return path of archived track file.
+
+        Entry of removed or moved file is dropped, so the track is
+        downloaded again.
+
+        Returns
+        -------
+            Path | None: path of file or None if it's not downloaded
+
+        """
+        entry = self.get(video_id, profile)
+        if entry is None:
+            return None
+        if not Path(entry.path).is_file():
+            self.remove(video_id, entry.profile)
+            return None
+        return Path(entry.path)
+
+    def add(
+        self,
+        video_id: str,
+        path: str | Path,
+        audio_format: str,
+        profile: str = audio_profiles.DEFAULT_PROFILE,
+    ) -> ArchiveEntry:
+        entry = ArchiveEntry(
+            video_id=video_id,
+            path=str(path),
+            audio_format=audio_format,
+            completed_at=time.time(),
+            profile=profile,
+        )
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO tracks VALUES (?, ?, ?, ?, ?)",
+                (
+                    entry.video_id,
+                    entry.path,
+                    entry.audio_format,
+                    entry.completed_at,
+                    entry.profile,
+                ),
+            )
+            self._entries.setdefault(video_id, {})[profile] = entry
+        return entry
+
+    def remove(self, video_id: str, profile: str | None = None) -> None:
+        """Remove track entry of profile (of all profiles if it's None)."""
+        with self._lock:
+            if profile is None:
+                self._connection.execute(
+                    "DELETE FROM tracks WHERE video_id = ?",
+                    (video_id,),
+                )
+                self._entries.pop(video_id, None)
+                return
+            self._connection.execute(
+                "DELETE FROM tracks WHERE video_id = ? AND profile = ?",
+                (video_id, profile),
+            )
+            entries = self._entries.get(video_id, {})
+            entries.pop(profile, None)
+            if not entries:
+                self._entries.pop(video_id, None)
+
+    def rebuild(
+        self,
+        music_dir: str | Path,
+        workers: int = REBUILD_WORKERS,
+    ) -> int:
+        """Re-index existing music tree (replaces all entries).
+
+        Video id is read from `purl`/`comment` tag (written by
+        FFmpegMetadata) with ffprobe, or from `[video_id]` in filename.
+
+        Args:
+        ----
+            music_dir (str | Path): root dir of downloaded music
+            workers (int, optional): number of parallel ffprobe calls.\
+                Defaults REBUILD_WORKERS.
+
+        Returns:
+        -------
+            int: number of indexed tracks
+
+        """
+        audio_files = [
+            path
+            for path in Path(music_dir).rglob("*")
+            if path.suffix.lower() in AUDIO_EXTENSIONS and path.is_file()
+        ]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            video_ids = list(executor.map(read_video_id, audio_files))
+        with self._lock:
+            self._connection.execute("DELETE FROM tracks")
+            self._entries.clear()
+        for path, video_id in zip(audio_files, video_ids, strict=True):
+            if video_id is not None:
+                audio_format = path.suffix.lstrip(".").lower()
+                self.add(
+                    video_id=video_id,
+                    path=path,
+                    audio_format=audio_format,
+                    profile=_extension_profile(audio_format),
+                )
+        return len(self)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def _extension_profile(extension: str) -> str:
+    """Return name of the only profile with `extension` of output file."""
+    profile_names = [
+        profile.name
+        for profile in audio_profiles.PROFILES.values()
+        if profile.extension == extension
+    ]
+    if len(profile_names) == 1:
+        return profile_names[0]
+    return UNKNOWN_PROFILE
+
+
+def read_video_id(audio_file: Path) -> str | None:
+    """Read youtube video id of downloaded audio file.
+
+    Args:
+    ----
+        audio_file (Path): audio file
+
+    Returns:
+    -------
+        str | None: video id or None if it's not found
+
+    """
+    try:
+        ffprobe_result = subprocess.run(
+            [  # noqa: S603, S607
+                "ffprobe",
+                "-v",
+                "quiet",
+                "-print_format",
+                "json",
+                "-show_entries",
+                "format_tags",
+                str(audio_file),
+            ],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        tags = (
+            json.loads(ffprobe_result.stdout).get("format", {}).get("tags", {})
+        )
+    except (OSError, subprocess.CalledProcessError, json.JSONDecodeError):
+        tags = {}
+    candidates = [
+        value
+        for key, value in tags.items()
+        if key.lower() in {"purl", "comment"}
+    ]
+    candidates.append(audio_file.stem)
+    for candidate in candidates:
+        if found := VIDEO_ID_PATTERN.search(candidate):
+            return found.group("video_id")
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    rebuild_parser = subparsers.add_parser(
+        "rebuild",
+        help="re-index existing music dir",
+    )
+    rebuild_parser.add_argument("music_dir", nargs="?", default="files/music")
+    rebuild_parser.add_argument("--archive", default=DEFAULT_ARCHIVE_FILE)
+    arguments = parser.parse_args()
+    indexed_tracks = DownloadArchive(arguments.archive).rebuild(
+        arguments.music_dir,
+    )
+    print(f"Indexed {indexed_tracks} tracks")  # noqa: T201
@@ -0,0 +1,94 @@
+"""Output profiles of downloaded tracks (source stream and ffmpeg codec)."""
+
+from dataclasses import dataclass
+
+# youtube audio streams: opus in webm and aac in m4a
+OPUS_FORMAT = "251"
+AAC_FORMAT = "140"
+# ffmpeg arguments of stream copy (remux without re-encode)
+COPY_CODEC_ARGS = ("-codec:a", "copy")
+MP3_BITRATES = (320, 256, 192, 128)
+
+
+@dataclass(frozen=True, slots=True)
+class AudioProfile:
+    name: str
+    # yt_dlp format id of downloaded stream
+    format_id: str
+    # extension of output file
+    extension: str
+    # ffmpeg output codec arguments
+    codec_args: tuple[str, ...] = COPY_CODEC_ARGS
+    description: str = ""
+
+    @property
+    def is_passthrough(self) -> bool:
+        """Audio stream is copied as is, without re-encode."""
+        return self.codec_args == COPY_CODEC_ARGS
+
+
+def mp3_profile(bitrate: int | None = None) -> AudioProfile:
+    """Make mp3 profile with constant `bitrate` kbit/s (None is best VBR)."""
+    if bitrate is None:
+        return AudioProfile(
+            name="mp3",
+            format_id=OPUS_FORMAT,
+            extension="mp3",
+            codec_args=("-codec:a", "libmp3lame", "-q:a", "0"),
+            description="mp3 VBR V0 (re-encode)",
+        )
+    return AudioProfile(
+        name=f"mp3-{bitrate}",
+        format_id=OPUS_FORMAT,
+        extension="mp3",
+        codec_args=("-codec:a", "libmp3lame", "-b:a", f"{bitrate}k"),
+        description=f"mp3 {bitrate} kbit/s (re-encode)",
+    )
+
+
+PROFILES = {
+    profile.name: profile
+    for profile in (
+        AudioProfile(
+            name="opus",
+            format_id=OPUS_FORMAT,
+            extension="opus",
+            description="Opus remuxed to .opus (no re-encode)",
+        ),
+        # .ogg is tagged as Vorbis stream, so Opus isn't remuxed to it
+        AudioProfile(
+            name="ogg",
+            format_id=OPUS_FORMAT,
+            extension="ogg",
+            codec_args=("-codec:a", "libvorbis", "-q:a", "6"),
+            description="Vorbis ogg q6 (re-encode)",
+        ),
+        AudioProfile(
+            name="m4a",
+            format_id=AAC_FORMAT,
+            extension="m4a",
+            description="AAC m4a as is (no re-encode)",
+        ),
+        mp3_profile(),
+        *(mp3_profile(bitrate) for bitrate in MP3_BITRATES),
+    )
+}
+# the most compatible one (it was the only format before profiles)
+DEFAULT_PROFILE = "mp3"
+
+
+def get_profile(profile: AudioProfile | str) -> AudioProfile:
+    """Return profile by name (profile object is returned as is).
+
+    Raises
+    ------
+        ValueError: unknown profile name
+
+    """
+    if isinstance(profile, AudioProfile):
+        return profile
+    try:
+        return PROFILES[profile]
+    except KeyError as exc:
+        msg = f"Unknown audio profile {profile!r}, use one of {list(PROFILES)}"
+        raise ValueError(msg) from exc
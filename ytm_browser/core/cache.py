@@ -0,0 +1,176 @@
+"""Persistent on-disk cache of API responses."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_CACHE_FILE = "files/cache/responses.sqlite"
+DEFAULT_MAX_SIZE_BYTES = 256 * 1024 * 1024
+# Time to live by endpoint type: browse_id of browse requests,
+# or "browse"/"get_queue" for all other requests of route.
+DEFAULT_TTL_SEC: dict[str, int] = {
+    "FEmusic_new_releases_albums": 6 * 60 * 60,
+    "FEmusic_mixed_for_you": 60 * 60,
+    "FEmusic_listen_again": 60 * 60,
+    "FEmusic_library_landing": 60 * 60,
+    "browse": 24 * 60 * 60,
+    "get_queue": 24 * 60 * 60,
+}
+
+
+def make_key(url: str, payload: dict, account: str) -> str:
+    """Make canonical cache key of request.
+
+    Args:
+    ----
+        url (str): request url
+        payload (dict): request payload (without credentials data)
+        account (str): account id (see `credentials.account_id`)
+
+    Returns:
+    -------
+        str: sha256 hexdigest of request
+
+    """
+    canonical_request = json.dumps(
+        [url, payload, account],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical_request.encode()).hexdigest()
+
+
+def endpoint_type(payload: dict) -> str:
+    """Return endpoint type of payload, it is used for select TTL."""
+    match payload:
+        case {"browse_id": browse_id} | {"browseId": browse_id}:
+            return str(browse_id)
+        case {"playlistId": _} | {"videoId": _}:
+            return "get_queue"
+        case _:
+            return "browse"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class ResponseCache:
+    """SQLite store of zlib compressed responses with TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        cache_file: str | Path = DEFAULT_CACHE_FILE,
+        ttl_sec: dict[str, int] | None = None,
+        max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+    ) -> None:
+        self.ttl_sec = DEFAULT_TTL_SEC | (ttl_sec or {})
+        self.max_size_bytes = max_size_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            cache_file,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._connection.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_accessed_at
+                ON responses (accessed_at);
+            """,
+        )
+        (self._size,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses",
+        ).fetchone()
+
+    def get(self, key: str) -> dict | None:
+        """Return cached response or None (expired entries are removed)."""
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT endpoint, data, size, created_at FROM responses "
+                "WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            endpoint, data, size, created_at = row
+            if created_at + self._ttl(endpoint) < now:
+                self._delete(key, size)
+                self.stats.misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                (now, key),
+            )
+            self.stats.hits += 1
+        return json.loads(zlib.decompress(data))
+
+    def put(self, key: str, endpoint: str, response: dict) -> None:
+        """Store response and evict least recently used ones over size cap."""
+        data = zlib.compress(
+            json.dumps(response, separators=(",", ":")).encode(),
+        )
+        now = time.time()
+        with self._lock:
+            previous = self._connection.execute(
+                "SELECT size FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, data, len(data), now, now),
+            )
+            self._size += len(data) - (previous[0] if previous else 0)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _ttl(self, endpoint: str) -> int:
+        return self.ttl_sec.get(endpoint, self.ttl_sec["browse"])
+
+    def _delete(self, key: str, size: int) -> None:
+        self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self._size -= size
+
+    def _evict(self) -> None:
+        while self._size > self.max_size_bytes:
+            rows = self._connection.execute(
+                "SELECT key, size FROM responses "
+                "ORDER BY accessed_at LIMIT 64",
+            ).fetchall()
+            if not rows:
+                self._size = 0
+                return
+            for key, size in rows:
+                self._delete(key, size)
+                self.stats.evictions += 1
+                if self._size <= self.max_size_bytes:
+                    return
@@ -0,0 +1,228 @@
+"""Local cache of converted cover images (thumbnails of tracks)."""
+
+import hashlib
+import shutil
+import sqlite3
+import subprocess
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from utils import single_flight
+
+DEFAULT_COVERS_DIR = "files/covers"
+DEFAULT_MAX_SIZE_BYTES = 128 * 1024 * 1024
+INDEX_FILE = "index.sqlite"
+COVER_FORMAT = "jpg"
+
+
+@dataclass
+class CoverCacheStats:
+    hits: int = 0
+    # cover is fetched, but the same image is already converted
+    content_hits: int = 0
+    conversions: int = 0
+    evictions: int = 0
+
+
+def _url_key(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+class CoverCache:
+    """Content-addressed store of covers converted to jpg, with LRU eviction.
+
+    Cover file is named by hash of fetched image, so tracks with different
+    thumbnail urls of the same album art share one file. Urls are indexed
+    in SQLite, cover of known url is neither fetched nor converted again.
+    """
+
+    def __init__(
+        self,
+        covers_dir: str | Path = DEFAULT_COVERS_DIR,
+        max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+    ) -> None:
+        self.covers_dir = Path(covers_dir)
+        self.max_size_bytes = max_size_bytes
+        self.stats = CoverCacheStats()
+        self._lock = threading.Lock()
+        # concurrent tracks of one album wait the first fetch of its cover
+        self._in_flight = single_flight.SingleFlight()
+        self.covers_dir.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            self.covers_dir / INDEX_FILE,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._connection.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS covers (
+                content_hash TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS urls (
+                url_key TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS covers_accessed_at
+                ON covers (accessed_at);
+            CREATE INDEX IF NOT EXISTS urls_content_hash
+                ON urls (content_hash);
+            """,
+        )
+        (self._size,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM covers",
+        ).fetchone()
+
+    def copy_cover(
+        self,
+        url: str,
+        fetch: Callable[[str], bytes],
+        target: Path,
+    ) -> Path:
+        """Copy cached cover of url to `target` (fetch and convert on miss).
+
+        Args:
+        ----
+            url (str): thumbnail url
+            fetch (Callable[[str], bytes]): download function of url
+            target (Path): path of cover copy (e.g. next to track)
+
+        Returns:
+        -------
+            Path: `target`
+
+        Raises:
+        ------
+            OSError: fetch or file error
+            subprocess.CalledProcessError: image isn't converted by ffmpeg
+
+        """
+        is_added = False
+        while True:
+            with self._lock:
+                content_hash = self._lookup(url)
+                if content_hash is not None:
+                    # copy under lock, so cover isn't evicted while copying
+                    shutil.copyfile(self._cover_path(content_hash), target)
+                    if not is_added:
+                        self.stats.hits += 1
+                    return target
+            # next loop copies cover which is added by this or shared call
+            self._in_flight.do(url, lambda: self._add(url, fetch(url)))
+            is_added = True
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _cover_path(self, content_hash: str) -> Path:
+        return self.covers_dir / f"{content_hash}.{COVER_FORMAT}"
+
+    def _lookup(self, url: str) -> str | None:
+        row = self._connection.execute(
+            "SELECT content_hash FROM urls WHERE url_key = ?",
+            (_url_key(url),),
+        ).fetchone()
+        if row is None:
+            return None
+        (content_hash,) = row
+        if not self._cover_path(content_hash).is_file():
+            self._delete(content_hash)
+            return None
+        self._connection.execute(
+            "UPDATE covers SET accessed_at = ? WHERE content_hash = ?",
+            (time.time(), content_hash),
+        )
+        return content_hash
+
+    def _add(self, url: str, image: bytes) -> None:
+        content_hash = hashlib.sha256(image).hexdigest()
+        cover_path = self._cover_path(content_hash)
+        if cover_path.is_file():
+            self.stats.content_hits += 1
+        else:
+            # converted outside of lock, other covers are served meanwhile
+            _convert_image(image, cover_path)
+            self.stats.conversions += 1
+        with self._lock:
+            previous = self._connection.execute(
+                "SELECT size FROM covers WHERE content_hash = ?",
+                (content_hash,),
+            ).fetchone()
+            size = cover_path.stat().st_size
+            self._connection.execute(
+                "INSERT OR REPLACE INTO covers VALUES (?, ?, ?)",
+                (content_hash, size, time.time()),
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO urls VALUES (?, ?)",
+                (_url_key(url), content_hash),
+            )
+            self._size += size - (previous[0] if previous else 0)
+            self._evict(keep=content_hash)
+
+    def _delete(self, content_hash: str) -> None:
+        row = self._connection.execute(
+            "SELECT size FROM covers WHERE content_hash = ?",
+            (content_hash,),
+        ).fetchone()
+        self._connection.execute(
+            "DELETE FROM covers WHERE content_hash = ?",
+            (content_hash,),
+        )
+        self._connection.execute(
+            "DELETE FROM urls WHERE content_hash = ?",
+            (content_hash,),
+        )
+        self._cover_path(content_hash).unlink(missing_ok=True)
+        if row is not None:
+            self._size -= row[0]
+
+    def _evict(self, keep: str) -> None:
+        while self._size > self.max_size_bytes:
+            rows = self._connection.execute(
+                "SELECT content_hash FROM covers WHERE content_hash != ? "
+                "ORDER BY accessed_at LIMIT 64",
+                (keep,),
+            ).fetchall()
+            if not rows:
+                return
+            for (content_hash,) in rows:
+                self._delete(content_hash)
+                self.stats.evictions += 1
+                if self._size <= self.max_size_bytes:
+                    return
+
+
+def _convert_image(image: bytes, cover_path: Path) -> None:
+    # written to temporary file, so half-converted cover is never served
+    # (name is unique per thread, same image of other url can be converted)
+    temporary_name = f"{cover_path.stem}.{threading.get_ident()}"
+    source = cover_path.with_name(f"{temporary_name}.source")
+    converted = cover_path.with_name(f"{temporary_name}.{COVER_FORMAT}")
+    source.write_bytes(image)
+    try:
+        subprocess.run(
+            [  # noqa: S603, S607
+                "ffmpeg",
+                "-y",
+                "-loglevel",
+                "error",
+                "-i",
+                str(source),
+                "-frames:v",
+                "1",
+                str(converted),
+            ],
+            check=True,
+            capture_output=True,
+        )
+        converted.replace(cover_path)
+    finally:
+        source.unlink(missing_ok=True)
+        converted.unlink(missing_ok=True)
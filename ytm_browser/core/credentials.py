@@ -1,5 +1,6 @@
 """Module for working with auth files."""
 
+import hashlib
 import json
 import shlex
 from contextlib import suppress
@@ -7,8 +8,6 @@ from dataclasses import dataclass
 from pathlib import Path
 from urllib.parse import parse_qsl, urlsplit
 
-import pyperclip  # type: ignore  # noqa: PGH003 # missing stub files
-
 from ytm_browser.core import custom_exceptions
 
 
@@ -19,6 +18,34 @@ class Credentials:
     json_data: dict
 
 
+def account_id(credentials: Credentials) -> str:
+    """Return stable id of account (it doesn't change with session hash).
+
+    Args:
+    ----
+        credentials (Credentials): parsed credentials
+
+    Returns:
+    -------
+        str: short hash of account cookies and auth user index
+
+    """
+    headers = {
+        key.lower(): value for key, value in credentials.headers.items()
+    }
+    cookies = dict(
+        cookie.strip().split("=", 1)
+        for cookie in headers.get("cookie", "").split(";")
+        if "=" in cookie
+    )
+    account_cookie = cookies.get("SAPISID") or cookies.get(
+        "__Secure-3PAPISID",
+        headers.get("cookie", ""),
+    )
+    account = f"{account_cookie}:{headers.get('x-goog-authuser', '0')}"
+    return hashlib.sha256(account.encode()).hexdigest()[:16]
+
+
 def read_credentials_from_file(curl_request_file: str | Path) -> Credentials:
     """Read file with your session from Dev tools, and then 'copy as cURL'.
 
@@ -48,6 +75,9 @@ def read_credentials_from_file(curl_request_file: str | Path) -> Credentials:
 
 
 def read_credentials_from_clipboard() -> Credentials:
+    # pyperclip is imported on clipboard use only (it probes clipboard tools)
+    import pyperclip  # type: ignore  # noqa: PGH003 # missing stub files
+
     return pyperclip.paste().split("\n")
 
 
@@ -0,0 +1,252 @@
+"""Index of auth files with incremental rescan and validation of accounts."""
+
+import hashlib
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from curl_cffi import requests
+
+from ytm_browser.core import credentials, custom_exceptions
+
+DEFAULT_CREDENTIALS_DIR = "files/auth"
+DEFAULT_PROBE_WORKERS = 8
+PROBE_TIMEOUT_SEC = 10
+PROBE_BASE_URL = "https://music.youtube.com"
+PROBE_PATH = "/youtubei/v1/browse"
+# personal page, so it's answered with 401 for expired session
+PROBE_PAYLOAD = {"browseId": "FEmusic_library_landing"}
+HTTP_OK = 200
+HTTP_UNAUTHORIZED = 401
+
+
+@dataclass(slots=True)
+class AuthFile:
+    path: Path
+    mtime_ns: int
+    size: int
+    content_hash: str
+    raw_curl_content: list[str]
+    # None if file isn't valid curl request
+    credentials: credentials.Credentials | None
+    # result of probe request (None if account isn't checked yet)
+    is_valid: bool | None = None
+
+
+class CredentialsStore:
+    """Auth files of dir indexed by path, mtime and content hash.
+
+    `rescan` re-reads only files with changed mtime or size and re-parses
+    only files with changed content, so it's cheap to call it often.
+    """
+
+    def __init__(self, dir_path: str | Path = DEFAULT_CREDENTIALS_DIR) -> None:
+        if isinstance(dir_path, str) and "\\" in dir_path:
+            dir_path = dir_path.replace("\\", "/")
+        self.dir_path = Path(dir_path)
+        self._files: dict[str, AuthFile] = {}
+        self._lock = threading.Lock()
+        self.rescan()
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def rescan(self) -> set[str]:
+        """Update index of dir files.
+
+        Returns
+        -------
+            set[str]: names of added, changed and removed files
+
+        """
+        paths = {
+            path.name: path
+            for path in (
+                self.dir_path.glob("*") if self.dir_path.is_dir() else ()
+            )
+            if path.is_file()
+        }
+        changed_names = set()
+        with self._lock:
+            for name in self._files.keys() - paths.keys():
+                del self._files[name]
+                changed_names.add(name)
+            for name, path in paths.items():
+                if self._scan_file(name, path):
+                    changed_names.add(name)
+        return changed_names
+
+    def _scan_file(self, name: str, path: Path) -> bool:
+        try:
+            return self._update_file(name, path)
+        except OSError:
+            # file is removed or locked while scanning
+            return self._files.pop(name, None) is not None
+
+    def _update_file(self, name: str, path: Path) -> bool:
+        stat = path.stat()
+        indexed = self._files.get(name)
+        if indexed is not None and (indexed.mtime_ns, indexed.size) == (
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            return False
+        content = path.read_bytes()
+        content_hash = hashlib.sha256(content).hexdigest()
+        if indexed is not None and indexed.content_hash == content_hash:
+            # file is touched, but content (and parsed data) is the same
+            indexed.mtime_ns = stat.st_mtime_ns
+            return False
+        try:
+            # same lines as text mode `readlines` (universal newlines)
+            raw_curl_content = io.StringIO(
+                content.decode("utf-8"),
+                newline=None,
+            ).readlines()
+            parsed_credentials = credentials.parse_curl_request(
+                raw_curl_content,
+            )
+        except UnicodeDecodeError:
+            raw_curl_content, parsed_credentials = [], None
+        except custom_exceptions.CredentialsDataError:
+            parsed_credentials = None
+        self._files[name] = AuthFile(
+            path=path,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            content_hash=content_hash,
+            raw_curl_content=raw_curl_content,
+            credentials=parsed_credentials,
+        )
+        return True
+
+    def names(self) -> list[str]:
+        """Return names of files with valid curl request (sorted)."""
+        return sorted(
+            name
+            for name, auth_file in self._files.items()
+            if auth_file.credentials is not None
+        )
+
+    def get(self, name: str) -> AuthFile | None:
+        return self._files.get(name)
+
+    def get_credentials(self, name: str) -> credentials.Credentials:
+        """Return parsed credentials of file (parsed once per content).
+
+        Raises
+        ------
+            CredentialsDataError: file isn't indexed or it isn't curl request
+
+        """
+        auth_file = self._files.get(name)
+        if auth_file is None or auth_file.credentials is None:
+            msg = f"Auth file {name!r} not found or it's not valid"
+            raise custom_exceptions.CredentialsDataError(msg)
+        return auth_file.credentials
+
+    def valid_accounts(self) -> dict[str, credentials.Credentials]:
+        """Return {name: credentials} except ones rejected by probe."""
+        return {
+            name: auth_file.credentials
+            for name, auth_file in sorted(self._files.items())
+            if auth_file.credentials is not None
+            and auth_file.is_valid is not False
+        }
+
+    def validate(
+        self,
+        base_url: str = PROBE_BASE_URL,
+        workers: int = DEFAULT_PROBE_WORKERS,
+        *,
+        recheck: bool = False,
+    ) -> dict[str, bool | None]:
+        """Check accounts by concurrent probe requests.
+
+        Only accounts which aren't checked since their file was changed
+        are probed (all of them with `recheck`).
+
+        Args:
+        ----
+            base_url (str, optional): scheme and host of API.\
+                Defaults PROBE_BASE_URL.
+            workers (int, optional): number of probes at the same time.\
+                Defaults DEFAULT_PROBE_WORKERS.
+            recheck (bool, optional): probe already checked accounts too.\
+                Defaults False.
+
+        Returns:
+        -------
+            dict[str, bool | None]: {name: is_valid} of probed accounts\
+                (None if probe failed by network or server error)
+
+        """
+        with self._lock:
+            unchecked = [
+                auth_file
+                for auth_file in self._files.values()
+                if auth_file.credentials is not None
+                and (recheck or auth_file.is_valid is None)
+            ]
+        if not unchecked:
+            return {}
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(unchecked)),
+            thread_name_prefix="probe_account",
+        ) as executor:
+            results = list(
+                executor.map(
+                    lambda auth_file: probe_account(
+                        auth_file.credentials,
+                        base_url,
+                    ),
+                    unchecked,
+                ),
+            )
+        for auth_file, is_valid in zip(unchecked, results, strict=True):
+            auth_file.is_valid = is_valid
+        return {
+            auth_file.path.name: is_valid
+            for auth_file, is_valid in zip(unchecked, results, strict=True)
+        }
+
+
+def probe_account(
+    account_credentials: credentials.Credentials,
+    base_url: str = PROBE_BASE_URL,
+) -> bool | None:
+    """Send cheap personal request with credentials.
+
+    Args:
+    ----
+        account_credentials (credentials.Credentials): checked account
+        base_url (str, optional): scheme and host of API.\
+            Defaults PROBE_BASE_URL.
+
+    Returns:
+    -------
+        bool | None: True if request succeeded, False on 401 and None if\
+            validity is unknown (network or server error)
+
+    """
+    try:
+        with requests.Session(impersonate="chrome") as session:
+            response = session.post(
+                f"{base_url.rstrip('/')}{PROBE_PATH}",
+                timeout=PROBE_TIMEOUT_SEC,
+                headers=account_credentials.headers,
+                params=account_credentials.params,
+                json=account_credentials.json_data | PROBE_PAYLOAD,
+            )
+    except requests.RequestsError:
+        return None
+    if response.status_code == HTTP_OK:
+        return True
+    if response.status_code == HTTP_UNAUTHORIZED:
+        return False
+    return None
@@ -21,6 +21,23 @@ class CredentialsDataError(Exception):
     """Error loading authdata."""
 
 
+class ThrottledError(Exception):
+    """Server throttled request (429 or 503 response)."""
+
+    def __init__(self, msg: str, retry_after_sec: float | None = None) -> None:
+        super().__init__(msg)
+        # delay from Retry-After header (None if server didn't send it)
+        self.retry_after_sec = retry_after_sec
+
+
+class AccountUnavailableError(ThrottledError):
+    """Account of session pool rejected request (it's out of rotation)."""
+
+
+class ContentUnavailableError(Exception):
+    """Content isn't available for account (403 or 404 response)."""
+
+
 class DumpAuthFileError(Exception):
     """Curl file content not found."""
 
@@ -0,0 +1,241 @@
+"""Journal of download queue (playlists, their tracks and track states)."""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Literal
+
+from ytm_browser.core import responses
+
+DEFAULT_QUEUE_FILE = "files/download_queue.sqlite"
+TrackState = Literal["pending", "fetching", "transcoding", "done", "failed"]
+PENDING: TrackState = "pending"
+FETCHING: TrackState = "fetching"
+TRANSCODING: TrackState = "transcoding"
+DONE: TrackState = "done"
+FAILED: TrackState = "failed"
+
+
+class DownloadQueueStore:
+    """Persistent queue of playlists with state of each track.
+
+    Every change is committed to SQLite (WAL journal) at once, so after
+    crash or kill the queue is reloaded as it was: playlists which aren't
+    finished, their resolved tracks and the last state of each track.
+    Tracks with `DONE` state aren't downloaded again, other ones are
+    resumed. Safe to use from threads.
+    """
+
+    def __init__(self, queue_file: str | Path = DEFAULT_QUEUE_FILE) -> None:
+        self._lock = threading.Lock()
+        Path(queue_file).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            queue_file,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._connection.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS playlists (
+                playlist_key TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                -- tracks of playlist are recorded (it's resolved)
+                is_resolved INTEGER NOT NULL DEFAULT 0,
+                added_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tracks (
+                playlist_key TEXT NOT NULL,
+                video_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                artist TEXT NOT NULL,
+                title TEXT NOT NULL,
+                lenght TEXT NOT NULL,
+                state TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (playlist_key, video_id)
+            );
+            CREATE INDEX IF NOT EXISTS tracks_video_id ON tracks (video_id);
+            """,
+        )
+
+    def __contains__(self, playlist_key: object) -> bool:
+        with self._lock:
+            return (
+                self._connection.execute(
+                    "SELECT 1 FROM playlists WHERE playlist_key = ?",
+                    (playlist_key,),
+                ).fetchone()
+                is not None
+            )
+
+    def add_playlist(
+        self,
+        playlist_key: str,
+        playlist: responses.PlaylistResponse,
+    ) -> None:
+        """Record queued playlist (already queued one keeps its tracks)."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO playlists "
+                "(playlist_key, title, payload, added_at) VALUES (?, ?, ?, ?)",
+                (
+                    playlist_key,
+                    playlist.title,
+                    json.dumps(playlist.payload),
+                    time.time(),
+                ),
+            )
+
+    def set_tracks(
+        self,
+        playlist_key: str,
+        tracks: list[responses.TrackResponse],
+    ) -> None:
+        """Record resolved tracks of playlist as `PENDING`.
+
+        Already recorded tracks keep their state, so it's safe to call it
+        again for resumed playlist.
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO tracks VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        playlist_key,
+                        track.video_id,
+                        position,
+                        track.artist,
+                        track.title,
+                        track.lenght,
+                        PENDING,
+                        now,
+                    )
+                    for position, track in enumerate(tracks)
+                ),
+            )
+            self._connection.execute(
+                "UPDATE playlists SET is_resolved = 1 WHERE playlist_key = ?",
+                (playlist_key,),
+            )
+
+    def set_state(
+        self,
+        playlist_key: str,
+        video_id: str,
+        state: TrackState,
+    ) -> None:
+        with self._lock:
+            self._connection.execute(
+                "UPDATE tracks SET state = ?, updated_at = ? "
+                "WHERE playlist_key = ? AND video_id = ?",
+                (state, time.time(), playlist_key, video_id),
+            )
+
+    def set_video_state(self, video_id: str, state: TrackState) -> None:
+        """Set state of unfinished track in all playlists.
+
+        Track of many playlists is downloaded once (see `DownloadEngine`),
+        so its download stages are recorded for all of them.
+        """
+        with self._lock:
+            self._connection.execute(
+                "UPDATE tracks SET state = ?, updated_at = ? "
+                "WHERE video_id = ? AND state != ?",
+                (state, time.time(), video_id, DONE),
+            )
+
+    def states(self, playlist_key: str) -> dict[str, TrackState]:
+        """Return {video_id: state} of playlist tracks."""
+        with self._lock:
+            return dict(
+                self._connection.execute(
+                    "SELECT video_id, state FROM tracks "
+                    "WHERE playlist_key = ?",
+                    (playlist_key,),
+                ),
+            )
+
+    def state_counts(self, playlist_key: str) -> Counter[TrackState]:
+        """Return number of playlist tracks in each state."""
+        return Counter(self.states(playlist_key).values())
+
+    def playlists(self) -> dict[str, responses.PlaylistResponse]:
+        """Return {playlist_key: playlist} of unfinished playlists.
+
+        Resolved playlists get recorded tracks as children (nothing is
+        requested), other ones load children as usual.
+        """
+        with self._lock:
+            playlist_rows = self._connection.execute(
+                "SELECT playlist_key, title, payload, is_resolved "
+                "FROM playlists ORDER BY added_at",
+            ).fetchall()
+            track_rows = self._connection.execute(
+                "SELECT playlist_key, video_id, artist, title, lenght, state "
+                "FROM tracks ORDER BY playlist_key, position",
+            ).fetchall()
+        tracks: dict[str, list[responses.TrackResponse]] = {}
+        unfinished_keys = set()
+        for playlist_key, *track_fields, state in track_rows:
+            tracks.setdefault(playlist_key, []).append(
+                responses.TrackResponse.from_fields(*track_fields),
+            )
+            if state != DONE:
+                unfinished_keys.add(playlist_key)
+        return {
+            playlist_key: responses.PlaylistResponse.from_payload(
+                title,
+                json.loads(payload),
+                tracks.get(playlist_key, []) if is_resolved else None,
+            )
+            for playlist_key, title, payload, is_resolved in playlist_rows
+            if not is_resolved or playlist_key in unfinished_keys
+        }
+
+    def remove_playlist(self, playlist_key: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")
+            self._connection.execute(
+                "DELETE FROM tracks WHERE playlist_key = ?",
+                (playlist_key,),
+            )
+            self._connection.execute(
+                "DELETE FROM playlists WHERE playlist_key = ?",
+                (playlist_key,),
+            )
+
+    def remove_finished(self) -> int:
+        """Remove playlists with all tracks done.
+
+        Returns
+        -------
+            int: number of removed playlists
+
+        """
+        with self._lock:
+            finished_keys = [
+                playlist_key
+                for (playlist_key,) in self._connection.execute(
+                    "SELECT playlist_key FROM playlists WHERE is_resolved = 1 "
+                    "AND NOT EXISTS (SELECT 1 FROM tracks WHERE "
+                    "tracks.playlist_key = playlists.playlist_key "
+                    "AND state != ?)",
+                    (DONE,),
+                )
+            ]
+        for playlist_key in finished_keys:
+            self.remove_playlist(playlist_key)
+        return len(finished_keys)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
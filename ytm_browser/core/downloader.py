@@ -1,38 +1,107 @@
 """Playlist download module."""
 
+import functools
+import importlib
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+import threading
+from collections.abc import Callable
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from contextlib import suppress
+from dataclasses import dataclass
 from pathlib import Path
+from types import ModuleType
+from typing import Any, Literal
 
-import yt_dlp
-
-from ytm_browser.core import responses
+from utils import pipeline
+from ytm_browser.core import (
+    archive,
+    audio_profiles,
+    cover_cache,
+    download_queue,
+    responses,
+)
 
 DEFAULT_SAVE_DIR = "files/music"
+DEFAULT_WORKERS = 4
+# ffmpeg encodes are CPU-bound, one process per core
+DEFAULT_TRANSCODE_WORKERS = os.cpu_count() or 1
+# max number of tracks waiting between two stages of download pipeline
+DEFAULT_STAGE_QUEUE_SIZE = 8
+# ioctl request of reflink (copy-on-write clone) on Linux
+FICLONE = 0x40049409
 # FILE_TEMPLATE = '%(artist)s - %(title)s.%(ext)s'
 # FILE_TEMPLATE = '%(title)s.%(ext)s'
 FILE_TEMPLATE = "%(uploader)s - %(title)s.%(ext)s"
+# path separators, reserved characters of Windows and control characters
+UNSAFE_DIRNAME_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+WINDOWS_RESERVED_NAMES = frozenset(
+    {"CON", "PRN", "AUX", "NUL"}
+    | {f"{name}{index}" for name in ("COM", "LPT") for index in range(1, 10)},
+)
 
+logger = logging.getLogger(__name__)
 
-def download_playlist(
-    playlist: responses.PlaylistResponse,
-    target_dir: Path | str | None = None,
-) -> None:
-    """Download tracks from playlist.
 
-    Args:
-    ----
-        playlist (Playlist): Playlist object
-        target_dir (Path | str | None, optional): Dir to download music(USE '/' in path).\
-            Defaults DEFAULT_SAVE_DIR(`files/music`).
+@dataclass
+class PlaylistProgress:
+    total: int = 0
+    done: int = 0
+    failed: int = 0
+    skipped: int = 0
+    linked: int = 0
+
+    @property
+    def finished(self) -> bool:
+        return (
+            self.done + self.failed + self.skipped + self.linked >= self.total
+        )
+
+    def __str__(self) -> str:
+        progress = f"{self.done + self.skipped + self.linked}/{self.total}"
+        details = ", ".join(
+            f"{counter} {value}"
+            for counter, value in (
+                ("linked", self.linked),
+                ("skipped", self.skipped),
+                ("failed", self.failed),
+            )
+            if value
+        )
+        if details:
+            progress = f"{progress} ({details})"
+        return f"{'done' if self.finished else 'download'} {progress}"
 
-    Raises:
-    ------
-        ValueError: _description_
-        ValueError: _description_
 
+@functools.cache
+def load_yt_dlp() -> ModuleType:
+    """Import yt_dlp on first download (its extractors registry is large).
+
+    Call it in background thread to warm import before download starts.
     """
-    ydl_opts = {
-        "format": "251",
-        "outtmpl": f"{DEFAULT_SAVE_DIR}/{FILE_TEMPLATE}",
+    return importlib.import_module("yt_dlp")
+
+
+def _ydl_options(
+    target_dir: Path | str,
+    profile: audio_profiles.AudioProfile,
+    write_thumbnail: bool = True,  # noqa: FBT001, FBT002
+) -> dict:
+    # postprocessing is done by separate stages (see `TrackJob`)
+    return {
+        # `.part` file of interrupted download is continued, already
+        # fetched (not transcoded) file isn't downloaded again
+        "continuedl": True,
+        "format": profile.format_id,
+        "outtmpl": f"{target_dir}/{FILE_TEMPLATE}",
         "add-metadata": True,
         "embed-metadata": True,
         "extract-audio": True,
@@ -40,44 +109,608 @@ def download_playlist(
         "retries": 35,
         "quality": "0",
         "cover_format": "jpg",
-        "writethumbnail": True,
+        "writethumbnail": write_thumbnail,
         "embedthumbnail": True,
         "windowsfilenames": True,
         "restrict-filenames": True,
-        # TODO: add archive file support: 'download_archive': 'archive.txt',
-        "postprocessors": [
-            {
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "mp3",
-                "preferredquality": 0,
-            },
-            {"key": "EmbedThumbnail"},
-            {
-                "key": "FFmpegMetadata",
-                "add_metadata": True,
-            },
+    }
+
+
+@dataclass
+class TrackJob:
+    """Track which passes download stages.
+
+    extract (format info) -> fetch (audio and thumbnail files) ->
+    transcode (encode or remux by profile) -> tag (embed thumbnail and
+    metadata)
+    """
+
+    track: responses.TrackResponse
+    target_dir: Path
+    profile: audio_profiles.AudioProfile = audio_profiles.PROFILES[
+        audio_profiles.DEFAULT_PROFILE
+    ]
+    # shared covers (None is thumbnail download per track)
+    covers: cover_cache.CoverCache | None = None
+    # yt_dlp info of requested format (of downloaded file after fetch)
+    info: dict | None = None
+    path: Path | None = None
+
+
+def extract_track(job: TrackJob) -> TrackJob:
+    """Extract info of track format without downloading (network stage)."""
+    with load_yt_dlp().YoutubeDL(
+        _ydl_options(job.target_dir, job.profile),
+    ) as ydl:
+        job.info = ydl.extract_info(
+            f"https://www.youtube.com/watch?v={job.track.video_id}",
+            download=False,
+        )
+    return job
+
+
+def fetch_track(job: TrackJob) -> TrackJob:
+    """Download audio and thumbnail of extracted info (network stage).
+
+    With cover cache thumbnail is copied from cache, it's fetched and
+    converted only once per cover.
+    """
+    with load_yt_dlp().YoutubeDL(
+        _ydl_options(
+            job.target_dir,
+            job.profile,
+            write_thumbnail=job.covers is None,
+        ),
+    ) as ydl:
+        processed_info = ydl.process_ie_result(job.info, download=True)
+        # downloaded file fields over track info (title, artist, thumbnail)
+        job.info = {
+            **processed_info,
+            **processed_info["requested_downloads"][0],
+        }
+        job.path = Path(job.info["filepath"])
+        if job.covers is not None and job.info.get("thumbnail"):
+            cover_path = job.covers.copy_cover(
+                job.info["thumbnail"],
+                fetch=lambda url: ydl.urlopen(url).read(),
+                target=job.path.with_suffix(f".{cover_cache.COVER_FORMAT}"),
+            )
+            # the only thumbnail with file, it's embedded by tag stage
+            job.info["thumbnails"] = [
+                {"url": job.info["thumbnail"], "filepath": str(cover_path)},
+            ]
+    return job
+
+
+def transcode_audio(
+    source: str,
+    extension: str,
+    codec_args: tuple[str, ...],
+) -> str:
+    """Encode or remux audio file to `extension` container.
+
+    Encoding is CPU-bound, so it's run in worker process and arguments
+    are plain picklable values. File which already has `extension` and
+    is returned as is.
+
+    Args:
+    ----
+        source (str): downloaded audio file (it's removed after encoding)
+        extension (str): extension of output file
+        codec_args (tuple[str, ...]): ffmpeg output codec arguments
+
+    Returns:
+    -------
+        str: path of output file
+
+    """
+    target = Path(source).with_suffix(f".{extension}")
+    if target == Path(source):
+        # stream is already in output container (e.g. m4a passthrough)
+        return source
+    subprocess.run(
+        [  # noqa: S603, S607
+            "ffmpeg",
+            "-y",
+            "-loglevel",
+            "error",
+            "-i",
+            source,
+            "-vn",
+            *codec_args,
+            str(target),
         ],
+        check=True,
+        capture_output=True,
+    )
+    Path(source).unlink()
+    return str(target)
+
+
+def tag_track(job: TrackJob) -> Path:
+    """Embed thumbnail and metadata to transcoded file (ffmpeg remux stage).
+
+    Returns
+    -------
+        Path: path of tagged audio file
+
+    """
+    yt_dlp = load_yt_dlp()
+    info = job.info | {
+        "filepath": str(job.path),
+        "ext": job.path.suffix.lstrip("."),
     }
+    with yt_dlp.YoutubeDL(_ydl_options(job.target_dir, job.profile)) as ydl:
+        for postprocessor in (
+            yt_dlp.postprocessor.EmbedThumbnailPP(ydl),
+            yt_dlp.postprocessor.FFmpegMetadataPP(ydl, add_metadata=True),
+        ):
+            info = ydl.run_pp(postprocessor, info)
+    return Path(info["filepath"])
+
+
+def _normalize_target_dir(target_dir: Path | str | None) -> Path:
     match target_dir:
         case str() | Path():
-            target_dir = Path(target_dir)
+            return Path(target_dir)
         case None:
-            target_dir = DEFAULT_SAVE_DIR
+            return Path(DEFAULT_SAVE_DIR)
         case _:
             msg = "wrong `target_dir` value"
             raise ValueError(msg)
-    if isinstance(playlist, responses.PlaylistResponse):
-        target_dir_with_playlist = Path(target_dir, playlist.title)
-        target_dir_with_playlist.mkdir(parents=True, exist_ok=True)
-        # TODO: Normalize playlist title for well dirname
-        ydl_opts["outtmpl"] = f"{target_dir_with_playlist}/{FILE_TEMPLATE}"
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download(
-                [
-                    f"https://www.youtube.com/watch?v={track.video_id}"
-                    for track in playlist.children
-                ],
-            )
-    else:
+
+
+def playlist_dirname(title: str) -> str:
+    """Make dir name of playlist title (it's valid on Windows too).
+
+    Path separators and reserved characters are replaced by "_", trailing
+    dots and spaces are stripped.
+    """
+    dirname = UNSAFE_DIRNAME_CHARS.sub("_", title).strip().rstrip(". ")
+    if not dirname or dirname.upper() in WINDOWS_RESERVED_NAMES:
+        return f"_{dirname}"
+    return dirname
+
+
+def playlist_dir(
+    playlist: responses.PlaylistResponse,
+    target_dir: Path | str | None = None,
+) -> Path:
+    """Return (and create) dir of playlist tracks."""
+    if not isinstance(playlist, responses.PlaylistResponse):
         msg = "bad format for `playlist` object"
         raise ValueError(msg)
+    target_dir_with_playlist = Path(
+        _normalize_target_dir(target_dir),
+        playlist_dirname(playlist.title),
+    )
+    target_dir_with_playlist.mkdir(parents=True, exist_ok=True)
+    return target_dir_with_playlist
+
+
+def download_track(
+    track: responses.TrackResponse,
+    target_dir: Path | str,
+    profile: audio_profiles.AudioProfile
+    | str = audio_profiles.DEFAULT_PROFILE,
+    covers: cover_cache.CoverCache | None = None,
+) -> Path:
+    """Download single track to `target_dir` (it's safe to call in threads).
+
+    Args:
+    ----
+        track (responses.TrackResponse): Track object
+        target_dir (Path | str): Dir to download track
+        profile (audio_profiles.AudioProfile | str, optional): output\
+            profile or its name. Defaults audio_profiles.DEFAULT_PROFILE.
+        covers (cover_cache.CoverCache | None, optional): cache of\
+            converted covers. Defaults None (thumbnail of each track).
+
+    Returns:
+    -------
+        Path: path of audio file after postprocessing
+
+    """
+    job = fetch_track(
+        extract_track(
+            TrackJob(
+                track,
+                Path(target_dir),
+                audio_profiles.get_profile(profile),
+                covers,
+            ),
+        ),
+    )
+    job.path = Path(
+        transcode_audio(
+            str(job.path),
+            job.profile.extension,
+            job.profile.codec_args,
+        ),
+    )
+    return tag_track(job)
+
+
+def materialize_track(source: Path, target_dir: Path) -> Path:
+    """Place existing track file to `target_dir` without downloading it.
+
+    Try hardlink, then reflink, then fallback to copy of file.
+
+    Args:
+    ----
+        source (Path): already downloaded track
+        target_dir (Path): dir of other playlist
+
+    Returns:
+    -------
+        Path: path of track in `target_dir`
+
+    """
+    target = Path(target_dir, source.name)
+    if target.exists():
+        return target
+    with suppress(OSError):
+        os.link(source, target)
+        return target
+    with suppress(OSError, ImportError):
+        import fcntl  # only unix has reflinks
+
+        with source.open("rb") as source_fs, target.open("wb") as target_fs:
+            fcntl.ioctl(target_fs.fileno(), FICLONE, source_fs.fileno())
+        return target
+    target.unlink(missing_ok=True)
+    shutil.copy2(source, target)
+    return target
+
+
+class DownloadEngine:
+    """Download tracks of many playlists on one shared pipeline.
+
+    Tracks pass extract, fetch, transcode and tag stages (see `TrackJob`)
+    with bounded queues between them. Network stages run on `workers`
+    threads, re-encoding (e.g. to mp3) runs on pool of
+    `transcode_workers` processes, so transfers of next tracks overlap
+    with encoding of previous ones. Passthrough profiles (stream copy)
+    are remuxed in threads, they don't need CPU pool.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        target_dir: Path | str | None = None,
+        workers: int = DEFAULT_WORKERS,
+        on_progress: Callable[[str, PlaylistProgress], None] | None = None,
+        download_archive: archive.DownloadArchive | None = None,
+        transcode_workers: int = DEFAULT_TRANSCODE_WORKERS,
+        stage_queue_size: int = DEFAULT_STAGE_QUEUE_SIZE,
+        profile: audio_profiles.AudioProfile
+        | str = audio_profiles.DEFAULT_PROFILE,
+        covers: cover_cache.CoverCache | None = None,
+        queue_store: download_queue.DownloadQueueStore | None = None,
+    ) -> None:
+        """Create engine.
+
+        Args:
+        ----
+            target_dir (Path | str | None, optional): Dir to download music\
+                (USE '/' in path). Defaults DEFAULT_SAVE_DIR(`files/music`).
+            workers (int, optional): number of threads of each network\
+                stage. Defaults DEFAULT_WORKERS.
+            on_progress (Callable | None, optional): called with playlist\
+                key and its PlaylistProgress after each finished track\
+                (from worker threads). Defaults None.
+            download_archive (archive.DownloadArchive | None, optional):\
+                index of downloaded tracks, archived tracks are skipped\
+                (or linked to other playlist dir). Defaults None.
+            transcode_workers (int, optional): number of encoding\
+                processes. Defaults DEFAULT_TRANSCODE_WORKERS (cores).
+            stage_queue_size (int, optional): max number of tracks\
+                waiting between stages. Defaults DEFAULT_STAGE_QUEUE_SIZE.
+            profile (audio_profiles.AudioProfile | str, optional): output\
+                profile or its name. Defaults audio_profiles.DEFAULT_PROFILE.
+            covers (cover_cache.CoverCache | None, optional): cache of\
+                converted covers, tracks of one album share the cover\
+                file. Defaults None (thumbnail of each track).
+            queue_store (download_queue.DownloadQueueStore | None, optional):\
+                journal of playlists and track states, tracks which are\
+                done there are skipped (resume after crash). Defaults None.
+
+        """
+        self.target_dir = _normalize_target_dir(target_dir)
+        self.workers = workers
+        self.transcode_workers = transcode_workers
+        self.stage_queue_size = stage_queue_size
+        self.profile = audio_profiles.get_profile(profile)
+        self.covers = covers
+        self.queue_store = queue_store
+        self.on_progress = on_progress
+        self.download_archive = download_archive
+        self.progress: dict[str, PlaylistProgress] = {}
+        self._downloads: dict[str, Future[Path]] = {}
+        self._lock = threading.Lock()
+
+    def download(
+        self,
+        playlists: dict[str, responses.PlaylistResponse],
+    ) -> dict[str, PlaylistProgress]:
+        """Download all tracks of playlists, each to its playlist dir.
+
+        Args:
+        ----
+            playlists (dict[str, responses.PlaylistResponse]):\
+                {playlist_key: playlist}
+
+        Returns:
+        -------
+            dict[str, PlaylistProgress]: {playlist_key: progress}
+
+        """
+        with (
+            # spawned workers don't inherit locks of running threads
+            ProcessPoolExecutor(
+                max_workers=self.transcode_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as transcode_pool,
+            pipeline.Pipeline(
+                self._stages(transcode_pool),
+                queue_size=self.stage_queue_size,
+            ) as track_pipeline,
+            ThreadPoolExecutor(max_workers=self.workers) as executor,
+        ):
+            for playlist_key, playlist in playlists.items():
+                tracks_dir = playlist_dir(playlist, self.target_dir)
+                tracks = [
+                    track
+                    for track in playlist.children
+                    if isinstance(track, responses.TrackResponse)
+                ]
+                self.progress[playlist_key] = PlaylistProgress(
+                    total=len(tracks),
+                )
+                self._notify(playlist_key)
+                track_states = self._journal_playlist(
+                    playlist_key,
+                    playlist,
+                    tracks,
+                )
+                for track in tracks:
+                    if track_states.get(track.video_id) == download_queue.DONE:
+                        self._update_progress(
+                            playlist_key,
+                            "skipped",
+                            track.video_id,
+                        )
+                        continue
+                    self._schedule_track(
+                        executor,
+                        track_pipeline,
+                        playlist_key,
+                        track,
+                        tracks_dir,
+                    )
+        return self.progress
+
+    def _journal_playlist(
+        self,
+        playlist_key: str,
+        playlist: responses.PlaylistResponse,
+        tracks: list[responses.TrackResponse],
+    ) -> dict[str, download_queue.TrackState]:
+        if self.queue_store is None:
+            return {}
+        self.queue_store.add_playlist(playlist_key, playlist)
+        self.queue_store.set_tracks(playlist_key, tracks)
+        return self.queue_store.states(playlist_key)
+
+    def _stages(
+        self,
+        transcode_pool: ProcessPoolExecutor,
+    ) -> list[pipeline.Stage]:
+        def transcode(job: TrackJob) -> TrackJob:
+            transcode_args = (
+                str(job.path),
+                job.profile.extension,
+                job.profile.codec_args,
+            )
+            if job.profile.is_passthrough:
+                job.path = Path(transcode_audio(*transcode_args))
+            else:
+                job.path = Path(
+                    transcode_pool.submit(
+                        transcode_audio,
+                        *transcode_args,
+                    ).result(),
+                )
+            return job
+
+        def journaled(
+            state: download_queue.TrackState,
+            stage_func: Callable[[TrackJob], Any],
+        ) -> Callable[[TrackJob], Any]:
+            if self.queue_store is None:
+                return stage_func
+
+            def journaled_stage(job: TrackJob) -> Any:  # noqa: ANN401
+                self.queue_store.set_video_state(job.track.video_id, state)
+                return stage_func(job)
+
+            return journaled_stage
+
+        return [
+            pipeline.Stage(
+                "extract",
+                journaled(download_queue.FETCHING, extract_track),
+                self.workers,
+            ),
+            pipeline.Stage("fetch", fetch_track, self.workers),
+            pipeline.Stage(
+                "transcode",
+                journaled(download_queue.TRANSCODING, transcode),
+                self.transcode_workers,
+            ),
+            pipeline.Stage("tag", tag_track, self.workers),
+        ]
+
+    def _schedule_track(  # noqa: PLR0913
+        self,
+        executor: ThreadPoolExecutor,
+        track_pipeline: pipeline.Pipeline,
+        playlist_key: str,
+        track: responses.TrackResponse,
+        tracks_dir: Path,
+    ) -> None:
+        # each unique track is downloaded once, other playlists get a link
+        if (archived_path := self._archived_path(track)) is not None:
+            if archived_path.parent.resolve() == tracks_dir.resolve():
+                self._update_progress(playlist_key, "skipped", track.video_id)
+            else:
+                executor.submit(
+                    self._link_track,
+                    playlist_key,
+                    track.video_id,
+                    archived_path,
+                    tracks_dir,
+                )
+        elif (
+            first_download := self._downloads.get(track.video_id)
+        ) is not None:
+            first_download.add_done_callback(
+                functools.partial(
+                    self._link_downloaded_track,
+                    playlist_key,
+                    track.video_id,
+                    tracks_dir,
+                ),
+            )
+        else:
+            track_download = track_pipeline.submit(
+                TrackJob(
+                    track=track,
+                    target_dir=tracks_dir,
+                    profile=self.profile,
+                    covers=self.covers,
+                ),
+            )
+            self._downloads[track.video_id] = track_download
+            track_download.add_done_callback(
+                functools.partial(
+                    self._finish_track_download,
+                    playlist_key,
+                    track,
+                ),
+            )
+
+    def _finish_track_download(
+        self,
+        playlist_key: str,
+        track: responses.TrackResponse,
+        track_download: Future[Path],
+    ) -> None:
+        try:
+            track_path = track_download.result()
+        # any stage error (yt_dlp, ffmpeg, mutagen of embedding) fails
+        # the track only, download of other tracks goes on
+        except Exception:
+            logger.exception("Download of %s failed", track.video_id)
+            self._update_progress(playlist_key, "failed", track.video_id)
+            return
+        if self.download_archive is not None:
+            self.download_archive.add(
+                video_id=track.video_id,
+                path=track_path,
+                audio_format=track_path.suffix.lstrip("."),
+                profile=self.profile.name,
+            )
+        self._update_progress(playlist_key, "done", track.video_id)
+
+    def _link_downloaded_track(
+        self,
+        playlist_key: str,
+        video_id: str,
+        tracks_dir: Path,
+        track_download: Future[Path],
+    ) -> None:
+        try:
+            track_path = track_download.result()
+        except Exception:  # noqa: BLE001
+            # the error is logged by `_finish_track_download`
+            self._update_progress(playlist_key, "failed", video_id)
+            return
+        self._link_track(playlist_key, video_id, track_path, tracks_dir)
+
+    def _link_track(
+        self,
+        playlist_key: str,
+        video_id: str,
+        track_path: Path,
+        tracks_dir: Path,
+    ) -> None:
+        try:
+            materialize_track(source=track_path, target_dir=tracks_dir)
+        except OSError:
+            self._update_progress(playlist_key, "failed", video_id)
+        else:
+            self._update_progress(playlist_key, "linked", video_id)
+
+    def _archived_path(self, track: responses.TrackResponse) -> Path | None:
+        if self.download_archive is None:
+            return None
+        return self.download_archive.existing_path(
+            track.video_id,
+            self.profile.name,
+        )
+
+    def _update_progress(
+        self,
+        playlist_key: str,
+        counter: Literal["done", "failed", "skipped", "linked"],
+        video_id: str,
+    ) -> None:
+        if self.queue_store is not None:
+            self.queue_store.set_state(
+                playlist_key,
+                video_id,
+                download_queue.FAILED
+                if counter == "failed"
+                else download_queue.DONE,
+            )
+        with self._lock:
+            progress = self.progress[playlist_key]
+            setattr(progress, counter, getattr(progress, counter) + 1)
+        self._notify(playlist_key)
+
+    def _notify(self, playlist_key: str) -> None:
+        if self.on_progress is not None:
+            self.on_progress(playlist_key, self.progress[playlist_key])
+
+
+def download_playlist(
+    playlist: responses.PlaylistResponse,
+    target_dir: Path | str | None = None,
+    workers: int = DEFAULT_WORKERS,
+    profile: audio_profiles.AudioProfile
+    | str = audio_profiles.DEFAULT_PROFILE,
+) -> None:
+    """Download tracks from playlist.
+
+    Args:
+    ----
+        playlist (Playlist): Playlist object
+        target_dir (Path | str | None, optional): Dir to download music(USE '/' in path).\
+            Defaults DEFAULT_SAVE_DIR(`files/music`).
+        workers (int, optional): number of concurrent track downloads.\
+            Defaults DEFAULT_WORKERS.
+        profile (audio_profiles.AudioProfile | str, optional): output\
+            profile or its name. Defaults audio_profiles.DEFAULT_PROFILE.
+
+    Raises:
+    ------
+        ValueError: wrong `target_dir` value
+        ValueError: bad format for `playlist` object
+        ValueError: unknown profile name
+
+    """
+    DownloadEngine(
+        target_dir=target_dir,
+        workers=workers,
+        profile=profile,
+    ).download({str(playlist): playlist})
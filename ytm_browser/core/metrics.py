@@ -0,0 +1,199 @@
+"""Request-level metrics of API clients (counters and histograms)."""
+
+import bisect
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# upper bounds of histogram buckets (the last bucket is +Inf)
+LATENCY_BUCKETS_SEC = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DECODE_BUCKETS_SEC = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5)
+SIZE_BUCKETS_BYTES = (1e3, 1e4, 1e5, 1e6, 1e7)
+PROMETHEUS_PREFIX = "ytm_client"
+
+
+def endpoint_name(url: str) -> str:
+    """Return endpoint label of request url (`browse`, `get_queue`)."""
+    return url.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+
+
+@dataclass
+class Histogram:
+    buckets: tuple[float, ...]
+    counts: list[int] = field(init=False)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "buckets": dict(
+                zip((*self.buckets, float("inf")), self.counts, strict=True),
+            ),
+            "sum": self.total,
+            "count": self.count,
+        }
+
+
+@dataclass
+class EndpointMetrics:
+    requests: int = 0
+    cache_hits: int = 0
+    # requests which weren't sent, they waited identical one in flight
+    coalesced: int = 0
+    retries: int = 0
+    status_codes: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    latency_sec: Histogram = field(
+        default_factory=lambda: Histogram(LATENCY_BUCKETS_SEC),
+    )
+    decode_sec: Histogram = field(
+        default_factory=lambda: Histogram(DECODE_BUCKETS_SEC),
+    )
+    response_bytes: Histogram = field(
+        default_factory=lambda: Histogram(SIZE_BUCKETS_BYTES),
+    )
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "retries": self.retries,
+            "status_codes": dict(self.status_codes),
+            "errors": dict(self.errors),
+            "latency_sec": self.latency_sec.snapshot(),
+            "decode_sec": self.decode_sec.snapshot(),
+            "response_bytes": self.response_bytes.snapshot(),
+        }
+
+
+class RequestMetrics:
+    """Thread-safe per-endpoint metrics, shared by sync and async clients."""
+
+    def __init__(self) -> None:
+        self._endpoints: dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def observe_response(  # noqa: PLR0913
+        self,
+        endpoint: str,
+        status_code: int,
+        latency_sec: float,
+        response_bytes: int = 0,
+        decode_sec: float | None = None,
+    ) -> None:
+        """Record finished HTTP request (any status code)."""
+        with self._lock:
+            endpoint_metrics = self._get(endpoint)
+            endpoint_metrics.requests += 1
+            endpoint_metrics.status_codes[status_code] += 1
+            endpoint_metrics.latency_sec.observe(latency_sec)
+            endpoint_metrics.response_bytes.observe(response_bytes)
+            if decode_sec is not None:
+                endpoint_metrics.decode_sec.observe(decode_sec)
+
+    def count_cache_hit(self, endpoint: str) -> None:
+        with self._lock:
+            self._get(endpoint).cache_hits += 1
+
+    def count_coalesced(self, endpoint: str) -> None:
+        with self._lock:
+            self._get(endpoint).coalesced += 1
+
+    def count_retry(self, endpoint: str) -> None:
+        with self._lock:
+            self._get(endpoint).retries += 1
+
+    def count_error(self, endpoint: str, error: BaseException) -> None:
+        """Record request which failed without response (or its decoding)."""
+        with self._lock:
+            self._get(endpoint).errors[type(error).__name__] += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        """Return copy of metrics: {endpoint: metrics dict}."""
+        with self._lock:
+            return {
+                endpoint: endpoint_metrics.snapshot()
+                for endpoint, endpoint_metrics in self._endpoints.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def to_prometheus(self) -> str:
+        """Return metrics in Prometheus text exposition format."""
+        lines = []
+        snapshot = self.snapshot()
+        for name, metric_type, key in (
+            ("requests_total", "counter", "requests"),
+            ("cache_hits_total", "counter", "cache_hits"),
+            ("coalesced_total", "counter", "coalesced"),
+            ("retries_total", "counter", "retries"),
+        ):
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} {metric_type}")
+            lines.extend(
+                f'{PROMETHEUS_PREFIX}_{name}{{endpoint="{endpoint}"}} '
+                f"{metrics[key]}"
+                for endpoint, metrics in snapshot.items()
+            )
+        for name, key, label in (
+            ("responses_total", "status_codes", "code"),
+            ("errors_total", "errors", "error"),
+        ):
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} counter")
+            lines.extend(
+                f'{PROMETHEUS_PREFIX}_{name}{{endpoint="{endpoint}",'
+                f'{label}="{value}"}} {count}'
+                for endpoint, metrics in snapshot.items()
+                for value, count in metrics[key].items()
+            )
+        for key in ("latency_sec", "decode_sec", "response_bytes"):
+            name = f"{PROMETHEUS_PREFIX}_{key}"
+            lines.append(f"# TYPE {name} histogram")
+            for endpoint, metrics in snapshot.items():
+                lines.extend(
+                    _prometheus_histogram(name, endpoint, metrics[key])
+                )
+        return "\n".join(lines) + "\n"
+
+    def dump_prometheus(self, metrics_file: str | Path) -> None:
+        """Write Prometheus text to file (atomically, for file scrapers)."""
+        metrics_file = Path(metrics_file)
+        metrics_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = metrics_file.with_suffix(f"{metrics_file.suffix}.tmp")
+        tmp_file.write_text(self.to_prometheus(), encoding="utf-8")
+        tmp_file.replace(metrics_file)
+
+    def _get(self, endpoint: str) -> EndpointMetrics:
+        if endpoint not in self._endpoints:
+            self._endpoints[endpoint] = EndpointMetrics()
+        return self._endpoints[endpoint]
+
+
+def _prometheus_histogram(name: str, endpoint: str, histogram: dict) -> list:
+    lines = []
+    cumulative_count = 0
+    for upper_bound, count in histogram["buckets"].items():
+        cumulative_count += count
+        bound = "+Inf" if upper_bound == float("inf") else f"{upper_bound:g}"
+        lines.append(
+            f'{name}_bucket{{endpoint="{endpoint}",le="{bound}"}} '
+            f"{cumulative_count}",
+        )
+    lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {histogram["sum"]}')
+    lines.append(f'{name}_count{{endpoint="{endpoint}"}} {histogram["count"]}')
+    return lines
+
+
+# metrics of all clients in process
+registry = RequestMetrics()
@@ -0,0 +1,213 @@
+"""Lazy paged sequence of response children."""
+
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from typing import overload
+
+# parsed children of page and payload of the next page (None on last page)
+Page = tuple[list, dict | None]
+DEFAULT_CONCURRENT_PAGES = 4
+
+
+class PagedChildren(Sequence):
+    """Children which are loaded page by page when they are accessed.
+
+    Pages are loaded by continuation payloads one after another. If all
+    page payloads are known after the first page (`page_payloads`), the
+    rest of pages are loaded by `fetch_many` in batches of
+    `concurrent_pages` payloads.
+
+    `len()` loads ALL pages (it's a request per page), use `loaded_items`
+    or `is_complete` to show progress without requests. Truthiness and
+    iteration load only pages which are needed.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        first_payload: dict,
+        fetch_page: Callable[[dict], dict],
+        parse_page: Callable[[dict], Page],
+        max_items: int | None = None,
+        page_payloads: Callable[[dict], list[dict]] | None = None,
+        fetch_many: Callable[[list[dict]], list[dict]] | None = None,
+        concurrent_pages: int = DEFAULT_CONCURRENT_PAGES,
+    ) -> None:
+        self.max_items = max_items
+        self.concurrent_pages = concurrent_pages
+        self.loaded_pages = 0
+        self._fetch_page = fetch_page
+        self._parse_page = parse_page
+        self._page_payloads = page_payloads
+        self._fetch_many = fetch_many
+        self._items: list = []
+        self._next_payloads: list[dict] = [first_payload]
+        # payloads of all pages are in `_next_payloads` (no continuations)
+        self._payloads_known = False
+        # payloads which are requested by batches
+        self._requested_payloads: list[dict] = []
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_first_page(  # noqa: PLR0913
+        cls,
+        first_page: Page,
+        fetch_page: Callable[[dict], dict],
+        parse_page: Callable[[dict], Page],
+        max_items: int | None = None,
+        page_payloads: list[dict] | None = None,
+        fetch_many: Callable[[list[dict]], list[dict]] | None = None,
+    ) -> "PagedChildren":
+        """Make sequence with already loaded (parsed) first page.
+
+        Args:
+        ----
+            first_page (Page): parsed first page
+            fetch_page (Callable[[dict], dict]): request of one page
+            parse_page (Callable[[dict], Page]): parser of raw page
+            max_items (int | None, optional): max number of children.\
+                Defaults None.
+            page_payloads (list[dict] | None, optional): payloads of next\
+                pages known from the first page, they are loaded by\
+                batches instead of continuation of `first_page`.\
+                Defaults None.
+            fetch_many (Callable | None, optional): batch request of\
+                pages. Defaults None.
+
+        Returns:
+        -------
+            PagedChildren: children with loaded first page
+
+        """
+        items, next_payload = first_page
+        paged_children = cls(
+            first_payload={},
+            fetch_page=fetch_page,
+            parse_page=parse_page,
+            max_items=max_items,
+            fetch_many=fetch_many,
+        )
+        paged_children._next_payloads = []  # noqa: SLF001
+        if page_payloads:
+            paged_children._next_payloads.extend(page_payloads)  # noqa: SLF001
+            paged_children._payloads_known = True  # noqa: SLF001
+            next_payload = None
+        paged_children._add_page(items, next_payload)  # noqa: SLF001
+        return paged_children
+
+    @property
+    def is_complete(self) -> bool:
+        """All pages are loaded (or `max_items` is reached)."""
+        return not self._next_payloads or self._is_full()
+
+    @property
+    def loaded_items(self) -> list:
+        """Children of already loaded pages (nothing is requested)."""
+        return self._items[:]
+
+    def load_pages(self, pages_number: int = 1) -> None:
+        """Load next pages (if they exist)."""
+        with self._lock:
+            for _ in range(pages_number):
+                if self.is_complete:
+                    return
+                self._load_next_page()
+
+    def load_all(self) -> list:
+        """Load all pages, return all children."""
+        with self._lock:
+            while not self.is_complete:
+                self._load_next_page()
+        return self._items
+
+    def __iter__(self) -> Iterator:
+        index = 0
+        while self._load_until(index + 1):
+            yield self._items[index]
+            index += 1
+
+    def __bool__(self) -> bool:
+        return self._load_until(1)
+
+    def __len__(self) -> int:
+        """Return number of ALL children (not loaded pages are requested)."""
+        return len(self.load_all())
+
+    @overload
+    def __getitem__(self, index: int) -> object: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list: ...
+
+    def __getitem__(self, index: int | slice) -> object | list:
+        if isinstance(index, slice) or index < 0:
+            return self.load_all()[index]
+        if not self._load_until(index + 1):
+            msg = "PagedChildren index out of range"
+            raise IndexError(msg)
+        return self._items[index]
+
+    def _load_until(self, items_number: int) -> bool:
+        # return True if at least `items_number` items are loaded
+        if len(self._items) >= items_number:
+            return True
+        with self._lock:
+            while len(self._items) < items_number and not self.is_complete:
+                self._load_next_page()
+            return len(self._items) >= items_number
+
+    def _load_next_page(self) -> None:
+        if self._payloads_known:
+            self._load_pages_concurrently()
+            return
+        payload = self._next_payloads.pop(0)
+        raw_page = self._fetch_page(payload)
+        items, next_payload = self._parse_page(raw_page)
+        if not self.loaded_pages and self._page_payloads is not None:
+            # payloads of the rest pages are known up front
+            known_payloads = self._page_payloads(raw_page)
+            if known_payloads:
+                self._next_payloads.extend(known_payloads)
+                self._payloads_known = True
+                next_payload = None
+        self._add_page(items, next_payload)
+
+    def _load_pages_concurrently(self) -> None:
+        payloads = self._next_payloads[: self.concurrent_pages]
+        del self._next_payloads[: self.concurrent_pages]
+        self._requested_payloads.extend(payloads)
+        raw_pages = (
+            self._fetch_many(payloads)
+            if self._fetch_many is not None
+            else map(self._fetch_page, payloads)
+        )
+        for raw_page in raw_pages:
+            items, next_payload = self._parse_page(raw_page)
+            # known page can continue to not known one, it's loaded by
+            # the next batch (continuation to known page is skipped)
+            if (
+                next_payload in self._requested_payloads
+                or next_payload in self._next_payloads
+            ):
+                next_payload = None
+            self._add_page(items, next_payload)
+            if self._is_full():
+                return
+
+    def _add_page(self, items: list, next_payload: dict | None) -> None:
+        self._items.extend(items)
+        if self.max_items is not None:
+            del self._items[self.max_items :]
+        if next_payload is not None:
+            self._next_payloads.append(next_payload)
+        self.loaded_pages += 1
+
+    def _is_full(self) -> bool:
+        return (
+            self.max_items is not None and len(self._items) >= self.max_items
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(loaded={len(self._items)}, "
+            f"pages={self.loaded_pages}, complete={self.is_complete})"
+        )
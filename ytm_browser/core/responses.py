@@ -1,19 +1,41 @@
+import asyncio
 import contextlib
+import sys
 import typing
+import unicodedata
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 
-from utils import parse_util
-from ytm_browser.core import api_client, custom_exceptions
+from utils import json_stream, parse_util
+from ytm_browser.core import api_client, custom_exceptions, pagination
 
 
 @dataclass(frozen=True, slots=True)
 class ParseRules:
     chain: tuple
     return_keys: set | None = None
+    # compiled `chain`: extract(json_obj) == extract_chain(json_obj, chain)
+    extract: parse_util.Extractor = field(
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "extract",
+            parse_util.compile_chain(self.chain),
+        )
 
 
 class AbstractResponse(ABC):
+    # unique key of raw response type, it's used for dispatch in parse_response
+    discriminator: typing.ClassVar[str]
+    # max number of loaded children (None is unlimited)
+    max_children: typing.ClassVar[int | None] = None
+
     def __init__(self, raw_response: dict | list) -> None:
         self.validate_response(raw_response=raw_response)
         self.title = self.parse_title(raw_response)
@@ -31,6 +53,37 @@ class AbstractResponse(ABC):
     def __str__(self) -> str:
         return str(self.title)
 
+    @classmethod
+    def from_payload(
+        cls,
+        title: str,
+        payload: dict,
+        children: list | None = None,
+    ) -> typing.Self:
+        """Make response by known payload (e.g. id typed by user).
+
+        Args:
+        ----
+            title (str): response title
+            payload (dict): payload of children request
+            children (list | None, optional): already known children (e.g.\
+                saved ones), they aren't requested. Defaults None.
+
+        Returns:
+        -------
+            Self: response without raw data, children are loaded as usual
+
+        """
+        response = cls.__new__(cls)
+        response.title = title
+        response.payload = payload
+        response._children = None  # noqa: SLF001
+        if children is not None:
+            response._children = response._make_paged_children(  # noqa: SLF001
+                (children, None),
+            )
+        return response
+
     @abstractmethod
     def parse_title(self, raw_response: dict | list) -> str:
         """Parse title function."""
@@ -43,9 +96,9 @@ class AbstractResponse(ABC):
     def set_chain_children(self) -> tuple[ParseRules, ...]:
         """Set tuple of children payload chains."""
 
-    @abstractmethod
     def _get_validate_key(self) -> str:
         """Return string unique key for response type (if key wont found raise WrongResponseTypeError exception)."""  # noqa: E501
+        return self.discriminator
 
     def validate_response(
         self,
@@ -58,43 +111,342 @@ class AbstractResponse(ABC):
             raise custom_exceptions.WrongResponseTypeError(msg)
 
     @property
-    def children(self) -> list:
-        if not self._children:
-            response = api_client.SyncClient().send_request(self.payload)
-            for current_chain in self.set_chain_children():
-                with contextlib.suppress(TypeError, KeyError):
-                    raw_children = parse_util.extract_chain(
-                        json_obj=response,
-                        chain=current_chain.chain,
-                    )
-                    if isinstance(raw_children, list):
-                        self._children = [
-                            parse_response(parse_util.extract_chain(raw_child))
-                            for raw_child in raw_children
-                        ]
-                        return self._children
+    def children(self) -> pagination.PagedChildren:
+        """Children, next pages are loaded by continuations on demand."""
+        if self._children is None:
+            paged_children = pagination.PagedChildren(
+                first_payload=self.payload,
+                fetch_page=api_client.SyncClient().send_request,
+                parse_page=self._parse_page,
+                max_items=self.max_children,
+                page_payloads=self.set_page_payloads,
+                fetch_many=_fetch_many,
+            )
+            paged_children.load_pages(1)
+            self._children = paged_children
+        return self._children
+
+    def iter_children(self) -> Iterator:
+        """Yield children while response body is downloading (streaming mode).
+
+        Children are decoded from the same chains as `children` ones, all
+        of them are stored for `children` property after last one.
+        """
+        if self._children is not None:
+            yield from self._children
+            return
+        children = []
+        next_payload = None
+        body_parts = api_client.SyncClient().stream_request(self.payload)
+        try:
+            for _, raw_child in json_stream.iter_chain_items(
+                body_parts,
+                [rules.chain for rules in self.set_chain_children()],
+            ):
+                if _is_continuation_item(raw_child):
+                    next_payload = self._parse_continuation_item(raw_child)
+                    continue
+                child = parse_response(parse_util.unwrap_single(raw_child))
+                children.append(child)
+                yield child
+        except custom_exceptions.ChainError as exc:
             msg = "Any valid children chain not found."
-            raise custom_exceptions.ParsingError(msg)
+            raise custom_exceptions.ParsingError(msg) from exc
+        finally:
+            body_parts.close()
+        self._children = self._make_paged_children((children, next_payload))
 
+    async def fetch_children(
+        self,
+        client: api_client.AsyncClient | None = None,
+    ) -> pagination.PagedChildren:
+        """Load first page of children through AsyncClient (awaitable `children`).
+
+        Args:
+        ----
+            client (api_client.AsyncClient | None, optional): client for\
+                request. Defaults to AsyncClient singleton.
+
+        Returns:
+        -------
+            pagination.PagedChildren: parsed children (also stored for\
+                `children` property)
+
+        """
+        if self._children is None:
+            client = client or api_client.AsyncClient()
+            response = await client.send_request(self.payload)
+            self._children = self._make_paged_children(
+                self._parse_page(response),
+                response,
+            )
         return self._children
 
+    def set_chain_continuation(self) -> tuple[ParseRules, ...]:
+        """Set tuple of next page continuation token chains."""
+        return ()
+
+    def set_page_payloads(self, first_page: dict) -> list[dict]:
+        """Return payloads of next pages which are defined by first page.
+
+        Page can have continuation of its children list (last item) and
+        continuation of the whole section, they are independent pages, so
+        both are loaded by one batch. Only one continuation isn't returned,
+        its pages are loaded one after another.
+        """
+        with contextlib.suppress(custom_exceptions.ChainError):
+            _, raw_children = self._get_fallback_chain(
+                "_children_chain",
+                self.set_chain_children(),
+            )(
+                first_page,
+                accept=lambda raw_children: isinstance(raw_children, list),
+            )
+            if raw_children and _is_continuation_item(raw_children[-1]):
+                payloads = [
+                    self._parse_continuation_item(raw_children[-1]),
+                    self._parse_continuation(first_page),
+                ]
+                if None not in payloads and payloads[0] != payloads[1]:
+                    return payloads
+        return []
+
+    def _make_paged_children(
+        self,
+        first_page: pagination.Page,
+        raw_first_page: dict | None = None,
+    ) -> pagination.PagedChildren:
+        return pagination.PagedChildren.from_first_page(
+            first_page,
+            fetch_page=api_client.SyncClient().send_request,
+            parse_page=self._parse_page,
+            max_items=self.max_children,
+            page_payloads=(
+                self.set_page_payloads(raw_first_page)
+                if raw_first_page is not None
+                else None
+            ),
+            fetch_many=_fetch_many,
+        )
+
+    def _parse_children(self, response: dict) -> list:
+        return self._parse_page(response)[0]
+
+    def _parse_page(self, response: dict) -> pagination.Page:
+        try:
+            _, raw_children = self._get_fallback_chain(
+                "_children_chain",
+                self.set_chain_children(),
+            )(
+                response,
+                accept=lambda raw_children: isinstance(raw_children, list),
+            )
+        except custom_exceptions.ChainError as exc:
+            msg = "Any valid children chain not found."
+            raise custom_exceptions.ParsingError(msg) from exc
+        if raw_children and _is_continuation_item(raw_children[-1]):
+            next_payload = self._parse_continuation_item(raw_children[-1])
+            raw_children = raw_children[:-1]
+        else:
+            next_payload = self._parse_continuation(response)
+        children = parse_responses(
+            [
+                parse_util.unwrap_single(raw_child)
+                for raw_child in raw_children
+            ],
+        )
+        return children, next_payload
+
+    def _parse_continuation(self, response: dict) -> dict | None:
+        if not self.set_chain_continuation():
+            return None
+        try:
+            _, token = self._get_fallback_chain(
+                "_continuation_chain",
+                self.set_chain_continuation(),
+            )(response, accept=lambda token: isinstance(token, str))
+        except custom_exceptions.ChainError:
+            return None
+        return {"continuation": token}
+
+    def _parse_continuation_item(self, raw_child: dict) -> dict | None:
+        with contextlib.suppress(KeyError, TypeError):
+            token = _chain_continuation_item.extract(raw_child)
+            return {"continuation": token}
+        return None
+
+    def _get_fallback_chain(
+        self,
+        attribute: str,
+        rules: tuple[ParseRules, ...],
+    ) -> parse_util.FallbackChain:
+        # compile chains once per response type
+        response_type = type(self)
+        if attribute not in response_type.__dict__:
+            setattr(
+                response_type,
+                attribute,
+                parse_util.FallbackChain([rule.chain for rule in rules]),
+            )
+        return response_type.__dict__[attribute]
+
+
+# last item of list with token of next page (new continuation format)
+CONTINUATION_ITEM_KEY = "continuationItemRenderer"
+_chain_continuation_item = ParseRules(
+    chain=(
+        CONTINUATION_ITEM_KEY,
+        "continuationEndpoint",
+        "continuationCommand",
+        "token",
+    ),
+)
+
+
+def _is_continuation_item(raw_child: object) -> bool:
+    return isinstance(raw_child, dict) and CONTINUATION_ITEM_KEY in raw_child
+
+
+def _fetch_many(payloads: list[dict]) -> list[dict]:
+    # every page is needed, first failed one fails loading
+    raw_pages = api_client.SyncClient().send_many(payloads)
+    for raw_page in raw_pages:
+        if isinstance(raw_page, Exception):
+            raise raw_page
+    return raw_pages
+
 
 # Responses list need to import all response types class using `@register`
 # if you create custom response type, you should add @register to your response class.  # noqa: E501
+# Set `discriminator` class attribute (key of raw response) for dispatch raw
+# response to your class without probing.
 #
 # @register
 # class MyCustomResponse:
 #    pass
-registered_responses_types: set[type[AbstractResponse]] = set()
+registered_responses_types: list[type[AbstractResponse]] = []
+# {discriminator: response type} in registration order
+dispatch_index: dict[str, type[AbstractResponse]] = {}
 
 
 def register(decorated: type[AbstractResponse]) -> type[AbstractResponse]:
-    registered_responses_types.add(decorated)
+    if decorated in registered_responses_types:
+        return decorated
+    discriminator = getattr(decorated, "discriminator", None)
+    if discriminator in dispatch_index:
+        msg = f"Discriminator {discriminator!r} is already registered."
+        raise custom_exceptions.ParserError(msg)
+    registered_responses_types.append(decorated)
+    if discriminator is not None:
+        dispatch_index[discriminator] = decorated
     return decorated
 
 
+async def fetch_children_many(
+    parents: list[AbstractResponse],
+    client: api_client.AsyncClient | None = None,
+) -> list[list]:
+    """Load children of several responses concurrently.
+
+    Args:
+    ----
+        parents (list[AbstractResponse]): responses for loading children
+        client (api_client.AsyncClient | None, optional): client for\
+            requests. Defaults to AsyncClient singleton.
+
+    Returns:
+    -------
+        list[list]: children lists in `parents` order
+
+    """
+    return list(
+        await asyncio.gather(
+            *[parent.fetch_children(client=client) for parent in parents],
+        ),
+    )
+
+
+def load_children_many(
+    parents: list[AbstractResponse],
+) -> list[pagination.PagedChildren | Exception]:
+    """Load first pages of children of several responses by one batch.
+
+    Batch takes about the time of the slowest request, failed parent
+    doesn't stop loading of the rest ones.
+
+    Args:
+    ----
+        parents (list[AbstractResponse]): responses for loading children
+
+    Returns:
+    -------
+        list[pagination.PagedChildren | Exception]: children (also stored\
+            for `children` property) or errors in `parents` order
+
+    """
+    not_loaded = [
+        parent
+        for parent in parents
+        if parent._children is None  # noqa: SLF001
+    ]
+    raw_pages = api_client.SyncClient().send_many(
+        [parent.payload for parent in not_loaded],
+    )
+    errors: dict[int, Exception] = {}
+    for parent, raw_page in zip(not_loaded, raw_pages, strict=True):
+        if isinstance(raw_page, Exception):
+            errors[id(parent)] = raw_page
+            continue
+        try:
+            parent._children = parent._make_paged_children(  # noqa: SLF001
+                parent._parse_page(raw_page),  # noqa: SLF001
+                raw_page,
+            )
+        except (
+            custom_exceptions.ParsingError,
+            custom_exceptions.ParserError,
+        ) as exc:
+            errors[id(parent)] = exc
+    return [
+        errors.get(id(parent)) or parent._children  # noqa: SLF001
+        for parent in parents
+    ]
+
+
 @register
 class EndpointResponse(AbstractResponse):
+    discriminator = "payload"
+    _chain_children = (
+        # common_case
+        ParseRules(
+            chain=("contents", "content", "contents", "items"),
+        ),
+        # continuation page
+        ParseRules(
+            chain=("continuationContents", "items"),
+        ),
+        # continuation page (new format)
+        ParseRules(
+            chain=("onResponseReceivedActions", "continuationItems"),
+        ),
+    )
+    _chain_continuation = (
+        # common_case
+        ParseRules(
+            chain=(
+                "contents",
+                "content",
+                "contents",
+                "continuations",
+                "continuation",
+            ),
+        ),
+        # continuation page
+        ParseRules(
+            chain=("continuationContents", "continuations", "continuation"),
+        ),
+    )
+
     def parse_title(self, raw_response: dict | list) -> str:
         return raw_response.get("title")
 
@@ -102,32 +454,57 @@ class EndpointResponse(AbstractResponse):
         return raw_response.get("payload")
 
     def set_chain_children(self) -> tuple[ParseRules, ...]:
-        return (
-            # common_case
-            ParseRules(
-                chain=("contents", "content", "contents", "items"),
-            ),
-        )
+        return self._chain_children
 
-    def _get_validate_key(self) -> str:
-        return "payload"
+    def set_chain_continuation(self) -> tuple[ParseRules, ...]:
+        return self._chain_continuation
 
 
 @register
 class PlaylistResponse(AbstractResponse):
+    discriminator = "aspectRatio"
+    _chain_title = ParseRules(chain=("title", "runs"))
+    _chain_subtitle = ParseRules(chain=("subtitle", "runs"))
+    _chain_payload = (
+        # listen_again
+        ParseRules(
+            chain=(
+                "menu",
+                "items",
+                0,
+                "navigationEndpoint",
+                "watchEndpoint",
+            ),
+            return_keys={"params", "videoId"},
+        ),
+        # common_cases
+        ParseRules(
+            chain=(
+                "menu",
+                "items",
+                0,
+                "navigationEndpoint",
+                "watchPlaylistEndpoint",
+            ),
+            return_keys={"params", "playlistId"},
+        ),
+    )
+    _payload_chain = parse_util.FallbackChain(
+        [rules.chain for rules in _chain_payload],
+        errors=(KeyError,),
+    )
+    _chain_children = (
+        # common_cases
+        ParseRules(
+            chain=("queueDatas",),
+        ),
+    )
+
     def parse_title(self, raw_response: dict | list) -> str:
-        title = parse_util.extract_chain(
-            json_obj=raw_response,
-            chain=("title", "runs"),
-        )
+        title = self._chain_title.extract(raw_response)
         subtitle = ""
         try:
-            subtitle = str(
-                parse_util.extract_chain(
-                    raw_response,
-                    ("subtitle", "runs"),
-                ),
-            )
+            subtitle = str(self._chain_subtitle.extract(raw_response))
         except KeyError:
             title = f"{title}".strip()
         else:
@@ -135,75 +512,94 @@ class PlaylistResponse(AbstractResponse):
         return title
 
     def parse_payload(self, raw_response: dict | list) -> dict[str, dict]:
-        for current_chain in self.set_chain_payload():
-            with contextlib.suppress(KeyError):
-                payload = parse_util.extract_chain(
-                    json_obj=raw_response,
-                    chain=current_chain.chain,
-                )
-                if isinstance(payload, dict) and current_chain.return_keys:
-                    return {
-                        key: value
-                        for key, value in payload.items()
-                        if key in current_chain.return_keys
-                    }
-        msg = "Problem of parsing Playlist's response payload"
-        raise custom_exceptions.ParsingError(msg)
+        try:
+            rules_index, payload = self._payload_chain(
+                raw_response,
+                accept=lambda payload: isinstance(payload, dict),
+            )
+        except custom_exceptions.ChainError as exc:
+            msg = "Problem of parsing Playlist's response payload"
+            raise custom_exceptions.ParsingError(msg) from exc
+        return_keys = self.set_chain_payload()[rules_index].return_keys or {}
+        return {
+            key: value for key, value in payload.items() if key in return_keys
+        }
 
     def set_chain_payload(self) -> tuple[ParseRules, ...]:
-        return (
-            # listen_again
-            ParseRules(
-                chain=(
-                    "menu",
-                    "items",
-                    0,
-                    "navigationEndpoint",
-                    "watchEndpoint",
-                ),
-                return_keys={"params", "videoId"},
-            ),
-            # common_cases
-            ParseRules(
-                chain=(
-                    "menu",
-                    "items",
-                    0,
-                    "navigationEndpoint",
-                    "watchPlaylistEndpoint",
-                ),
-                return_keys={"params", "playlistId"},
-            ),
-        )
+        return self._chain_payload
 
     def set_chain_children(self) -> tuple[ParseRules, ...]:
-        return (
-            # common_cases
-            ParseRules(
-                chain=("queueDatas",),
-            ),
-        )
-
-    def _get_validate_key(self) -> str:
-        return "aspectRatio"
+        return self._chain_children
 
 
 @register
 class TrackResponse:
+    discriminator = "videoId"
+    _chain_title = ParseRules(chain=("title", "runs"))
+    _chain_lenght = ParseRules(chain=("lengthText", "runs"))
+    _chain_page_type = ParseRules(
+        chain=(
+            "navigationEndpoint",
+            "browseEndpoint",
+            "browseEndpointContextSupportedConfigs",
+            "pageType",
+        ),
+    )
+
+    # display fields are stored as raw text, they are normalized on first
+    # access (most of library tracks are only hashed and never shown)
+    __slots__ = ("video_id", "_artist", "_title", "_lenght", "_is_normalized")
+
     def __init__(self, raw_response: dict | list) -> None:
         self.validate_response(raw_response)
-        raw_response = parse_util.extract_chain(json_obj=raw_response)
+        raw_response = parse_util.unwrap_single(raw_response)
 
-        self.artist = self._parse_artist(raw_track_data=raw_response)
-        self.title = self._parse_trackdata_field(
+        self.video_id = raw_response.get("videoId", "")
+        # artists repeat across library, so one string object is shared
+        self._artist = sys.intern(
+            self._parse_artist(raw_track_data=raw_response),
+        )
+        self._title = self._parse_trackdata_field(
             raw_track_data=raw_response,
-            chain=("title", "runs"),
+            rules=self._chain_title,
         )
-        self.lenght = self._parse_trackdata_field(
+        self._lenght = self._parse_trackdata_field(
             raw_track_data=raw_response,
-            chain=("lengthText", "runs"),
+            rules=self._chain_lenght,
         )
-        self.video_id = raw_response.get("videoId", "")
+        self._is_normalized = False
+
+    @classmethod
+    def from_fields(
+        cls,
+        video_id: str,
+        artist: str,
+        title: str,
+        lenght: str,
+    ) -> typing.Self:
+        """Make track by already parsed (normalized) fields."""
+        track = cls.__new__(cls)
+        track.video_id = video_id
+        track._artist = sys.intern(artist)  # noqa: SLF001
+        track._title = title  # noqa: SLF001
+        track._lenght = lenght  # noqa: SLF001
+        track._is_normalized = True  # noqa: SLF001
+        return track
+
+    @property
+    def artist(self) -> str:
+        self._parse_display_data()
+        return self._artist
+
+    @property
+    def title(self) -> str:
+        self._parse_display_data()
+        return self._title
+
+    @property
+    def lenght(self) -> str:
+        self._parse_display_data()
+        return self._lenght
 
     def __hash__(self) -> int:
         return hash(self.video_id)
@@ -222,20 +618,40 @@ class TrackResponse:
         self,
         raw_response: dict | list,
     ) -> None:
-        if isinstance(raw_response, dict) and not raw_response.get("videoId"):
+        if isinstance(raw_response, dict) and not raw_response.get(
+            self.discriminator,
+        ):
             msg = f"Response is not valid {self.__class__.__name__} type."
             raise custom_exceptions.WrongResponseTypeError(msg)
 
+    def _parse_display_data(self) -> None:
+        if self._is_normalized:
+            return
+        self._title = unicodedata.normalize("NFKD", self._title).strip()
+        self._lenght = unicodedata.normalize("NFKD", self._lenght).strip()
+        self._is_normalized = True
+
     def _parse_trackdata_field(
         self,
         raw_track_data: dict,
-        chain: tuple[str, ...],
+        rules: ParseRules,
     ) -> str:
-        field = parse_util.extract_chain(json_obj=raw_track_data, chain=chain)
-        if isinstance(field, str):
-            return field.strip()
-        msg = f"error of parsing {chain[0]} track field"
-        raise custom_exceptions.ParsingError(msg)
+        # raw "runs" text, without compiled chain walk and normalization
+        try:
+            runs = raw_track_data[rules.chain[0]][rules.chain[1]]
+            return parse_util.extract_runs(runs, fix_unicode=False)
+        except (KeyError, TypeError):
+            pass
+        # slow path skips single element wrappers (e.g. list of one runs)
+        try:
+            field = parse_util.extract_chain(raw_track_data, rules.chain)
+        except (KeyError, TypeError, IndexError) as exc:
+            msg = f"error of parsing {rules.chain[0]} track field"
+            raise custom_exceptions.ParsingError(msg) from exc
+        if not isinstance(field, str):
+            msg = f"error of parsing {rules.chain[0]} track field"
+            raise custom_exceptions.ParsingError(msg)
+        return field
 
     def _parse_artist(self, raw_track_data: dict) -> str:
         track_data = raw_track_data["longBylineText"]["runs"]
@@ -247,44 +663,58 @@ class TrackResponse:
         return ", ".join(artist) if artist else track_data[0]["text"]
 
     def _is_artist_field(self, field: dict) -> bool:
-        field_type = parse_util.extract_chain(
-            json_obj=field,
-            chain=(
-                "navigationEndpoint",
-                "browseEndpoint",
-                "browseEndpointContextSupportedConfigs",
-                "pageType",
-            ),
-        )
+        field_type = self._chain_page_type.extract(field)
         return field_type == "MUSIC_PAGE_TYPE_ARTIST"
 
 
-def make_parse_response() -> (
-    typing.Callable[..., AbstractResponse | TrackResponse]
-):
-    previous_response_type = None
-    response_types = list(registered_responses_types)
-
-    def parse_response(
-        raw_response: list | dict,
-    ) -> AbstractResponse | TrackResponse:
-        nonlocal previous_response_type
-        nonlocal response_types
-        if previous_response_type:
-            start_index = response_types.index(previous_response_type)
-            response_types = (
-                response_types[start_index:] + response_types[:start_index]
-            )
-
-        for response_type in response_types:
-            with contextlib.suppress(custom_exceptions.WrongResponseTypeError):
-                response = response_type(raw_response)
-                previous_response_type = response_type
-                return response
-        msg = "Not found any appropriate response type"
-        raise custom_exceptions.ParserError(msg)
-
-    return parse_response
-
-
-parse_response = make_parse_response()
+def dispatch_response_type(
+    raw_response: list | dict,
+) -> type[AbstractResponse | TrackResponse] | None:
+    """Find response type by its discriminator key (None if not found)."""
+    if isinstance(raw_response, dict):
+        for discriminator, response_type in dispatch_index.items():
+            if raw_response.get(discriminator):
+                return response_type
+    return None
+
+
+def parse_response(
+    raw_response: list | dict,
+) -> AbstractResponse | TrackResponse:
+    response_type = dispatch_response_type(raw_response)
+    if response_type is not None:
+        return response_type(raw_response)
+    # raw response without discriminator, probe types in registration order
+    for response_type in registered_responses_types:
+        with contextlib.suppress(custom_exceptions.WrongResponseTypeError):
+            return response_type(raw_response)
+    msg = "Not found any appropriate response type"
+    raise custom_exceptions.ParserError(msg)
+
+
+def parse_responses(
+    raw_responses: list,
+) -> list[AbstractResponse | TrackResponse]:
+    """Parse homogeneous list of raw responses (type is dispatched once).
+
+    Args:
+    ----
+        raw_responses (list): raw responses, usually children of one response
+
+    Returns:
+    -------
+        list[AbstractResponse | TrackResponse]: parsed responses
+
+    """
+    if not raw_responses:
+        return []
+    response_type = dispatch_response_type(raw_responses[0])
+    if response_type is None:
+        return [parse_response(raw_response) for raw_response in raw_responses]
+    parsed_responses = []
+    for raw_response in raw_responses:
+        try:
+            parsed_responses.append(response_type(raw_response))
+        except custom_exceptions.WrongResponseTypeError:  # noqa: PERF203
+            parsed_responses.append(parse_response(raw_response))
+    return parsed_responses
@@ -0,0 +1,227 @@
+"""Pool of accounts sessions for spreading public requests."""
+
+import atexit
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Self
+
+from curl_cffi import requests
+
+from ytm_browser.core import (
+    credentials,
+    credentials_store,
+    custom_exceptions,
+)
+
+# responses of these endpoints depend on account, they aren't spread
+PERSONAL_BROWSE_PREFIXES = (
+    "FEmusic_home",
+    "FEmusic_library",
+    "FEmusic_liked",
+    "FEmusic_history",
+    "FEmusic_listen_again",
+    "FEmusic_mixed_for_you",
+)
+# liked music, liked videos, watch later and saved episodes queues
+PERSONAL_PLAYLIST_IDS = frozenset({"LM", "LL", "WL", "SE"})
+# mixes and radios are made for account (e.g. "RDTMAK" supermix)
+PERSONAL_PLAYLIST_PREFIXES = ("RD",)
+# ...except playlists curated by YouTube Music
+PUBLIC_PLAYLIST_PREFIXES = ("RDCLAK",)
+# browse id of playlist page is "VL" + playlist id
+PLAYLIST_BROWSE_PREFIX = "VL"
+# keys of ids in raw responses of owner's library
+ID_KEYS = frozenset({"browseId", "playlistId"})
+DEFAULT_THROTTLED_COOLDOWN_SEC = 60
+DEFAULT_UNAUTHORIZED_COOLDOWN_SEC = 15 * 60
+
+
+def payload_id(payload: dict) -> str | None:
+    """Return playlist id or browse id of payload ("VL" prefix is cut)."""
+    match payload:
+        case {"browse_id": str(browse_id)} | {"browseId": str(browse_id)}:
+            if browse_id.startswith(PLAYLIST_BROWSE_PREFIX):
+                return browse_id.removeprefix(PLAYLIST_BROWSE_PREFIX)
+            return browse_id
+        case {"playlistId": str(playlist_id)}:
+            return playlist_id
+        case _:
+            return None
+
+
+def is_personal(payload: dict) -> bool:
+    """Check that response of payload depends on account (by its id)."""
+    item_id = payload_id(payload)
+    if item_id is None:
+        return False
+    return (
+        item_id.startswith(PERSONAL_BROWSE_PREFIXES)
+        or item_id in PERSONAL_PLAYLIST_IDS
+        or (
+            item_id.startswith(PERSONAL_PLAYLIST_PREFIXES)
+            and not item_id.startswith(PUBLIC_PLAYLIST_PREFIXES)
+        )
+    )
+
+
+def collect_ids(raw_response: dict | list) -> set[str]:
+    """Return all browse and playlist ids of raw response ("VL" is cut)."""
+    ids = set()
+    stack: list = [raw_response]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in ID_KEYS and isinstance(value, str):
+                    ids.add(value.removeprefix(PLAYLIST_BROWSE_PREFIX))
+                elif isinstance(value, dict | list):
+                    stack.append(value)
+        elif isinstance(node, list):
+            stack.extend(
+                item for item in node if isinstance(item, dict | list)
+            )
+    return ids
+
+
+@dataclass
+class PooledAccount:
+    name: str
+    credentials: credentials.Credentials
+    session: requests.Session
+    requests_number: int = 0
+    # account is out of rotation until this time (time.monotonic)
+    unavailable_until: float = 0.0
+    # curl session isn't thread-safe, one request at a time
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.unavailable_until
+
+    def request_kwargs(self, request_kwargs: dict, payload: dict) -> dict:
+        """Replace credentials of request to the account ones."""
+        return request_kwargs | {
+            "headers": self.credentials.headers,
+            "params": self.credentials.params,
+            "json": self.credentials.json_data | payload,
+        }
+
+
+class SessionPool:
+    """Impersonated session per account, public requests are spread.
+
+    Personal payloads (`is_personal`) and ids of owner's library (private
+    playlists from `pin_response`) aren't sent through pool, they stay
+    with credentials of client (owner of library). Account is taken out
+    of rotation for cooldown after throttled (429/503) or 401 response.
+    """
+
+    def __init__(
+        self,
+        accounts: dict[str, credentials.Credentials],
+        throttled_cooldown_sec: float = DEFAULT_THROTTLED_COOLDOWN_SEC,
+        unauthorized_cooldown_sec: float = DEFAULT_UNAUTHORIZED_COOLDOWN_SEC,
+    ) -> None:
+        self.throttled_cooldown_sec = throttled_cooldown_sec
+        self.unauthorized_cooldown_sec = unauthorized_cooldown_sec
+        self.accounts = [
+            PooledAccount(
+                name=name,
+                credentials=account_credentials,
+                session=requests.Session(impersonate="chrome"),
+            )
+            for name, account_credentials in accounts.items()
+        ]
+        # ids which came from personal responses of owner
+        self.pinned_ids: set[str] = set()
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_dir(cls, dir_path: str | Path, **kwargs: float) -> Self:
+        """Make pool of all valid credentials files in dir."""
+        return cls.from_store(
+            credentials_store.CredentialsStore(dir_path),
+            **kwargs,
+        )
+
+    @classmethod
+    def from_store(
+        cls,
+        store: credentials_store.CredentialsStore,
+        **kwargs: float,
+    ) -> Self:
+        """Make pool of accounts of store which aren't rejected by probe."""
+        return cls(store.valid_accounts(), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def is_pinned(self, payload: dict) -> bool:
+        """Check payload should be sent with owner's credentials."""
+        return is_personal(payload) or payload_id(payload) in self.pinned_ids
+
+    def pin(self, payload: dict) -> None:
+        """Send payload with owner's credentials (e.g. it's rejected)."""
+        if (item_id := payload_id(payload)) is not None:
+            with self._lock:
+                self.pinned_ids.add(item_id)
+
+    def pin_response(self, payload: dict, raw_response: dict | list) -> None:
+        """Pin ids of owner's library (children of pinned response)."""
+        if not self.is_pinned(payload):
+            return
+        ids = collect_ids(raw_response)
+        with self._lock:
+            self.pinned_ids |= ids
+
+    def acquire(self) -> PooledAccount | None:
+        """Return available account with the least number of requests.
+
+        Returns
+        -------
+            PooledAccount | None: account (None if all are out of rotation)
+
+        """
+        now = time.monotonic()
+        with self._lock:
+            available_accounts = [
+                account
+                for account in self.accounts
+                if account.is_available(now)
+            ]
+            if not available_accounts:
+                return None
+            account = min(
+                available_accounts,
+                key=lambda account: (
+                    account.lock.locked(),
+                    account.requests_number,
+                ),
+            )
+            account.requests_number += 1
+            return account
+
+    def release(
+        self,
+        account: PooledAccount,
+        error: Exception | None = None,
+    ) -> None:
+        """Take account out of rotation if request was rejected."""
+        match error:
+            case custom_exceptions.ThrottledError():
+                cooldown_sec = max(
+                    self.throttled_cooldown_sec,
+                    error.retry_after_sec or 0,
+                )
+            case custom_exceptions.CredentialsDataError():
+                cooldown_sec = self.unauthorized_cooldown_sec
+            case _:
+                return
+        with self._lock:
+            account.unavailable_until = time.monotonic() + cooldown_sec
+
+    def close(self) -> None:
+        for account in self.accounts:
+            account.session.close()
@@ -0,0 +1,139 @@
+"""Background warm-up crawl of responses children."""
+
+import asyncio
+import logging
+import threading
+
+from curl_cffi import requests
+
+from ytm_browser.core import api_client, custom_exceptions, responses
+
+DEFAULT_DEPTH = 2
+DEFAULT_WORKERS = 4
+DEFAULT_REQUEST_BUDGET = 200
+STOP_POLL_INTERVAL_SEC = 0.05
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupCrawler:
+    """Prefetch children of start responses to fill their `_children`.
+
+    Depth 1 loads children of the start responses (playlists), depth 2
+    loads children of those playlists (tracks) and so on.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        start_responses: list[responses.AbstractResponse],
+        depth: int = DEFAULT_DEPTH,
+        workers: int = DEFAULT_WORKERS,
+        request_budget: int = DEFAULT_REQUEST_BUDGET,
+        client: api_client.AsyncClient | None = None,
+    ) -> None:
+        self.start_responses = start_responses
+        self.depth = depth
+        self.workers = workers
+        self.request_budget = request_budget
+        self.client = client or api_client.AsyncClient()
+        self.requests_sent = 0
+        self._stop_event = threading.Event()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop_event.is_set()
+
+    def stop(self) -> None:
+        """Stop crawl (thread safe), requests in flight are cancelled."""
+        self._stop_event.set()
+
+    def run(self) -> int:
+        """Run crawl in new event loop (use it in background thread).
+
+        Returns
+        -------
+            int: number of sent requests
+
+        """
+        return asyncio.run(self.crawl())
+
+    async def crawl(self) -> int:
+        """Crawl responses tree breadth-first with pool of workers.
+
+        Returns
+        -------
+            int: number of sent requests
+
+        """
+        queue: asyncio.Queue[tuple[responses.AbstractResponse, int]] = (
+            asyncio.Queue()
+        )
+        for response in self.start_responses:
+            queue.put_nowait((response, 1))
+        workers = [
+            asyncio.create_task(self._worker(queue))
+            for _ in range(self.workers)
+        ]
+        stop_watcher = asyncio.create_task(self._watch_stop())
+        queue_done = asyncio.create_task(queue.join())
+        await asyncio.wait(
+            (queue_done, stop_watcher),
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        for task in (*workers, stop_watcher, queue_done):
+            task.cancel()
+        await asyncio.gather(
+            *workers,
+            stop_watcher,
+            queue_done,
+            return_exceptions=True,
+        )
+        return self.requests_sent
+
+    async def _watch_stop(self) -> None:
+        while not self.stopped:
+            await asyncio.sleep(STOP_POLL_INTERVAL_SEC)
+
+    async def _worker(
+        self,
+        queue: asyncio.Queue[tuple[responses.AbstractResponse, int]],
+    ) -> None:
+        while True:
+            response, level = await queue.get()
+            try:
+                children = await self._load_children(response)
+                if level < self.depth:
+                    for child in children:
+                        if isinstance(child, responses.AbstractResponse):
+                            queue.put_nowait((child, level + 1))
+            # unexpected payload of one node (e.g. KeyError of `dispatch`)
+            # mustn't stop worker, otherwise `queue.join()` never returns
+            except Exception:
+                logger.exception("Warm-up of %r failed", response)
+            finally:
+                queue.task_done()
+
+    async def _load_children(
+        self,
+        response: responses.AbstractResponse,
+    ) -> list:
+        if response._children is not None:  # noqa: SLF001
+            # next pages aren't crawled, they are loaded on demand
+            return response._children.loaded_items  # noqa: SLF001
+        if self.stopped or self.requests_sent >= self.request_budget:
+            return []
+        self.requests_sent += 1
+        try:
+            return await response.fetch_children(client=self.client)
+        except custom_exceptions.CredentialsDataError:
+            self.stop()
+        except (
+            custom_exceptions.ParsingError,
+            custom_exceptions.ParserError,
+            custom_exceptions.TooManyRetryError,
+            custom_exceptions.ContentUnavailableError,
+            requests.RequestsError,
+        ):
+            # skip broken response, crawl the rest of tree
+            return []
+        return []
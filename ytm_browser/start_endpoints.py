@@ -1,3 +1,5 @@
+import functools
+
 from ytm_browser.core import responses
 
 new_releases = {
@@ -18,6 +20,20 @@ library = {
 }
 
 raw_endpoints = [new_releases, mixed_for_you, listen_again, library]
-endpoints = [
-    responses.parse_response(raw_endpoint) for raw_endpoint in raw_endpoints
-]
+
+
+@functools.cache
+def get_endpoints() -> list[responses.AbstractResponse]:
+    """Parse start endpoints on first use (not on import)."""
+    return [
+        responses.parse_response(raw_endpoint)
+        for raw_endpoint in raw_endpoints
+    ]
+
+
+def __getattr__(name: str) -> list[responses.AbstractResponse]:
+    # `start_endpoints.endpoints` is built on first access
+    if name == "endpoints":
+        return get_endpoints()
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
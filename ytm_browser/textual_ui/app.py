@@ -1,12 +1,31 @@
-from typing import Literal
+from typing import Any, Literal
 
-from textual import on
+from textual import on, work
 from textual.app import App, ComposeResult
 from textual.driver import Driver
 from textual.widgets import DataTable, Footer, Markdown, TabbedContent, TabPane
 
-from ytm_browser.core import api_client, credentials, responses
-from ytm_browser.textual_ui import browse_tab, download_tab, settings_tab
+from ytm_browser import start_endpoints
+from ytm_browser.core import (
+    api_client,
+    archive,
+    audio_profiles,
+    cache,
+    cover_cache,
+    credentials,
+    credentials_store,
+    download_queue,
+    downloader,
+    responses,
+    session_pool,
+    warmup,
+)
+from ytm_browser.textual_ui import (
+    browse_tab,
+    download_tab,
+    metrics_tab,
+    settings_tab,
+)
 
 
 class YtMusicApp(App):
@@ -17,29 +36,67 @@ class YtMusicApp(App):
         ("s", "show_tab('settings')", "Settings"),
         ("b", "show_tab('browse')", "Browse"),
         ("d", "show_tab('download')", "Download list"),
+        ("m", "show_tab('metrics')", "Metrics"),
         ("q", "quit", "Quit"),
     ]
 
     def __init__(
         self,
-        start_responses: list[responses.AbstractResponse],
+        start_responses: list[responses.AbstractResponse] | None = None,
         driver_class: type[Driver] | None = None,
         css_path: str | None = None,
         watch_css: bool = False,
+        warmup_depth: int = 0,
+        download_workers: int = downloader.DEFAULT_WORKERS,
+        metrics_file: str | None = None,
+        audio_profile: str = audio_profiles.DEFAULT_PROFILE,
     ):
         super().__init__(driver_class, css_path, watch_css)
+        # None is default start endpoints (they're parsed after first frame)
         self.start_responses = start_responses
+        # prefetch children in background until first user action (0 is off)
+        self.warmup_depth = warmup_depth
+        self.warmup_crawler: warmup.WarmupCrawler | None = None
         self.download_queue: dict[str, responses.PlaylistResponse] = {}
+        # journal of download queue (it's opened by download tab)
+        self.queue_store: download_queue.DownloadQueueStore | None = None
+        # number of tracks downloaded at the same time (for all playlists)
+        self.download_workers = download_workers
+        # name of output profile (audio_profiles.PROFILES) of downloads
+        self.audio_profile = audio_profile
+        # Prometheus text dump of requests metrics (None is off)
+        self.metrics_file = metrics_file
         self.download_table: DataTable = DataTable(id="download_table")
         self.app_paths: dict[
-            Literal["download_dir", "credentials_dir"], str
+            Literal[
+                "download_dir",
+                "credentials_dir",
+                "cache_file",
+                "archive_file",
+                "covers_dir",
+                "queue_file",
+            ],
+            str,
         ] = {
             "download_dir": "files/music",
-            "credentials_dir": "files/auth",
+            "credentials_dir": credentials_store.DEFAULT_CREDENTIALS_DIR,
+            "cache_file": cache.DEFAULT_CACHE_FILE,
+            "archive_file": archive.DEFAULT_ARCHIVE_FILE,
+            "covers_dir": cover_cache.DEFAULT_COVERS_DIR,
+            "queue_file": download_queue.DEFAULT_QUEUE_FILE,
         }
-        self.app_data: dict[Literal["auth_data"], list] = {
+        self.app_data: dict[Literal["auth_data", "credential_file"], Any] = {
             "auth_data": [],
+            "credential_file": None,
         }
+        # auth files are parsed once per content change
+        self.credentials_store = credentials_store.CredentialsStore(
+            self.app_paths["credentials_dir"],
+        )
+        # credentials which are set to api clients now
+        self._active_credentials: credentials.Credentials | None = None
+        self.response_cache: cache.ResponseCache | None = None
+        self.accounts_pool: session_pool.SessionPool | None = None
 
     def compose(self) -> ComposeResult:
         """Compose app with tabbed content."""
@@ -56,6 +113,50 @@ class YtMusicApp(App):
                 yield browse_tab.BrowseEndpointsWidget()
             with TabPane("Download list", id="download"):
                 yield download_tab.QueueTable()
+            with TabPane(metrics_tab.TITLE, id=metrics_tab.ID):
+                yield metrics_tab.MetricsPanel()
+
+    def on_ready(self) -> None:
+        # yt_dlp is imported after first frame, not at startup
+        self._warm_up_downloader()
+        self._validate_accounts()
+        if self.start_responses is None:
+            self._load_start_responses()
+
+    @work(thread=True)
+    def _load_start_responses(self) -> None:
+        self.call_from_thread(
+            self._show_start_responses,
+            start_endpoints.get_endpoints(),
+        )
+
+    def _show_start_responses(
+        self,
+        start_responses: list[responses.AbstractResponse],
+    ) -> None:
+        self.start_responses = start_responses
+        self.query_one(browse_tab.BrowseEndpointsWidget).show_responses(
+            start_responses,
+        )
+        if self.get_child_by_type(TabbedContent).active == "browse":
+            self._start_warmup()
+
+    @work(thread=True)
+    def _warm_up_downloader(self) -> None:
+        downloader.load_yt_dlp()
+
+    @work(thread=True)
+    def _validate_accounts(self) -> None:
+        validated_accounts = self.credentials_store.validate(
+            base_url=api_client.SyncClient().base_url,
+        )
+        for name, is_valid in validated_accounts.items():
+            if is_valid is False:
+                self.call_from_thread(
+                    self.notify,
+                    f"Auth file {name} is expired. Please update it.",
+                    severity="warning",
+                )
 
     def action_show_tab(self, tab: str) -> None:
         """Switch to a new tab."""
@@ -63,8 +164,53 @@ class YtMusicApp(App):
 
     @on(TabbedContent.TabActivated, pane="#browse")
     def switch_to_home(self) -> None:
-        api_client.SyncClient.create_with_credentials(
-            credentials.parse_curl_request(
-                self.app_data["auth_data"],
-            ),
+        # only files changed since the last scan are re-parsed
+        self.credentials_store.rescan()
+        parsed_credentials = self.credentials_store.get_credentials(
+            self.app_data["credential_file"],
         )
+        if self.response_cache is None:
+            self.response_cache = cache.ResponseCache(
+                self.app_paths["cache_file"],
+            )
+        if parsed_credentials is not self._active_credentials:
+            for client_type in (
+                api_client.SyncClient,
+                api_client.AsyncClient,
+            ):
+                client = client_type.create_with_credentials(
+                    parsed_credentials,
+                )
+                client.set_cache(self.response_cache)
+            self._active_credentials = parsed_credentials
+        if self.accounts_pool is None:
+            self.accounts_pool = session_pool.SessionPool.from_store(
+                self.credentials_store,
+            )
+            # one account has nothing to spread
+            if len(self.accounts_pool) > 1:
+                api_client.SyncClient().set_accounts_pool(self.accounts_pool)
+        self._start_warmup()
+
+    def _start_warmup(self) -> None:
+        # start responses may be not parsed yet (see `on_ready`)
+        if (
+            self.warmup_depth
+            and self.warmup_crawler is None
+            and self.start_responses is not None
+        ):
+            self.warmup_crawler = warmup.WarmupCrawler(
+                self.start_responses,
+                depth=self.warmup_depth,
+            )
+            self._run_warmup()
+
+    @work(thread=True)
+    def _run_warmup(self) -> None:
+        if self.warmup_crawler is not None:
+            self.warmup_crawler.run()
+
+    def stop_warmup(self) -> None:
+        """Stop background warm-up crawl (called on user actions)."""
+        if self.warmup_crawler is not None:
+            self.warmup_crawler.stop()
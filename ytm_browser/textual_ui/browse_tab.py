@@ -1,10 +1,10 @@
 from typing import TYPE_CHECKING
 
-from textual import on
+from textual import on, work
 from textual.app import ComposeResult
 from textual.containers import Grid, VerticalScroll
 from textual.widget import Widget
-from textual.widgets import Collapsible, Label, Static, Switch
+from textual.widgets import Button, Collapsible, Label, Static, Switch
 
 from ytm_browser.core import responses
 
@@ -57,8 +57,24 @@ class EndpointCollapsible(Collapsible):
                 raise AttributeError(msg)
 
     def _get_child_container(self) -> VerticalScroll:
+        # only the first page is requested, the rest pages are loaded by
+        # "Load more" button (in worker thread)
+        paged_children = self.response.children
+        self._load_more_button = Button(
+            "Load more",
+            classes="load_more_button",
+        )
+        self._load_more_button.display = not paged_children.is_complete
+        self._children_container = VerticalScroll(
+            *self._get_child_widgets(paged_children.loaded_items),
+            self._load_more_button,
+        )
+        self._mounted_children_number = len(paged_children.loaded_items)
+        return self._children_container
+
+    def _get_child_widgets(self, children: list) -> list[Grid | Label]:
         response_children: list[Grid | Label] = []
-        for child in self.response.children:
+        for child in children:
             match child:
                 case responses.AbstractResponse():
                     response_children.append(
@@ -76,10 +92,37 @@ class EndpointCollapsible(Collapsible):
                             classes="height_auto",
                         ),
                     )
-        return VerticalScroll(*response_children)
+        return response_children
+
+    @on(Button.Pressed, ".load_more_button")
+    def _load_more_handler(self, event: Button.Pressed) -> None:
+        # button of nested collapsible is handled by the nearest one
+        event.stop()
+        self.app.stop_warmup()
+        self._load_more_button.disabled = True
+        self._load_next_page()
+
+    @work(thread=True)
+    def _load_next_page(self) -> None:
+        self.response.children.load_pages(1)
+        self.app.call_from_thread(self._mount_loaded_children)
+
+    def _mount_loaded_children(self) -> None:
+        paged_children = self.response.children
+        loaded_items = paged_children.loaded_items
+        self._children_container.mount_all(
+            self._get_child_widgets(
+                loaded_items[self._mounted_children_number :],
+            ),
+            before=self._load_more_button,
+        )
+        self._mounted_children_number = len(loaded_items)
+        self._load_more_button.disabled = False
+        self._load_more_button.display = not paged_children.is_complete
 
     @on(message_type=Switch.Changed)
     def _add_to_download(self, event: Switch.Changed) -> None:
+        self.app.stop_warmup()
         switch_id = str(event.switch.parent.id)
         element: EndpointCollapsible = self.query_one(
             selector=f"#{switch_id}"
@@ -87,15 +130,24 @@ class EndpointCollapsible(Collapsible):
         playlist: responses.EndpointCollapsible = element.response
 
         if event.value:
+            if switch_id in self.app.download_queue:
+                # playlist is already reloaded from journal of queue
+                return
             self.app.download_queue.update({switch_id: playlist})
             self.app.download_table.add_row(
                 playlist.title, "wait", key=switch_id
             )
+            if self.app.queue_store is not None:
+                self.app.queue_store.add_playlist(switch_id, playlist)
         else:
             self.app.download_queue.pop(switch_id)
             self.app.download_table.remove_row(row_key=switch_id)
+            if self.app.queue_store is not None:
+                self.app.queue_store.remove_playlist(switch_id)
 
     def _watch_collapsed(self, collapsed: bool) -> None:
+        if not self.collapsed:
+            self.app.stop_warmup()
         if not self.collapsed and not self._is_mounted_response:
             self.mount(self._get_child_container(), after=self._anchor)
         self._is_mounted_response = True
@@ -138,6 +190,16 @@ class BrowseEndpointsWidget(Static):
         yield VerticalScroll(
             *[
                 EndpointCollapsible(response=response)
-                for response in self.app.start_responses
+                for response in self.app.start_responses or []
             ],
         )
+
+    def show_responses(
+        self,
+        start_responses: list[responses.AbstractResponse],
+    ) -> None:
+        """Mount endpoints which are parsed after compose."""
+        self.query_one(VerticalScroll).mount_all(
+            EndpointCollapsible(response=response)
+            for response in start_responses
+        )
@@ -4,11 +4,17 @@ from typing import TYPE_CHECKING
 
 from textual import on, work
 from textual.app import ComposeResult
-from textual.containers import VerticalScroll
+from textual.containers import Horizontal, VerticalScroll
 from textual.message import Message
-from textual.widgets import Button, Static
+from textual.widgets import Button, Label, Select, Static
 
-from ytm_browser.core import downloader
+from ytm_browser.core import (
+    archive,
+    audio_profiles,
+    cover_cache,
+    download_queue,
+    downloader,
+)
 
 if TYPE_CHECKING:
     from ytm_browser.textual_ui.app import YtMusicApp
@@ -26,8 +32,19 @@ class QueueTable(Static):
             super().__init__()
 
     def compose(self) -> ComposeResult:
-        yield Button.success(
-            label="Start download", id="start_download_button"
+        yield Horizontal(
+            Button.success(label="Start download", id="start_download_button"),
+            Label(renderable="Audio profile", classes="label_text"),
+            Select(
+                id="audio_profile_select",
+                options=[
+                    (profile.description, name)
+                    for name, profile in audio_profiles.PROFILES.items()
+                ],
+                allow_blank=False,
+                value=self.app.audio_profile,
+            ),
+            classes="height_auto",
         )
         yield VerticalScroll(self.app.download_table)
 
@@ -46,29 +63,75 @@ class QueueTable(Static):
             key=self.table_titles[1],
             default="wait",
         )
+        self._load_queue()
+
+    def _load_queue(self) -> None:
+        """Reload unfinished playlists of the previous run from journal."""
+        self.app.queue_store = download_queue.DownloadQueueStore(
+            self.app.app_paths["queue_file"],
+        )
+        self.app.queue_store.remove_finished()
+        for playlist_key, playlist in self.app.queue_store.playlists().items():
+            state_counts = self.app.queue_store.state_counts(playlist_key)
+            status = "wait"
+            if state_counts:
+                status = (
+                    f"resume {state_counts[download_queue.DONE]}"
+                    f"/{state_counts.total()}"
+                )
+            self.app.download_queue[playlist_key] = playlist
+            self.app.download_table.add_row(
+                playlist.title,
+                status,
+                key=playlist_key,
+            )
+
+    @on(Select.Changed, "#audio_profile_select")
+    def _select_audio_profile(self, event: Select.Changed) -> None:
+        self.app.audio_profile = str(event.value)
 
     @on(Button.Pressed, "#start_download_button")
     def _start_download_handler(self) -> None:
+        self.app.stop_warmup()
         self._start_download()
 
     @work(thread=True)
     def _start_download(self) -> None:
-        for playlist_key, playlist_object in self.app.download_queue.items():
+        def update_status(
+            playlist_key: str,
+            progress: downloader.PlaylistProgress,
+        ) -> None:
             self.post_message(
                 QueueTable.UpdateCellMessage(
                     cell_key=playlist_key,
-                    cell_value="download",
+                    cell_value=str(progress),
                 ),
             )
-            downloader.download_playlist(
-                playlist=playlist_object,
+
+        download_archive = archive.DownloadArchive(
+            self.app.app_paths["archive_file"],
+        )
+        covers = cover_cache.CoverCache(self.app.app_paths["covers_dir"])
+        try:
+            downloader.DownloadEngine(
                 target_dir=self.app.app_paths["download_dir"],
+                workers=self.app.download_workers,
+                profile=self.app.audio_profile,
+                on_progress=update_status,
+                download_archive=download_archive,
+                covers=covers,
+                queue_store=self.app.queue_store,
+            ).download(dict(self.app.download_queue))
+        # e.g. tracks of reloaded playlist are requested without credentials
+        except Exception as exc:  # noqa: BLE001
+            self.app.call_from_thread(
+                self.app.notify,
+                f"Download is stopped: {exc!r}",
+                severity="error",
             )
-            self.post_message(
-                QueueTable.UpdateCellMessage(
-                    cell_key=playlist_key, cell_value="done"
-                )
-            )
+        finally:
+            covers.close()
+            download_archive.close()
 
     @on(message_type=UpdateCellMessage)
     def _update_cell(self, message: UpdateCellMessage) -> None:
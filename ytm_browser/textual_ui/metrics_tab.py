@@ -0,0 +1,68 @@
+"""Metrics tab: live table of API requests metrics."""
+
+from typing import TYPE_CHECKING
+
+from textual.app import ComposeResult
+from textual.widgets import DataTable, Static
+
+from ytm_browser.core import api_client
+
+if TYPE_CHECKING:
+    from ytm_browser.textual_ui.app import YtMusicApp
+
+ID = "metrics"
+TITLE = "Metrics"
+REFRESH_INTERVAL_SEC = 1.0
+COLUMNS = (
+    "endpoint",
+    "requests",
+    "cache hits",
+    "coalesced",
+    "retries",
+    "errors",
+    "avg latency",
+    "avg decode",
+    "received",
+    "status codes",
+)
+
+
+class MetricsPanel(Static):
+    """Table of per-endpoint metrics, it's refreshed every second."""
+
+    def compose(self) -> ComposeResult:
+        yield DataTable(id="metrics_table", zebra_stripes=True)
+
+    def on_mount(self) -> None:
+        self.app: YtMusicApp  # define type for self.app for better work IDE
+        self.query_one(DataTable).add_columns(*COLUMNS)
+        self.set_interval(REFRESH_INTERVAL_SEC, self.refresh_metrics)
+
+    def refresh_metrics(self) -> None:
+        request_metrics = api_client.SyncClient.request_metrics
+        table = self.query_one(DataTable)
+        table.clear()
+        for endpoint, metrics in request_metrics.snapshot().items():
+            table.add_row(
+                endpoint,
+                metrics["requests"],
+                metrics["cache_hits"],
+                metrics["coalesced"],
+                metrics["retries"],
+                sum(metrics["errors"].values()),
+                _format_average(metrics["latency_sec"], scale=1000, unit="ms"),
+                _format_average(metrics["decode_sec"], scale=1000, unit="ms"),
+                f"{metrics['response_bytes']['sum'] / 1e6:.1f} MB",
+                ", ".join(
+                    f"{code}: {count}"
+                    for code, count in sorted(metrics["status_codes"].items())
+                ),
+            )
+        if self.app.metrics_file is not None:
+            request_metrics.dump_prometheus(self.app.metrics_file)
+
+
+def _format_average(histogram: dict, scale: float, unit: str) -> str:
+    if not histogram["count"]:
+        return "-"
+    return f"{histogram['sum'] / histogram['count'] * scale:.1f} {unit}"
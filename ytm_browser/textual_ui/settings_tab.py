@@ -114,7 +114,9 @@ class UserWidget(Static):
     def _select_changed(self, event: Select.Changed) -> None:
         selected_value = str(event.value)
         self.app.app_data["credential_file"] = selected_value
-        self.app.app_data["auth_data"] = self.credentials_files[selected_value]
+        self.app.app_data["auth_data"] = self.app.credentials_store.get(
+            selected_value,
+        ).raw_curl_content
 
     @on(message_type=Button.Pressed, selector="#add_auth_file_button")
     def _add_new_auth_file(self) -> None:
@@ -151,18 +153,17 @@ class UserWidget(Static):
     def _get_select_widget_content(
         self,
     ) -> dict[Literal["options_list", "disabled_flag"], Any]:
-        self.credentials_files = credentials.search_credentials_in_dir(
-            dir_path=self.app.app_paths["credentials_dir"],
-        )
-        if self.credentials_files:
-            options_list = tuple(
-                (line, line) for line in self.credentials_files
-            )
+        # only new and changed files are read
+        self.app.credentials_store.rescan()
+        credentials_files = self.app.credentials_store.names()
+        if credentials_files:
+            options_list = tuple((line, line) for line in credentials_files)
             disabled_flag = False
             # load default auth_data to app (last entry).
-            self.app.app_data["auth_data"] = self.credentials_files[
-                options_list[-1][1]
-            ]
+            self.app.app_data["credential_file"] = options_list[-1][1]
+            self.app.app_data["auth_data"] = self.app.credentials_store.get(
+                options_list[-1][1],
+            ).raw_curl_content
         else:
             options_list = (
                 ("Any authfile not found. Please add it.", "notfound"),